@@ -0,0 +1,347 @@
+import contextvars
+import hashlib
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import span
+
+
+# Códigos que justifican reintentar una petición idempotente
+RETRY_STATUSES = {429, 502, 503, 504}
+
+# Códigos que cuentan como falla del backend para el circuit breaker
+BREAKER_STATUSES = {500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.RequestException):
+    """El circuito está abierto: la petición no se envía."""
+
+
+class ServerError(requests.HTTPError):
+    """El backend respondió 5xx (a diferencia de un 4xx, es una falla suya)."""
+
+
+# Plazo absoluto (time.monotonic) de las peticiones del contexto en curso,
+# ej. el de un lote de async_fetch; None sin plazo
+request_deadline = contextvars.ContextVar("request_deadline", default=None)
+
+
+# Errores que indican que el backend no está disponible (no que la petición
+# sea inválida): ante ellos se puede servir el último dato bueno
+UNAVAILABLE_ERRORS = (requests.ConnectionError, requests.Timeout, ServerError, CircuitOpenError)
+
+
+def raise_for_status(response):
+    """Como Response.raise_for_status, pero los 5xx lanzan ServerError."""
+    if response.status_code >= 500:
+        raise ServerError(f"{response.status_code} Server Error for url: {response.url}", response=response)
+    response.raise_for_status()
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker del backend.
+
+    failure_threshold : int   - fallas seguidas que abren el circuito
+    reset_timeout     : float - segundos abierto antes de dejar pasar una
+                                petición de prueba (semiabierto)
+
+    Abierto, las peticiones fallan de inmediato con CircuitOpenError en vez
+    de esperar el timeout. La primera petición tras `reset_timeout` lo
+    cierra si tiene éxito o lo vuelve a abrir si falla.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_request(self):
+        """Lanza CircuitOpenError si la petición no debe enviarse."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if time.monotonic() - self._opened_at >= self.reset_timeout and not self._probing:
+                # Semiabierto: solo una petición de prueba a la vez
+                self._probing = True
+                return
+            self.rejected += 1
+        raise CircuitOpenError("API no disponible (circuito abierto)")
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def stats(self):
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+@dataclass(frozen=True)
+class JsonPayload:
+    """Cuerpo JSON decodificado junto con sus validadores HTTP."""
+    data: object
+    size: int
+    content_hash: str
+    etag: str = None
+    last_modified: str = None
+
+
+class ApiClient:
+    """
+    Cliente HTTP compartido para el API de planes.
+
+    base_url        : str   - URL base del backend
+    pool_size       : int   - conexiones keep-alive por host
+    timeouts        : dict  - timeout por prefijo de ruta, ej. {"/categories": 5}
+    default_timeout : float - timeout si ninguna ruta coincide
+    retries         : int   - reintentos para GET (solo GET es idempotente aquí)
+    backoff         : float - base en segundos del backoff exponencial con jitter
+    breaker         : CircuitBreaker opcional compartido por GET y POST
+    adapter         : HTTPAdapter a montar en lugar del predeterminado, ej.
+                      api_traffic.RecordingAdapter / ReplayAdapter
+    """
+
+    def __init__(self, base_url, pool_size=10, timeouts=None, default_timeout=10,
+                 retries=2, backoff=0.3, breaker=None, adapter=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeouts = dict(timeouts or {})
+        self.default_timeout = default_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker
+        # callable(path, latency_ms, ok, error) opcional, ej. health_probe.HealthProber
+        self.observer = None
+
+        self.session = requests.Session()
+        self._adapter = adapter or HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0,
+            "retries": 0,
+            "errors": 0,
+            "not_modified": 0,
+            "unchanged_bodies": 0
+        }
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def timeout_for(self, path):
+        """Timeout de la ruta según el prefijo configurado más largo."""
+        matches = [prefix for prefix in self.timeouts if path.startswith(prefix)]
+        if not matches:
+            return self.default_timeout
+        return self.timeouts[max(matches, key=len)]
+
+    def _before_request(self):
+        if self.breaker is not None:
+            self.breaker.before_request()
+
+    def _record(self, response=None):
+        """Informa al breaker del resultado (None = error de conexión/timeout)."""
+        if self.breaker is None:
+            return
+        if response is None or response.status_code in BREAKER_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _observe(self, path, started, response=None, error=None):
+        if self.observer is None:
+            return
+        ok = response is not None and response.status_code not in BREAKER_STATUSES
+        if response is not None and not ok:
+            error = f"HTTP {response.status_code}"
+        self.observer(path, (time.perf_counter() - started) * 1000, ok, str(error) if error else None)
+
+    def _sleep_before_retry(self, attempt):
+        # Backoff exponencial con "full jitter" (sin pasarse del plazo)
+        delay = random.uniform(0, self.backoff * (2 ** attempt))
+        deadline = request_deadline.get()
+        if deadline is not None:
+            delay = min(delay, max(deadline - time.monotonic(), 0))
+        time.sleep(delay)
+
+    def _remaining(self, path, timeout):
+        """
+        `timeout` recortado al plazo del contexto. Lanza requests.Timeout si
+        ya venció, para que el hilo no siga ocupando el pool.
+        """
+        deadline = request_deadline.get()
+        if deadline is None:
+            return timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.Timeout(f"{path}: plazo vencido antes de enviar la petición")
+        if isinstance(timeout, tuple):
+            return tuple(min(part, remaining) for part in timeout)
+        return min(timeout, remaining)
+
+    def get(self, path, **kwargs):
+        """
+        GET con reintentos ante errores de conexión, timeouts y 429/5xx.
+        Con `request_deadline` fijado, ni el timeout ni los reintentos pasan
+        del plazo.
+        """
+        timeout = kwargs.pop("timeout", self.timeout_for(path))
+        url = f"{self.base_url}{path}"
+
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            kwargs["timeout"] = self._remaining(path, timeout)
+            # Con el circuito abierto se falla de inmediato (también entre reintentos)
+            self._before_request()
+            self._count("requests")
+            started = time.perf_counter()
+            try:
+                with span("fetch"):
+                    response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._count("errors")
+                self._record()
+                self._observe(path, started, error=e)
+                if last_attempt:
+                    raise
+            except requests.RequestException as e:
+                self._count("errors")
+                self._record()
+                self._observe(path, started, error=e)
+                raise
+            else:
+                self._record(response)
+                self._observe(path, started, response)
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+                self._count("errors")
+            self._count("retries")
+            self._sleep_before_retry(attempt)
+
+    def get_json(self, path, previous=None):
+        """
+        GET condicional de un recurso JSON.
+
+        previous : objeto con `etag`, `last_modified` y `content_hash` de la
+                   última respuesta (ej. un Snapshot), o None.
+
+        Devuelve None si el recurso no cambió: por un 304 o, si el backend no
+        envía validadores, porque el hash del cuerpo es idéntico. En ambos
+        casos no se decodifica el JSON.
+        """
+        headers = {}
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        response = self.get(path, headers=headers)
+        if response.status_code == 304 and previous is not None:
+            self._count("not_modified")
+            return None
+        raise_for_status(response)
+
+        with span("parse"):
+            content_hash = hashlib.sha1(response.content).hexdigest()
+            if previous is not None and previous.content_hash == content_hash:
+                self._count("unchanged_bodies")
+                return None
+            data = response.json()
+
+        return JsonPayload(
+            data=data,
+            size=len(response.content),
+            content_hash=content_hash,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
+        )
+
+    def post(self, path, **kwargs):
+        """POST sin reintentos (publicar no es idempotente)."""
+        kwargs.setdefault("timeout", self.timeout_for(path))
+        self._before_request()
+        self._count("requests")
+        started = time.perf_counter()
+        try:
+            with span("fetch"):
+                response = self.session.post(f"{self.base_url}{path}", **kwargs)
+        except requests.RequestException as e:
+            self._count("errors")
+            self._record()
+            self._observe(path, started, error=e)
+            raise
+        self._record(response)
+        self._observe(path, started, response)
+        return response
+
+    def stats(self):
+        """Contadores del cliente y reutilización de conexiones del pool."""
+        connections = 0
+        pooled_requests = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            pooled_requests += pool.num_requests
+
+        with self._lock:
+            counters = dict(self._counters)
+        counters.update({
+            "connections_opened": connections,
+            "pooled_requests": pooled_requests,
+            "connections_reused": max(pooled_requests - connections, 0),
+        })
+        if self.breaker is not None:
+            counters["breaker"] = self.breaker.stats()
+        if hasattr(self._adapter, "stats"):
+            counters["traffic"] = self._adapter.stats()
+        return counters
+
+    def close(self):
+        self.session.close()
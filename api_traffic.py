@@ -0,0 +1,247 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+# Rutas cuyas respuestas se graban (prefijos; /plans incluye /plans/category)
+RECORDED_PATHS = ("/plans", "/categories")
+
+# Rutas que nunca se graban ni se reproducen
+EXCLUDED_PATHS = ("/plans/publish",)
+
+# Cabeceras de la respuesta que se conservan
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class TrafficStore:
+    """
+    Respuestas del API grabadas en disco, una por petición (método GET,
+    ruta y query), como archivos gzip: una línea JSON con el estado, las
+    cabeceras y la latencia original, seguida del cuerpo tal cual.
+
+    directory : str   - carpeta de las grabaciones
+    paths     : tuple - prefijos de ruta que se graban
+    """
+
+    def __init__(self, directory, paths=RECORDED_PATHS, excluded=EXCLUDED_PATHS):
+        self.directory = directory
+        self.paths = tuple(paths)
+        self.excluded = tuple(excluded)
+        os.makedirs(directory, exist_ok=True)
+
+    def handles(self, request):
+        path = urlsplit(request.url).path
+        return (request.method in ("GET", "HEAD")
+                and path.startswith(self.paths) and not path.startswith(self.excluded))
+
+    def filename(self, url):
+        """Archivo de una URL: ruta legible más un hash de la query, si hay."""
+        parts = urlsplit(url)
+        name = re.sub(r"[^A-Za-z0-9]+", "_", parts.path).strip("_") or "root"
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        if query:
+            name += "@" + hashlib.sha1(query.encode()).hexdigest()[:10]
+        return os.path.join(self.directory, f"{name}.gz")
+
+    def save(self, request, response, elapsed_ms):
+        header = {
+            "path": urlsplit(request.url).path,
+            "query": urlsplit(request.url).query,
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+            "elapsed_ms": round(elapsed_ms, 1),
+            "recorded_at": time.time(),
+        }
+        path = self.filename(request.url)
+        # Escritura atómica: una lectura concurrente ve el archivo completo o el anterior
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+                f.write(json.dumps(header).encode() + b"\n")
+                f.write(response.content)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return path
+
+    def load(self, url):
+        """(cabecera, cuerpo) grabados para `url`, o None si no hay grabación."""
+        path = self.filename(url)
+        try:
+            with gzip.open(path, "rb") as f:
+                header = json.loads(f.readline())
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        return header, body
+
+    def entries(self):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(".gz"))
+
+
+# ==================== ADAPTERS ====================
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Adapter de requests que envía al backend real y graba en `store` cada
+    respuesta 200 de las rutas grabadas (los 304 conservan la anterior).
+    """
+
+    def __init__(self, store, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+        self.recorded = 0
+        self.record_errors = 0
+        self.last_error = None
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        if request.method == "GET" and response.status_code == 200 and self.store.handles(request):
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            try:
+                self.store.save(request, response, elapsed_ms)
+                self.recorded += 1
+            except OSError as e:
+                # Una falla al grabar no debe romper la petición real
+                self.record_errors += 1
+                self.last_error = str(e)
+        return response
+
+    def stats(self):
+        return {
+            "mode": RECORD,
+            "directory": self.store.directory,
+            "recorded": self.recorded,
+            "record_errors": self.record_errors,
+            "last_error": self.last_error,
+            "entries": len(self.store.entries()),
+        }
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Adapter de requests que responde desde `store` sin ir a la red.
+
+    latency_ms : float o "recorded" - espera añadida a cada respuesta; con
+                 "recorded" se repite la latencia medida al grabar
+
+    Respeta If-None-Match (304 si el ETag coincide). Lo que no está
+    grabado responde 404 y las escrituras (ej. publicar) 501, así que no
+    cuentan como caída del backend para el circuit breaker.
+    """
+
+    def __init__(self, store, latency_ms=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+        self.latency_ms = latency_ms
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self.replayed = 0
+        self.not_modified = 0
+        self.missing = 0
+        self.rejected = 0
+
+    def _load(self, url):
+        """Grabación de `url`, descomprimida una sola vez mientras no cambie el archivo."""
+        path = self.store.filename(url)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._bodies.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        recording = self.store.load(url)
+        if recording is not None:
+            with self._lock:
+                self._bodies[path] = (mtime, recording)
+        return recording
+
+    def _delay(self, header):
+        if self.latency_ms == "recorded":
+            delay = header.get("elapsed_ms", 0) if header else 0
+        else:
+            delay = self.latency_ms
+        if delay:
+            time.sleep(delay / 1000)
+
+    def send(self, request, **kwargs):
+        recording = self._load(request.url) if self.store.handles(request) else None
+        self._delay(recording[0] if recording else None)
+
+        if recording is None:
+            if request.method in ("GET", "HEAD"):
+                self.missing += 1
+                return self._response(request, 404, {"Content-Type": "application/json"},
+                                      b'{"error": "sin grabacion para esta ruta"}')
+            self.rejected += 1
+            return self._response(request, 501, {"Content-Type": "application/json"},
+                                  b'{"error": "modo replay: solo lectura"}')
+
+        header, body = recording
+        headers = header.get("headers", {})
+        etag = headers.get("ETag")
+        if etag and request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return self._response(request, 304, {"ETag": etag}, b"")
+        self.replayed += 1
+        return self._response(request, header.get("status", 200), headers,
+                              b"" if request.method == "HEAD" else body)
+
+    def _response(self, request, status, headers, body):
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.reason = {200: "OK", 304: "Not Modified", 404: "Not Found", 501: "Not Implemented"}.get(status, "")
+        response.connection = self
+        return response
+
+    def stats(self):
+        with self._lock:
+            cached = len(self._bodies)
+        return {
+            "mode": REPLAY,
+            "directory": self.store.directory,
+            "latency_ms": self.latency_ms,
+            "replayed": self.replayed,
+            "not_modified": self.not_modified,
+            "missing": self.missing,
+            "rejected": self.rejected,
+            "entries": len(self.store.entries()),
+            "cached_bodies": cached,
+        }
+
+
+def traffic_adapter(mode, directory, latency_ms=0.0, **kwargs):
+    """
+    Adapter para ApiClient según `mode` ("record", "replay" o vacío para
+    el backend real, que devuelve None). `kwargs` van a HTTPAdapter.
+    """
+    if not mode:
+        return None
+    if mode not in (RECORD, REPLAY):
+        raise ValueError(f"Modo de tráfico desconocido: {mode!r} (use 'record' o 'replay')")
+    store = TrafficStore(directory)
+    if mode == RECORD:
+        return RecordingAdapter(store, **kwargs)
+    return ReplayAdapter(store, latency_ms=latency_ms, **kwargs)
@@ -0,0 +1,125 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api_client import request_deadline
+from background import BackgroundWorker
+
+
+class DeadlineExceeded(TimeoutError):
+    """La petición no terminó antes del plazo compartido."""
+
+
+async def gather_with_deadline(calls, deadline):
+    """
+    Ejecuta en paralelo los callables bloqueantes de `calls` (nombre ->
+    callable sin argumentos) con un plazo común en segundos.
+
+    Devuelve (results, errors): dicts por nombre. Lo que no terminó a
+    tiempo queda en `errors` como DeadlineExceeded. Cancelar la tarea no
+    detiene su hilo: lo que acota el trabajo es el plazo que `_in_context`
+    pasa al ApiClient.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = {
+        asyncio.ensure_future(loop.run_in_executor(None, call)): name
+        for name, call in calls.items()
+    }
+    if not tasks:
+        return {}, {}
+
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    results, errors = {}, {}
+    for task, name in tasks.items():
+        if task in pending:
+            errors[name] = DeadlineExceeded(f"{name}: sin respuesta en {deadline:g}s")
+        elif task.exception() is not None:
+            errors[name] = task.exception()
+        else:
+            results[name] = task.result()
+    return results, errors
+
+
+def _in_context(call, deadline):
+    """`call` con una copia del contexto actual y `request_deadline` fijado."""
+    context = contextvars.copy_context()
+    deadline_at = time.monotonic() + deadline
+
+    def run():
+        request_deadline.set(deadline_at)
+        return call()
+
+    return lambda: context.run(run)
+
+
+class AsyncFetcher(BackgroundWorker):
+    """
+    Puente síncrono hacia un event loop de fondo (uno por proceso).
+
+    max_workers : int   - hilos para las llamadas bloqueantes; conviene
+                          igualarlo al pool de conexiones del ApiClient
+    deadline    : float - plazo por defecto en segundos para cada lote
+
+    Los callbacks de Dash son síncronos: `fetch` envía el lote al loop y
+    espera el resultado, así que la latencia de una página es la de la
+    petición más lenta y no la suma de todas. El plazo también llega a las
+    peticiones del ApiClient (timeout y reintentos), así que una llamada
+    vencida libera su hilo y su conexión poco después del plazo.
+    """
+
+    thread_name = "async-fetch"
+
+    def __init__(self, max_workers=10, deadline=10.0):
+        super().__init__()
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self._loop = None
+        self.batches = 0
+        self.timeouts = 0
+        self.last_batch_ms = None
+
+    def _before_start(self):
+        # Loop nuevo en cada proceso: el del padre no corre tras un fork
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(ThreadPoolExecutor(self.max_workers, thread_name_prefix="api-fetch"))
+
+    def _run(self):
+        self._loop.run_forever()
+
+    def _ensure_loop(self):
+        self.ensure_started()
+        return self._loop
+
+    def fetch(self, calls, deadline=None):
+        """
+        Ejecuta `calls` (nombre -> callable) en paralelo y bloquea hasta que
+        terminen todos o venza el plazo. Devuelve (results, errors).
+        """
+        deadline = self.deadline if deadline is None else deadline
+        if not calls:
+            return {}, {}
+
+        # Cada llamada corre con una copia del contexto de quien la pide (ej.
+        # el callback en curso, para etiquetar sus métricas) y con el plazo
+        calls = {name: _in_context(call, deadline) for name, call in calls.items()}
+        started = time.perf_counter()
+        future = asyncio.run_coroutine_threadsafe(gather_with_deadline(calls, deadline), self._ensure_loop())
+        results, errors = future.result()
+        self.batches += 1
+        self.timeouts += sum(isinstance(error, DeadlineExceeded) for error in errors.values())
+        self.last_batch_ms = round((time.perf_counter() - started) * 1000, 1)
+        return results, errors
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "max_workers": self.max_workers,
+            "deadline": self.deadline,
+            "batches": self.batches,
+            "timeouts": self.timeouts,
+            "last_batch_ms": self.last_batch_ms,
+        }
@@ -0,0 +1,52 @@
+import os
+import threading
+
+
+class BackgroundWorker:
+    """
+    Base de los componentes con un hilo de fondo por proceso (poller,
+    sondeo de salud, outbox, loop de async_fetch).
+
+    Las subclases definen `thread_name` y `_run`, que debe terminar cuando
+    se activa `_stop`. Con varios workers de gunicorn el hilo del padre no
+    existe en el hijo tras el fork: por eso `running` compara el PID.
+    """
+
+    thread_name = "background"
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """False para no arrancar nunca el hilo (ej. intervalo 0)."""
+        return True
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def _before_start(self):
+        """Prepara lo que necesita el hilo; corre con el lock de arranque tomado."""
+
+    def ensure_started(self):
+        """Arranca el hilo si no corre en este proceso (seguro tras un fork)."""
+        if not self.enabled or self.running:
+            return
+        with self._start_lock:
+            if self.running:
+                return
+            self._before_start()
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        raise NotImplementedError
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+
+CATEGORY_NAMES = [
+    "Conciertos", "Teatro", "Gastronomía", "Deportes", "Museos",
+    "Ferias", "Cine", "Talleres", "Naturaleza", "Vida Nocturna"
+]
+
+PLAN_WORDS = [
+    "concierto", "rock", "jazz", "festival", "feria", "gastronómica", "teatro",
+    "maratón", "exposición", "taller", "cine", "salsa", "café", "arte", "música"
+]
+
+LOCATIONS = [
+    "Parque Simón Bolívar", "Movistar Arena", "Teatro Colón", "Plaza de Bolívar",
+    "Corferias", "Parque de la 93", "Usaquén", "Chapinero", "La Candelaria",
+    "Jardín Botánico", "Monserrate", "Zona T"
+]
+
+
+def make_categories():
+    return [{"id": i + 1, "name": name} for i, name in enumerate(CATEGORY_NAMES)]
+
+
+def make_plans(n, seed=7):
+    """
+    Catálogo sintético de `n` planes con la forma del API real, generado
+    por columnas (un millón de planes en pocos segundos).
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, n + 1)
+    words = np.array(PLAN_WORDS)
+    first = words[rng.integers(0, len(words), n)]
+    second = words[rng.integers(0, len(words), n)]
+    now = datetime.now().replace(microsecond=0)
+    dates = pd.to_datetime(now) + pd.to_timedelta(rng.integers(-60 * 24, 120 * 24, n), unit="h")
+
+    return pd.DataFrame({
+        "id": ids,
+        "name": pd.Series(first).str.capitalize() + " " + second + " " + pd.Series(ids).astype(str),
+        "description": "Plan " + pd.Series(first) + " con " + pd.Series(second) + " para toda la familia",
+        "date": dates.strftime("%Y-%m-%dT%H:%M:%S"),
+        "imageUrl": "",
+        "location": np.array(LOCATIONS)[rng.integers(0, len(LOCATIONS), n)],
+        "map": "",
+        "priority": rng.integers(1, 11, n),
+        "category": rng.integers(1, len(CATEGORY_NAMES) + 1, n),
+        "isActive": rng.random(n) > 0.3,
+        "costEstimate": rng.integers(0, 40, n) * 5000,
+        "views": rng.integers(0, 5000, n),
+        "assistance": rng.integers(0, 60, n),
+        "updatedAt": (now - timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%S")
+    })
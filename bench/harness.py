@@ -0,0 +1,209 @@
+"""Utilidades compartidas por los benchmarks y la prueba de carga."""
+import importlib
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+
+
+# ==================== API SIMULADO ====================
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StubServer:
+    """
+    stub_api.py en un subproceso, como contexto:
+
+        with StubServer(plans=100_000) as stub:
+            os.environ["API_BASE_URL"] = stub.url
+    """
+
+    def __init__(self, plans=1000, port=None, latency_ms=0.0, startup_timeout=300.0):
+        self.plans = plans
+        self.port = port or free_port()
+        self.latency_ms = latency_ms
+        self.startup_timeout = startup_timeout
+        self.process = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(BENCH_DIR, "stub_api.py"),
+             "--plans", str(self.plans), "--port", str(self.port), "--latency-ms", str(self.latency_ms)],
+            stdout=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"El API simulado terminó al arrancar (código {self.process.returncode})")
+            try:
+                requests.get(f"{self.url}/categories", timeout=1).raise_for_status()
+                return self
+            except requests.RequestException:
+                time.sleep(0.2)
+        self.stop()
+        raise TimeoutError(f"El API simulado no respondió en {self.startup_timeout:g}s")
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait(timeout=10)
+
+    def stats(self):
+        return requests.get(f"{self.url}/_stub/stats", timeout=5).json()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+# ==================== APP ====================
+
+def bench_env(api_url, **overrides):
+    """
+    Variables de entorno para importar main.py contra `api_url` sin hilos
+    de fondo (poller, sondeo de salud) que ensucien las mediciones.
+    """
+    env = {
+        "API_BASE_URL": api_url,
+        "SNAPSHOT_POLL_INTERVAL": "0",
+        "HEALTH_PROBE_INTERVAL": "0",
+        "OUTBOX_PATH": os.path.join(tempfile.gettempdir(), f"bench-outbox-{os.getpid()}.sqlite3"),
+    }
+    env.update({key: str(value) for key, value in overrides.items()})
+    return env
+
+
+def load_app(env):
+    """Importa main.py con `env` aplicado y devuelve el módulo."""
+    os.environ.update(env)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    return importlib.import_module("main")
+
+
+def reset_caches(main):
+    """Vacía snapshots, índices y renders para medir una llamada en frío."""
+    from plan_aggregates import PlanKpiAggregator
+    from plan_search import PlanSearchIndex, PlanTrigramIndex
+    from plan_sync import PlanDeltaSync
+    from render_cache import RenderCache
+
+    main.plan_cache.invalidate()
+    main.plan_sync = PlanDeltaSync(main.api, since_param=main.PLANS_DELTA_PARAM, watermark_field=main.PLANS_DELTA_FIELD)
+    main.search_index = PlanSearchIndex()
+    main.fuzzy_index = PlanTrigramIndex()
+    main.plan_kpis = PlanKpiAggregator()
+    main.render_cache = RenderCache()
+    main.category_renders = RenderCache(max_entries=main.CATEGORY_RENDER_CACHE_ENTRIES)
+
+
+# ==================== CALLBACKS ====================
+
+def find_callback(app, name):
+    """(clave de salida, entrada de callback_map) de la función `name`."""
+    for output, entry in app.callback_map.items():
+        if getattr(entry.get("callback"), "__name__", None) == name:
+            return output, entry
+    raise KeyError(f"No hay un callback llamado {name!r}")
+
+
+def _outputs(output):
+    def spec(item):
+        component_id, prop = item.split("@")[0].rsplit(".", 1)
+        if component_id.startswith("{"):
+            # Comodín (ALL): sin componentes que coincidan, como al montar la página
+            return []
+        return {"id": component_id, "property": prop}
+
+    if output.startswith(".."):
+        return [spec(item) for item in output.strip(".").split("...")]
+    return spec(output)
+
+
+def callback_body(app, name, values=None, triggered=None):
+    """
+    Cuerpo de POST /_dash-update-component para el callback `name`, como lo
+    enviaría el navegador.
+
+    values    : dict "id.propiedad" -> valor (lo que falte va como None)
+    triggered : "id.propiedad" que disparó el callback (por defecto el
+                primer Input; "" para la llamada inicial al montar la página)
+    """
+    output, entry = find_callback(app, name)
+    values = values or {}
+    if triggered is None:
+        first = entry["inputs"][0]
+        triggered = f"{first['id']}.{first['property']}"
+
+    def props(specs):
+        return [
+            {"id": spec["id"], "property": spec["property"], "value": values.get(f"{spec['id']}.{spec['property']}")}
+            for spec in specs
+        ]
+
+    return {
+        "output": output,
+        "outputs": _outputs(output),
+        "inputs": props(entry["inputs"]),
+        "state": props(entry.get("state", [])),
+        "changedPropIds": [triggered] if triggered else [],
+    }
+
+
+def encode_body(body):
+    return json.dumps(body).encode()
+
+
+def post_callback(client, body, path="/_dash-update-component"):
+    """POST con un cliente de pruebas de Flask. Devuelve (status, bytes)."""
+    response = client.post(path, data=encode_body(body) if isinstance(body, dict) else body,
+                           content_type="application/json")
+    return response.status_code, response.get_data()
+
+
+def response_data(raw):
+    """Dict "id.propiedad" -> valor de una respuesta de Dash."""
+    if not raw:
+        return {}
+    response = json.loads(raw).get("response", {})
+    return {f"{cid}.{prop}": value for cid, props in response.items() for prop, value in props.items()}
+
+
+def percentiles(values, points=(50, 95, 99)):
+    """Percentiles por rango más cercano de `values` (ms), como dict pNN -> valor."""
+    ordered = sorted(values)
+    if not ordered:
+        return {f"p{p}": None for p in points}
+    result = {}
+    for p in points:
+        index = min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))
+        result[f"p{p}"] = round(ordered[index], 2)
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
@@ -0,0 +1,415 @@
+"""
+Prueba de carga: N operadores simulados contra el servidor Dash.
+
+Cada usuario es un hilo con su propia sesión HTTP que reproduce el tráfico
+de /_dash-update-component del navegador: navegación entre páginas, ticks
+de los intervalos (dashboard cada 30s, estado del API cada 10s) y
+búsquedas tecleadas con el debounce del input. El backend es el API
+simulado de stub_api.py.
+
+Para cada configuración de workers sube la cantidad de usuarios por
+niveles y reporta throughput, p50/p95/p99 y el punto de saturación (el
+nivel donde el throughput deja de crecer, el p95 supera el SLO o aparecen
+errores).
+
+    python bench/loadtest.py --configs 1x1,1x8,2x4 --users 1,5,10,25 --duration 30   # 2x4 requiere gunicorn
+    python bench/loadtest.py --time-scale 1   # intervalos reales (30s)
+
+--time-scale comprime intervalos y tiempos de lectura para que una corrida
+corta equivalga a varios minutos de uso (0.1: el tick de 30s ocurre cada 3s).
+Cada usuario simulado genera entonces el tráfico de 1 / time_scale
+operadores reales; los resultados se reportan también en operadores
+equivalentes (usuarios / time_scale), que es la cifra a usar para
+dimensionar.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import (BENCH_DIR, StubServer, bench_env, callback_body, encode_body, free_port, git_commit,
+                     load_app, percentiles, response_data)
+from serve import check_config, resolve_server
+
+
+# Intervalos de la app (segundos) y comportamiento del operador
+DASHBOARD_INTERVAL = 30
+STATUS_INTERVAL = 10
+SEARCH_DEBOUNCE = 0.3
+PAGE_WEIGHTS = {"/": 0.35, "/all-plans": 0.3, "/by-category": 0.2, "/analytics": 0.15}
+PAGE_DWELL = 60
+THINK_TIME = 8
+SEARCH_TERMS = ["concierto", "rock", "jazz", "feria gastronómica", "teatro", "parque", "maratón", "taller de arte"]
+
+# Criterios de saturación
+SLO_P95_MS = 1000.0
+MIN_SCALING = 0.5
+MAX_ERROR_RATE = 0.01
+
+
+# ==================== TRÁFICO ====================
+
+class Recorder:
+    """Peticiones completadas: (inicio, callback, latencia ms, ok)."""
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def add(self, started, name, latency_ms, ok):
+        with self._lock:
+            self.samples.append((started, name, latency_ms, ok))
+
+    def window(self, start, end):
+        with self._lock:
+            return [sample for sample in self.samples if start <= sample[0] < end]
+
+
+class SimulatedUser(threading.Thread):
+    """Un operador con el dashboard abierto en una pestaña."""
+
+    def __init__(self, base_url, templates, recorder, stop, scale, seed, timeout=60):
+        super().__init__(daemon=True)
+        self.url = f"{base_url}/_dash-update-component"
+        self.templates = templates
+        self.recorder = recorder
+        self.stop = stop
+        self.scale = scale
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.session = requests.Session()
+        self.values = {}
+        self.categories = []
+
+    def post(self, name, values=None, triggered=None):
+        """Envía el callback `name` con el estado actual de la pestaña."""
+        self.values.update(values or {})
+        body = self.templates(name, self.values, triggered)
+        started = time.monotonic()
+        try:
+            response = self.session.post(self.url, data=body, timeout=self.timeout,
+                                         headers={"Content-Type": "application/json"})
+            ok = response.status_code in (200, 204)
+            data = response_data(response.content) if response.status_code == 200 else {}
+        except requests.RequestException:
+            ok, data = False, {}
+        self.recorder.add(started, name, (time.monotonic() - started) * 1000, ok)
+        return data
+
+    def wait(self, seconds):
+        return self.stop.wait(max(seconds, 0))
+
+    # ---------- páginas ----------
+
+    def visit(self, page):
+        self.values["url.pathname"] = page
+        self.post("display_page", triggered="url.pathname")
+        if page == "/":
+            self.values["interval-dashboard.n_intervals"] = 0
+            data = self.post("update_dashboard", {"dashboard-version.data": None}, "")
+            self.values["dashboard-version.data"] = data.get("dashboard-version.data")
+        elif page == "/all-plans":
+            self.values.update({
+                "search-plans.value": None, "fuzzy-search.value": False, "filter-status.value": "all",
+                "all-plans-table.page_current": 0, "all-plans-table.page_size": 15,
+                "all-plans-table.sort_by": [], "all-plans-table.filter_query": "",
+            })
+            self.post("fetch_all_plans", triggered="")
+        elif page == "/by-category":
+            data = self.post("load_category_options", {"cat-id.id": "cat-id"}, "")
+            self.categories = data.get("cat-id.options") or []
+            self.values.update({"cat-id.value": [], "cat-id.options": self.categories, "cat-cards-shown.data": None})
+        elif page == "/analytics":
+            self.post("update_analytics", {"analytics-version.data": None}, "")
+
+    def tick_dashboard(self):
+        self.values["interval-dashboard.n_intervals"] += 1
+        data = self.post("update_dashboard", triggered="interval-dashboard.n_intervals")
+        if data.get("dashboard-version.data"):
+            self.values["dashboard-version.data"] = data["dashboard-version.data"]
+
+    def tick_status(self):
+        self.values["interval-component.n_intervals"] = self.values.get("interval-component.n_intervals", 0) + 1
+        self.post("update_api_status", triggered="interval-component.n_intervals")
+
+    def type_search(self):
+        """Teclea un término; con el debounce solo viajan las pausas largas."""
+        term = self.rng.choice(SEARCH_TERMS)
+        for i in range(1, len(term) + 1):
+            pause = self.rng.uniform(0.05, 0.45)
+            if pause >= SEARCH_DEBOUNCE or i == len(term):
+                self.post("fetch_all_plans", {"search-plans.value": term[:i], "all-plans-table.page_current": 0},
+                          "search-plans.value")
+            if self.wait(pause):
+                return
+
+    def interact(self, page):
+        if page == "/all-plans":
+            action = self.rng.random()
+            if action < 0.5:
+                self.type_search()
+            elif action < 0.8:
+                self.post("fetch_all_plans", {"all-plans-table.page_current": self.rng.randint(1, 10)},
+                          "all-plans-table.page_current")
+            else:
+                column = self.rng.choice(["Vistas", "Prioridad", "Costo", "Nombre"])
+                self.post("fetch_all_plans", {"all-plans-table.sort_by": [{"column_id": column, "direction": "desc"}]},
+                          "all-plans-table.sort_by")
+        elif page == "/by-category" and self.categories:
+            chosen = self.rng.sample(self.categories, self.rng.randint(1, min(3, len(self.categories))))
+            self.post("fetch_by_category", {"cat-id.value": [option["value"] for option in chosen]}, "cat-id.value")
+
+    def run(self):
+        scale = self.scale
+        now = time.monotonic()
+        # Los ticks de cada pestaña no están sincronizados entre usuarios
+        next_status = now + self.rng.uniform(0, STATUS_INTERVAL * scale)
+        while not self.stop.is_set():
+            page = self.rng.choices(list(PAGE_WEIGHTS), weights=PAGE_WEIGHTS.values())[0]
+            self.visit(page)
+            now = time.monotonic()
+            leave_at = now + self.rng.expovariate(1 / (PAGE_DWELL * scale))
+            next_dashboard = now + DASHBOARD_INTERVAL * scale if page == "/" else float("inf")
+            next_action = now + self.rng.expovariate(1 / (THINK_TIME * scale))
+            while not self.stop.is_set():
+                wake = min(leave_at, next_status, next_dashboard, next_action)
+                if self.wait(wake - time.monotonic()):
+                    return
+                now = time.monotonic()
+                if now >= next_status:
+                    self.tick_status()
+                    next_status = now + STATUS_INTERVAL * scale
+                if now >= next_dashboard:
+                    self.tick_dashboard()
+                    next_dashboard = now + DASHBOARD_INTERVAL * scale
+                if now >= next_action:
+                    self.interact(page)
+                    next_action = time.monotonic() + self.rng.expovariate(1 / (THINK_TIME * scale))
+                if time.monotonic() >= leave_at:
+                    break
+
+
+def request_templates(main):
+    """Función (callback, valores, disparador) -> cuerpo JSON ya codificado."""
+    def build(name, values, triggered):
+        return encode_body(callback_body(main.app, name, values, triggered))
+    return build
+
+
+# ==================== NIVELES ====================
+
+def summarize(samples, seconds):
+    latencies = [sample[2] for sample in samples if sample[3]]
+    errors = sum(1 for sample in samples if not sample[3])
+    by_callback = {}
+    for _, name, latency, ok in samples:
+        if ok:
+            by_callback.setdefault(name, []).append(latency)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(latencies) / seconds, 2) if seconds else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else None,
+        **{f"{key}_ms": value for key, value in percentiles(latencies).items()},
+        "callbacks": {
+            name: {"requests": len(values), **{f"{key}_ms": value for key, value in percentiles(values).items()}}
+            for name, values in sorted(by_callback.items())
+        },
+    }
+
+
+def run_level(base_url, templates, users, duration, warmup, scale, seed):
+    """Corre `users` usuarios por `warmup + duration` segundos y mide la ventana final."""
+    recorder, stop = Recorder(), threading.Event()
+    threads = [SimulatedUser(base_url, templates, recorder, stop, scale, seed + i) for i in range(users)]
+    started = time.monotonic()
+    for i, thread in enumerate(threads):
+        # Arranque escalonado durante el calentamiento
+        thread.start()
+        stop.wait(warmup / max(users, 1) / 2)
+    measure_from = started + warmup
+    stop.wait(max(measure_from + duration - time.monotonic(), 0))
+    measure_to = time.monotonic()
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=65)
+    return summarize(recorder.window(measure_from, measure_to), measure_to - measure_from)
+
+
+def saturation(levels, slo_ms=SLO_P95_MS, min_scaling=MIN_SCALING, max_error_rate=MAX_ERROR_RATE):
+    """
+    Primer nivel saturado y el último sostenible, en usuarios simulados y
+    en operadores equivalentes. Un nivel satura si supera
+    el SLO de p95, tiene errores o si el throughput crece menos que
+    `min_scaling` veces lo que crecieron los usuarios respecto al nivel
+    anterior (ej. el doble de usuarios y menos de 1.5x de throughput).
+    """
+    previous = None
+    for level in levels:
+        reasons = []
+        if level["p95_ms"] is not None and level["p95_ms"] > slo_ms:
+            reasons.append(f"p95 {level['p95_ms']:.0f} ms > {slo_ms:.0f} ms")
+        if level["error_rate"] > max_error_rate:
+            reasons.append(f"errores {level['error_rate']:.1%}")
+        expected = 1 + min_scaling * (level["users"] / previous["users"] - 1) if previous else 1
+        if previous is not None and level["throughput_rps"] < previous["throughput_rps"] * expected:
+            reasons.append(f"throughput {previous['throughput_rps']} -> {level['throughput_rps']} req/s")
+        if reasons:
+            return {
+                "saturated_at_users": level["users"],
+                "max_sustainable_users": previous["users"] if previous else 0,
+                "saturated_at_operators": level["operators"],
+                "max_sustainable_operators": previous["operators"] if previous else 0,
+                "peak_throughput_rps": max(l["throughput_rps"] for l in levels),
+                "reasons": reasons,
+            }
+        previous = level
+    return {
+        "saturated_at_users": None,
+        "max_sustainable_users": previous["users"] if previous else 0,
+        "saturated_at_operators": None,
+        "max_sustainable_operators": previous["operators"] if previous else 0,
+        "peak_throughput_rps": max((l["throughput_rps"] for l in levels), default=0.0),
+        "reasons": [],
+    }
+
+
+# ==================== SERVIDOR ====================
+
+def parse_config(text):
+    workers, _, threads = text.strip().lower().partition("x")
+    return int(workers), int(threads or 1)
+
+
+class AppServer:
+    """serve.py en un subproceso para una configuración de workers."""
+
+    def __init__(self, env, workers, threads, server="auto", startup_timeout=120.0):
+        self.env = env
+        self.workers = workers
+        self.threads = threads
+        self.server = server
+        self.port = free_port()
+        self.startup_timeout = startup_timeout
+        self.process = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(BENCH_DIR, "serve.py"), "--port", str(self.port),
+             "--workers", str(self.workers), "--threads", str(self.threads), "--server", self.server],
+            env={**os.environ, **self.env}
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"El servidor terminó al arrancar (código {self.process.returncode})")
+            try:
+                requests.get(f"{self.url}/_dash-layout", timeout=2).raise_for_status()
+                return self
+            except requests.RequestException:
+                time.sleep(0.3)
+        self.__exit__(None, None, None)
+        raise TimeoutError(f"El servidor no respondió en {self.startup_timeout:g}s")
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configs", default="1x1,1x8", help="workers x hilos, ej. 1x1,1x8,2x4")
+    parser.add_argument("--users", default="1,2,5,10,20", help="usuarios simultáneos por nivel")
+    parser.add_argument("--plans", type=int, default=10_000, help="tamaño del catálogo del API simulado")
+    parser.add_argument("--api-latency-ms", type=float, default=20.0, help="latencia del API simulado")
+    parser.add_argument("--duration", type=float, default=20.0, help="segundos medidos por nivel")
+    parser.add_argument("--warmup", type=float, default=5.0, help="segundos de calentamiento por nivel")
+    parser.add_argument("--time-scale", type=float, default=0.1, help="factor de los intervalos y tiempos de lectura")
+    parser.add_argument("--slo-ms", type=float, default=SLO_P95_MS, help="p95 máximo aceptable")
+    parser.add_argument("--server", choices=["auto", "gunicorn", "werkzeug"], default="auto")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="archivo de resultados (por defecto bench/results/loadtest-<fecha>.json)")
+    parser.add_argument("--no-stop-at-saturation", action="store_true",
+                        help="seguir subiendo usuarios después del nivel saturado")
+    args = parser.parse_args(argv)
+
+    configs = [parse_config(config) for config in args.configs.split(",") if config.strip()]
+    server = resolve_server(args.server)
+    for workers, threads in configs:
+        error = check_config(server, workers, threads)
+        if error:
+            parser.error(error)
+    levels = sorted({int(users) for users in args.users.split(",") if users.strip()})
+    started_at = datetime.now()
+    report = {
+        "meta": {
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "cpus": os.cpu_count(),
+            "plans": args.plans,
+            "api_latency_ms": args.api_latency_ms,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "time_scale": args.time_scale,
+            "slo_p95_ms": args.slo_ms,
+            "server": server,
+        },
+        "configs": [],
+    }
+
+    with StubServer(plans=args.plans, latency_ms=args.api_latency_ms) as stub:
+        env = bench_env(stub.url)
+        # Los cuerpos de las peticiones salen del mismo callback_map que sirve el servidor
+        templates = request_templates(load_app(env))
+        for workers, threads in configs:
+            print(f"\n{workers} worker(s) x {threads} hilo(s)", flush=True)
+            results = []
+            with AppServer(env, workers, threads, server) as app_server:
+                for users in levels:
+                    level = run_level(app_server.url, templates, users, args.duration, args.warmup,
+                                      args.time_scale, args.seed)
+                    level["users"] = users
+                    # Con la escala de tiempo cada usuario simulado equivale a 1/scale operadores
+                    level["operators"] = round(users / args.time_scale, 1)
+                    results.append(level)
+                    print(f"  {users:>4} usuarios (~{level['operators']:g} operadores)  {level['throughput_rps']:>7.1f} req/s  "
+                          f"p50 {level['p50_ms'] or 0:>8.1f}  p95 {level['p95_ms'] or 0:>8.1f}  "
+                          f"p99 {level['p99_ms'] or 0:>8.1f} ms  errores {level['errors']}", flush=True)
+                    if not args.no_stop_at_saturation and saturation(results, args.slo_ms)["saturated_at_users"]:
+                        break
+            summary = saturation(results, args.slo_ms)
+            print(f"  saturación: {summary['saturated_at_users'] or 'no alcanzada'}; "
+                  f"máximo sostenible {summary['max_sustainable_users']} usuarios simulados "
+                  f"= ~{summary['max_sustainable_operators']:g} operadores reales "
+                  f"({'; '.join(summary['reasons']) or 'sin límites'})", flush=True)
+            report["configs"].append({"workers": workers, "threads": threads, "levels": results, "saturation": summary})
+
+    output = args.output or os.path.join(BENCH_DIR, "results", f"loadtest-{started_at:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados en {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
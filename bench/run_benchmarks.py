@@ -0,0 +1,244 @@
+"""
+Benchmarks de los callbacks principales contra el API simulado.
+
+Mide de punta a punta (POST /_dash-update-component en el servidor Flask)
+update_dashboard, fetch_all_plans, update_analytics y fetch_by_category
+con catálogos sintéticos: tiempo de pared, pico de memoria (tracemalloc)
+y bytes de la respuesta. Cada tamaño corre en un proceso nuevo.
+
+    python bench/run_benchmarks.py                      # 1k y 100k
+    python bench/run_benchmarks.py --sizes 1k,100k,1m --repeats 3
+    python bench/run_benchmarks.py --compare bench/results/bench-anterior.json
+
+Los resultados quedan en bench/results/bench-<fecha>.json. Variables como
+PLANS_CACHE_MAX_BYTES se heredan del entorno, así que se pueden comparar
+configuraciones.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import (BENCH_DIR, StubServer, bench_env, callback_body, git_commit, load_app,
+                     percentiles, post_callback, reset_caches, response_data)
+
+
+# Umbral (%) de la mediana para marcar una regresión al comparar
+REGRESSION_THRESHOLD = 10.0
+
+
+def parse_size(text):
+    text = text.strip().lower().replace("_", "")
+    factor = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * factor)
+
+
+def scenarios(main):
+    """
+    (callback, escenario, valores, disparador, en frío, valores tomados de
+    la respuesta anterior del mismo callback).
+    """
+    categories = [{"label": c["name"], "value": c["id"]} for c in main.get_categories_snapshot().data]
+    table = {
+        "filter-status.value": "all",
+        "all-plans-table.page_current": 0,
+        "all-plans-table.page_size": main.PLAN_TABLE_PAGE_SIZE,
+    }
+    category = {"cat-id.value": [1, 2], "cat-id.options": categories}
+    return [
+        ("update_dashboard", "cold", {"url.pathname": "/", "interval-dashboard.n_intervals": 0}, "url.pathname", True, None),
+        ("update_dashboard", "warm", {"url.pathname": "/", "interval-dashboard.n_intervals": 0}, "url.pathname", False, None),
+        ("update_dashboard", "tick_unchanged", {"url.pathname": "/", "interval-dashboard.n_intervals": 1},
+         "interval-dashboard.n_intervals", False, "dashboard-version.data"),
+        ("fetch_all_plans", "cold", {**table, "fetch-all.n_clicks": 1}, "fetch-all.n_clicks", True, None),
+        ("fetch_all_plans", "refresh", {**table, "fetch-all.n_clicks": 1}, "fetch-all.n_clicks", False, None),
+        ("fetch_all_plans", "search", {**table, "search-plans.value": "concierto rock"}, "search-plans.value", False, None),
+        ("fetch_all_plans", "fuzzy_search", {**table, "search-plans.value": "conciertto", "fuzzy-search.value": True},
+         "search-plans.value", False, None),
+        ("fetch_all_plans", "sort_page", {**table, "all-plans-table.page_current": 3,
+                                          "all-plans-table.sort_by": [{"column_id": "Vistas", "direction": "desc"}]},
+         "all-plans-table.sort_by", False, None),
+        ("update_analytics", "cold", {"url.pathname": "/analytics"}, "url.pathname", True, None),
+        ("update_analytics", "warm", {"url.pathname": "/analytics"}, "url.pathname", False, None),
+        ("fetch_by_category", "cold", category, "cat-id.value", True, None),
+        ("fetch_by_category", "warm", category, "cat-id.value", False, None),
+        ("fetch_by_category", "refresh", {**category, "fetch-cat.n_clicks": 1}, "fetch-cat.n_clicks", False, None),
+    ]
+
+
+def timed_call(client, body):
+    gc.collect()
+    started = time.perf_counter()
+    status, raw = post_callback(client, body)
+    return (time.perf_counter() - started) * 1000, status, raw
+
+
+def run_scenario(main, client, name, scenario, values, triggered, cold, carry, repeats, last):
+    values = dict(values)
+    if carry:
+        values[carry] = response_data(last.get(name)).get(carry)
+    body = callback_body(main.app, name, values, triggered=triggered)
+
+    if not cold:
+        # Calienta cachés e índices con la misma petición
+        post_callback(client, body)
+
+    wall = []
+    for _ in range(repeats):
+        if cold:
+            reset_caches(main)
+        elapsed, status, raw = timed_call(client, body)
+        wall.append(elapsed)
+
+    # Pico de memoria en una pasada aparte (tracemalloc distorsiona el tiempo)
+    if cold:
+        reset_caches(main)
+    gc.collect()
+    tracemalloc.start()
+    post_callback(client, body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    last[name] = raw
+    return {
+        "callback": name,
+        "scenario": scenario,
+        "status": status,
+        "repeats": repeats,
+        "wall_ms": {
+            "min": round(min(wall), 2),
+            "median": round(statistics.median(wall), 2),
+            **percentiles(wall, (95,)),
+            "max": round(max(wall), 2),
+        },
+        "peak_kb": round(peak / 1024, 1),
+        "response_bytes": len(raw),
+    }
+
+
+def run_worker(api_url, plans, repeats, output):
+    """Un tamaño de catálogo en este proceso; escribe los resultados en `output`."""
+    started = time.perf_counter()
+    main = load_app(bench_env(api_url))
+    import_s = time.perf_counter() - started
+    client = main.server.test_client()
+
+    results, last = [], {}
+    for name, scenario, values, triggered, cold, carry in scenarios(main):
+        result = run_scenario(main, client, name, scenario, values, triggered, cold, carry, repeats, last)
+        result["plans"] = plans
+        results.append(result)
+        print(f"  {name:<18} {scenario:<15} mediana {result['wall_ms']['median']:>10.1f} ms  "
+              f"pico {result['peak_kb']:>10.0f} KB  {result['response_bytes']:>10} B", flush=True)
+
+    with open(output, "w") as f:
+        json.dump({"plans": plans, "import_s": round(import_s, 2), "results": results}, f)
+
+
+def run_size(plans, repeats, latency_ms, timeout):
+    with StubServer(plans=plans, latency_ms=latency_ms) as stub, \
+            tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker",
+             "--api-url", stub.url, "--plans", str(plans), "--repeats", str(repeats), "--output", tmp.name],
+            check=True, timeout=timeout
+        )
+    with open(tmp.name) as f:
+        data = json.load(f)
+    os.unlink(tmp.name)
+    return data
+
+
+# ==================== COMPARACIÓN ====================
+
+def compare(old, new, threshold=REGRESSION_THRESHOLD):
+    """Imprime la variación de la mediana por escenario; devuelve las regresiones."""
+    def index(data):
+        return {(r["plans"], r["callback"], r["scenario"]): r for r in data["results"]}
+
+    old_results, regressions = index(old), []
+    common = [(key, result) for key, result in index(new).items() if key in old_results]
+    print(f"\nComparación con {old['meta'].get('commit')} ({old['meta'].get('started_at')}):")
+    if not common:
+        print("  Sin escenarios en común")
+    for key, result in common:
+        before = old_results[key]
+        old_ms, new_ms = before["wall_ms"]["median"], result["wall_ms"]["median"]
+        change = (new_ms - old_ms) / old_ms * 100 if old_ms else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  <- regresión"
+            regressions.append({"key": list(key), "old_ms": old_ms, "new_ms": new_ms, "change_pct": round(change, 1)})
+        print(f"  {key[0]:>8} {key[1]:<18} {key[2]:<15} {old_ms:>10.1f} -> {new_ms:>10.1f} ms ({change:+.1f}%){flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,100k", help="tamaños de catálogo, ej. 1k,100k,1m")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latencia añadida por el API simulado")
+    parser.add_argument("--timeout", type=float, default=3600, help="segundos máximos por tamaño")
+    parser.add_argument("--output", help="archivo de resultados (por defecto bench/results/bench-<fecha>.json)")
+    parser.add_argument("--compare", help="resultados anteriores para comparar")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="%% de regresión tolerado")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    # Uso interno: un tamaño dentro del subproceso
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--api-url", help=argparse.SUPPRESS)
+    parser.add_argument("--plans", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.api_url, args.plans, args.repeats, args.output)
+        return 0
+
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+    started_at = datetime.now()
+    report = {
+        "meta": {
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sizes": sizes,
+            "repeats": args.repeats,
+            "latency_ms": args.latency_ms,
+        },
+        "import_s": {},
+        "results": [],
+    }
+    for plans in sizes:
+        print(f"\n{plans} planes", flush=True)
+        data = run_size(plans, args.repeats, args.latency_ms, args.timeout)
+        report["import_s"][str(plans)] = data["import_s"]
+        report["results"].extend(data["results"])
+
+    output = args.output or os.path.join(BENCH_DIR, "results", f"bench-{started_at:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        report["regressions"] = regressions
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados en {output}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
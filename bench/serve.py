@@ -0,0 +1,108 @@
+"""
+Levanta `server` de main.py con una configuración de workers para la
+prueba de carga.
+
+Usa gunicorn (worker gthread: procesos x hilos) si está instalado. Sin
+gunicorn solo se admite un worker: Werkzeug con un pool fijo de hilos
+(su opción `processes` hace un fork por petición, no workers de larga
+vida, así que no sirve para medir varios workers).
+
+    python bench/serve.py --port 8050 --workers 2 --threads 4
+"""
+import argparse
+import logging
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import REPO_ROOT, load_app
+
+
+def resolve_server(server):
+    """Servidor a usar: con "auto", gunicorn si está instalado o Werkzeug."""
+    if server == "auto":
+        return "gunicorn" if shutil.which("gunicorn") else "werkzeug"
+    return server
+
+
+def check_config(server, workers, threads):
+    """Mensaje de error si `server` no puede correr workers x hilos tal cual (o None)."""
+    if server == "gunicorn" and not shutil.which("gunicorn"):
+        return "gunicorn no está instalado"
+    if server == "werkzeug" and workers > 1:
+        return f"{workers}x{threads} requiere gunicorn: Werkzeug solo corre un worker"
+    if workers < 1 or threads < 1:
+        return "workers e hilos deben ser al menos 1"
+    return None
+
+
+def gunicorn_command(host, port, workers, threads):
+    return [
+        shutil.which("gunicorn"), "main:server",
+        "--chdir", REPO_ROOT,
+        "--bind", f"{host}:{port}",
+        "--workers", str(workers),
+        "--threads", str(threads),
+        "--worker-class", "gthread",
+        "--timeout", "120",
+        "--log-level", "warning",
+    ]
+
+
+def serve_werkzeug(app, host, port, threads):
+    """Un proceso con exactamente `threads` hilos atendiendo peticiones."""
+    from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+    class Handler(WSGIRequestHandler):
+        # Sin keep-alive: una conexión ociosa no retiene un hilo del pool
+        protocol_version = "HTTP/1.0"
+
+    class PooledWSGIServer(BaseWSGIServer):
+        multithread = threads > 1
+
+        def __init__(self):
+            super().__init__(host, port, app, handler=Handler)
+            self.pool = ThreadPoolExecutor(threads, thread_name_prefix="wsgi")
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self._handle, request, client_address)
+
+        def _handle(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    PooledWSGIServer().serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--server", choices=["auto", "gunicorn", "werkzeug"], default="auto")
+    args = parser.parse_args(argv)
+
+    server = resolve_server(args.server)
+    error = check_config(server, args.workers, args.threads)
+    if error:
+        parser.error(error)
+
+    if server == "gunicorn":
+        # El entorno (API_BASE_URL, etc.) lo hereda gunicorn del proceso padre
+        command = gunicorn_command(args.host, args.port, args.workers, args.threads)
+        os.execv(command[0], command)
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    serve_werkzeug(load_app({}).server, args.host, args.port, args.threads)
+
+
+if __name__ == "__main__":
+    main()
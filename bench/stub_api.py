@@ -0,0 +1,135 @@
+"""
+API de planes simulado para benchmarks y pruebas de carga.
+
+Sirve /plans, /plans/category/{id}, /categories y /plans/publish sobre un
+catálogo sintético (ver catalog.py), con las respuestas ya codificadas y
+ETag / If-None-Match como el backend real.
+
+    python bench/stub_api.py --plans 100000 --port 12500 --latency-ms 20
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from flask import Flask, Response, jsonify, request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from catalog import make_categories, make_plans
+
+
+class Catalog:
+    """Catálogo en memoria con los cuerpos JSON precalculados por ruta."""
+
+    def __init__(self, n_plans, seed=7):
+        self.frame = make_plans(n_plans, seed=seed)
+        self.categories = make_categories()
+        self.published = []
+        self._lock = threading.Lock()
+        self._encode()
+
+    def _encode(self):
+        self.bodies = {"/plans": self.frame.to_json(orient="records").encode()}
+        for cid, group in self.frame.groupby("category"):
+            self.bodies[f"/plans/category/{cid}"] = group.to_json(orient="records").encode()
+        self.bodies["/categories"] = json.dumps(self.categories).encode()
+        self.etags = {path: hashlib.md5(body).hexdigest() for path, body in self.bodies.items()}
+
+    def body(self, path):
+        """(cuerpo, etag) de `path`, o (None, None) si no existe."""
+        with self._lock:
+            return self.bodies.get(path), self.etags.get(path)
+
+    def since(self, watermark):
+        """Planes con updatedAt posterior a `watermark` (para deltas)."""
+        changed = self.frame[self.frame["updatedAt"] > watermark]
+        extra = [plan for plan in self.published if plan.get("updatedAt", "") > watermark]
+        return json.loads(changed.to_json(orient="records")) + extra
+
+    def publish(self, plan):
+        """Agrega `plan` al final de /plans y de su categoría sin recodificar todo."""
+        with self._lock:
+            plan = {**plan, "id": len(self.frame) + len(self.published) + 1,
+                    "updatedAt": datetime.now().strftime("%Y-%m-%dT%H:%M:%S")}
+            self.published.append(plan)
+            encoded = json.dumps(plan).encode()
+            for path in ("/plans", f"/plans/category/{plan.get('category')}"):
+                body = self.bodies.get(path, b"[]")
+                self.bodies[path] = (body[:-1] + b"," if body != b"[]" else b"[") + encoded + b"]"
+                self.etags[path] = hashlib.md5(self.bodies[path]).hexdigest()
+            return plan
+
+
+def create_app(catalog, latency_ms=0.0):
+    app = Flask(__name__)
+    calls = {}
+
+    @app.before_request
+    def _delay():
+        calls[request.path] = calls.get(request.path, 0) + 1
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+    def cached(path):
+        body, etag = catalog.body(path)
+        if body is None:
+            return Response(b"[]", mimetype="application/json")
+        if request.headers.get("If-None-Match", "").strip('"') == etag:
+            return Response(status=304, headers={"ETag": f'"{etag}"'})
+        return Response(body, mimetype="application/json", headers={"ETag": f'"{etag}"'})
+
+    @app.route("/plans", methods=["GET", "HEAD"])
+    def plans():
+        since = request.args.get("updatedSince")
+        if since:
+            return jsonify(catalog.since(since))
+        return cached("/plans")
+
+    @app.route("/plans/category/<int:cid>", methods=["GET", "HEAD"])
+    def plans_by_category(cid):
+        return cached(f"/plans/category/{cid}")
+
+    @app.route("/categories", methods=["GET", "HEAD"])
+    def categories():
+        return cached("/categories")
+
+    @app.post("/plans/publish")
+    def publish():
+        plan = request.get_json(silent=True)
+        if not isinstance(plan, dict) or not plan.get("name"):
+            return jsonify({"error": "name es obligatorio"}), 400
+        return jsonify(catalog.publish(plan))
+
+    @app.get("/_stub/stats")
+    def stats():
+        return jsonify({"plans": len(catalog.frame) + len(catalog.published), "calls": calls})
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, default=1000, help="tamaño del catálogo sintético")
+    parser.add_argument("--port", type=int, default=12500)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latencia añadida a cada petición")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    catalog = Catalog(args.plans, seed=args.seed)
+    print(f"Catálogo de {args.plans} planes listo en {time.perf_counter() - started:.1f}s "
+          f"({len(catalog.bodies['/plans']) / 1e6:.1f} MB)", flush=True)
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    create_app(catalog, args.latency_ms).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+from dash import Patch, no_update
+from plotly.utils import PlotlyJSONEncoder
+
+
+# Propiedades de traza que cambian con los datos (el layout no cambia)
+PATCHABLE_TRACE_PROPS = ("x", "y", "text", "marker.color")
+
+
+def _plain(value):
+    if value is None:
+        return None
+    if isinstance(value, (str, int, float)):
+        return value
+    return np.asarray(value).tolist()
+
+
+def _trace_value(trace, prop):
+    value = trace
+    for part in prop.split("."):
+        value = value[part]
+        if value is None:
+            return None
+    return value
+
+
+def figure_patch(old, new):
+    """
+    Actualización mínima de `old` a `new` (go.Figure): un Patch que solo
+    reemplaza los arreglos de trazas que cambiaron, no_update si nada
+    cambió, o la figura completa si cambió la estructura de trazas.
+    """
+    if old is None or not new.data or len(old.data) != len(new.data):
+        return new
+
+    patch = Patch()
+    changed = False
+    for i, (old_trace, new_trace) in enumerate(zip(old.data, new.data)):
+        if old_trace.type != new_trace.type:
+            return new
+        for prop in PATCHABLE_TRACE_PROPS:
+            new_value = _plain(_trace_value(new_trace, prop))
+            if _plain(_trace_value(old_trace, prop)) == new_value:
+                continue
+            *parents, leaf = prop.split(".")
+            target = patch["data"][i]
+            for part in parents:
+                target = target[part]
+            target[leaf] = new_value
+            changed = True
+    return patch if changed else no_update
+
+
+def component_update(old, new):
+    """no_update si el árbol de componentes serializa igual; si no, `new`."""
+    if old is None:
+        return new
+    same = json.dumps(old, cls=PlotlyJSONEncoder) == json.dumps(new, cls=PlotlyJSONEncoder)
+    return no_update if same else new
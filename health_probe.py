@@ -0,0 +1,172 @@
+import logging
+import threading
+import time
+
+import numpy as np
+import requests
+
+from background import BackgroundWorker
+
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyRing:
+    """
+    Últimas `size` mediciones de un endpoint (latencia en ms y si fue
+    exitosa). El resumen solo usa las de los últimos `window` segundos.
+    """
+
+    def __init__(self, size=256, window=300.0):
+        self.size = size
+        self.window = window
+        self._latency = np.zeros(size, dtype=np.float32)
+        self._ok = np.zeros(size, dtype=bool)
+        self._at = np.zeros(size, dtype=np.float64)
+        self._count = 0
+        self._lock = threading.Lock()
+        self.last_at = None
+        self.last_error = None
+
+    def add(self, latency_ms, ok, error=None):
+        with self._lock:
+            i = self._count % self.size
+            self._latency[i] = latency_ms
+            self._ok[i] = ok
+            self._count += 1
+            self.last_at = self._at[i] = time.time()
+            if not ok:
+                self.last_error = error
+
+    def summary(self):
+        with self._lock:
+            n = min(self._count, self.size)
+            # Fuera de la ventana quedan, p. ej., los errores de una caída ya superada
+            recent = self._at[:n] >= time.time() - self.window
+            latency = self._latency[:n][recent]
+            ok = self._ok[:n][recent]
+            n = len(latency)
+            last = (self._count - 1) % self.size if self._count else None
+            last_ok = bool(self._ok[last]) if last is not None else None
+            last_at, last_error = self.last_at, self.last_error
+
+        if n == 0:
+            return {"samples": 0}
+        p50, p95, p99 = np.percentile(latency, [50, 95, 99])
+        return {
+            "samples": int(n),
+            "error_rate": round(float(1 - ok.mean()), 4),
+            "p50_ms": round(float(p50), 1),
+            "p95_ms": round(float(p95), 1),
+            "p99_ms": round(float(p99), 1),
+            "last_ok": last_ok,
+            "last_at": last_at,
+            "last_error": last_error,
+        }
+
+
+class HealthProber(BackgroundWorker):
+    """
+    Latencia y tasa de errores por endpoint del API.
+
+    api       : api_client.ApiClient (se registra como su observador)
+    endpoints : dict - prefijo de ruta -> ruta a sondear, o None para
+                solo medir el tráfico real (ej. publicar)
+    interval  : float - segundos entre sondeos
+    ring_size : int   - mediciones que se conservan por endpoint
+    window    : float - segundos de mediciones que cuentan en el estado
+    timeout   : float - timeout de cada sondeo
+
+    Todas las peticiones del cliente alimentan las mediciones. El hilo solo
+    envía un HEAD a los endpoints sin tráfico en el último intervalo, así
+    que leer el estado no cuesta peticiones.
+    """
+
+    thread_name = "health-prober"
+
+    def __init__(self, api, endpoints, interval=15.0, ring_size=256, window=300.0, timeout=3.0,
+                 degraded_error_rate=0.1, degraded_p95_ms=2000.0):
+        super().__init__()
+        self.api = api
+        self.endpoints = dict(endpoints)
+        self.interval = interval
+        self.timeout = timeout
+        self.degraded_error_rate = degraded_error_rate
+        self.degraded_p95_ms = degraded_p95_ms
+        self.rings = {prefix: LatencyRing(ring_size, window) for prefix in self.endpoints}
+        self._prefixes = sorted(self.endpoints, key=len, reverse=True)
+        self.probes = 0
+        api.observer = self.observe
+
+    def endpoint_for(self, path):
+        """Prefijo configurado más largo que coincide con `path` (o None)."""
+        path = path.split("?", 1)[0]
+        for prefix in self._prefixes:
+            if path.startswith(prefix):
+                return prefix
+        return None
+
+    def observe(self, path, latency_ms, ok, error=None):
+        prefix = self.endpoint_for(path)
+        if prefix is not None:
+            self.rings[prefix].add(latency_ms, ok, error)
+
+    # ---------- sondeo ----------
+
+    @property
+    def enabled(self):
+        return self.interval > 0
+
+    def probe(self, prefix):
+        """Un HEAD al endpoint (sin reintentos ni circuit breaker)."""
+        path = self.endpoints[prefix]
+        started = time.perf_counter()
+        try:
+            response = self.api.session.head(f"{self.api.base_url}{path}", timeout=self.timeout)
+        except requests.RequestException as e:
+            self.rings[prefix].add((time.perf_counter() - started) * 1000, False, str(e))
+        else:
+            ok = response.status_code < 500
+            self.rings[prefix].add((time.perf_counter() - started) * 1000, ok, None if ok else f"HTTP {response.status_code}")
+        self.probes += 1
+
+    def probe_idle(self):
+        """Sondea los endpoints sin mediciones recientes."""
+        now = time.time()
+        for prefix, path in self.endpoints.items():
+            last_at = self.rings[prefix].last_at
+            if path is not None and (last_at is None or now - last_at >= self.interval):
+                self.probe(prefix)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.probe_idle()
+            except Exception:
+                logger.exception("Error sondeando el API")
+            self._stop.wait(self.interval)
+
+    # ---------- estado ----------
+
+    def stats(self):
+        return {prefix: ring.summary() for prefix, ring in self.rings.items()}
+
+    def status(self):
+        """
+        Estado general: "ok", "degraded", "down" o "unknown", con el p95 más
+        alto entre endpoints y el estado del circuit breaker.
+        """
+        summaries = [summary for summary in self.stats().values() if summary["samples"]]
+        breaker = self.api.breaker.state if self.api.breaker is not None else None
+        if not summaries:
+            return {"status": "unknown", "p95_ms": None, "error_rate": None, "breaker": breaker}
+
+        p95 = max(summary["p95_ms"] for summary in summaries)
+        error_rate = max(summary["error_rate"] for summary in summaries)
+        if breaker == "open" or all(summary["last_ok"] is False for summary in summaries):
+            status = "down"
+        elif error_rate > self.degraded_error_rate or p95 > self.degraded_p95_ms:
+            status = "degraded"
+        else:
+            status = "ok"
+        return {"status": status, "p95_ms": p95, "error_rate": error_rate, "breaker": breaker}
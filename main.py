@@ -1,14 +1,105 @@
-from dash import Dash, html, dcc, Input, Output, State, dash_table, ctx
+from dash import Dash, html, dcc, Input, Output, State, ALL, dash_table, ctx, no_update, Patch
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import plotly.express as px
-import requests
 import json
 import pandas as pd
 from datetime import datetime, timedelta
 import traceback
-
-API_BASE_URL = "http://localhost:12500"
+import os
+import time
+
+from urllib.parse import urlencode
+
+from flask import Response, abort, jsonify, request, stream_with_context
+
+from api_client import UNAVAILABLE_ERRORS, ApiClient, CircuitBreaker
+from api_traffic import traffic_adapter
+from async_fetch import AsyncFetcher
+from figure_patch import component_update, figure_patch
+from health_probe import HealthProber
+from metrics import instrument_callbacks, instrument_server, registry, span
+from outbox import Outbox, OutboxWorker, PermanentError
+from plan_aggregates import PlanKpiAggregator
+from plan_export import EXPORT_FORMATS, EXPORT_WRITERS, parquet_available
+from plan_import import BulkImporter, parse_upload, plan_payload, validate_plan, validate_plans
+from plan_search import PlanSearchIndex, PlanTrigramIndex
+from plan_sync import PlanDelta, PlanDeltaSync, apply_delta, merge_frame
+from plans_cache import SnapshotCache
+from render_cache import RenderCache
+from snapshot_poller import SnapshotPoller
+from table_query import apply_filter_query, apply_sort, page_slice
+
+API_BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:12500")
+
+# Caché de snapshots del API (segundos / límites de memoria)
+PLANS_CACHE_TTL = float(os.environ.get("PLANS_CACHE_TTL", "30"))
+PLANS_CACHE_MAX_ENTRIES = int(os.environ.get("PLANS_CACHE_MAX_ENTRIES", "64"))
+PLANS_CACHE_MAX_BYTES = int(os.environ.get("PLANS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Refresco en segundo plano de /plans y /categories (0 lo desactiva)
+SNAPSHOT_POLL_INTERVAL = float(os.environ.get("SNAPSHOT_POLL_INTERVAL", "15"))
+
+# Sincronización por deltas de /plans: parámetro del backend para pedir solo
+# cambios (vacío = descargar completo y comparar por id) y campo marca de agua
+PLANS_DELTA_PARAM = os.environ.get("PLANS_DELTA_PARAM") or None
+PLANS_DELTA_FIELD = os.environ.get("PLANS_DELTA_FIELD", "updatedAt")
+
+# Cliente HTTP (pool keep-alive, timeouts por endpoint y reintentos en GET)
+API_POOL_SIZE = int(os.environ.get("API_POOL_SIZE", "20"))
+API_RETRIES = int(os.environ.get("API_RETRIES", "2"))
+API_TIMEOUTS = {
+    "/plans": 10,
+    "/plans/category": 8,
+    "/plans/publish": 10,
+    "/categories": 5
+}
+
+# Renders por (categoría, versión del snapshot) que se conservan (LRU)
+CATEGORY_RENDER_CACHE_ENTRIES = int(os.environ.get("CATEGORY_RENDER_CACHE_ENTRIES", "32"))
+
+# Bandeja de salida durable para publicar (SQLite) y su backoff de reintentos
+OUTBOX_PATH = os.environ.get("OUTBOX_PATH", "outbox.sqlite3")
+OUTBOX_BASE_DELAY = float(os.environ.get("OUTBOX_BASE_DELAY", "2"))
+OUTBOX_MAX_DELAY = float(os.environ.get("OUTBOX_MAX_DELAY", "300"))
+
+# Importación en lote: publicaciones simultáneas y máximo por segundo
+IMPORT_MAX_WORKERS = int(os.environ.get("IMPORT_MAX_WORKERS", "4"))
+IMPORT_RATE_LIMIT = float(os.environ.get("IMPORT_RATE_LIMIT", "10"))
+
+# Circuit breaker del API: fallas seguidas que lo abren y segundos abierto
+# antes de probar de nuevo; mientras tanto se sirven snapshots vencidos
+API_BREAKER_FAILURES = int(os.environ.get("API_BREAKER_FAILURES", "3"))
+API_BREAKER_RESET = float(os.environ.get("API_BREAKER_RESET", "20"))
+STALE_RETRY_INTERVAL = float(os.environ.get("STALE_RETRY_INTERVAL", "5"))
+
+# Sondeo de salud del API: segundos entre sondeos, mediciones por endpoint
+# y segundos de mediciones que cuentan para el estado
+HEALTH_PROBE_INTERVAL = float(os.environ.get("HEALTH_PROBE_INTERVAL", "15"))
+HEALTH_RING_SIZE = int(os.environ.get("HEALTH_RING_SIZE", "256"))
+HEALTH_WINDOW = float(os.environ.get("HEALTH_WINDOW", "300"))
+
+# Endpoints medidos: prefijo -> ruta que se sondea (None = solo tráfico real)
+HEALTH_ENDPOINTS = {
+    "/plans": "/plans",
+    "/plans/category": None,
+    "/plans/publish": None,
+    "/categories": "/categories"
+}
+
+# Métricas: medir los bytes de cada salida. Desactivado por defecto: decodifica
+# y recodifica cada respuesta en la petición y encarece lo que se mide
+METRICS_OUTPUT_SIZES = os.environ.get("METRICS_OUTPUT_SIZES", "0") == "1"
+
+# Plazo común (segundos) para los lotes de peticiones concurrentes
+API_FETCH_DEADLINE = float(os.environ.get("API_FETCH_DEADLINE", "12"))
+
+# Grabar ("record") o reproducir sin red ("replay") las respuestas de /plans,
+# /plans/category y /categories; latencia añadida en replay (ms o "recorded")
+API_TRAFFIC_MODE = os.environ.get("API_TRAFFIC_MODE", "").strip().lower()
+API_TRAFFIC_DIR = os.environ.get("API_TRAFFIC_DIR", "api_traffic")
+API_REPLAY_LATENCY_MS = os.environ.get("API_REPLAY_LATENCY_MS", "0")
+API_REPLAY_LATENCY_MS = API_REPLAY_LATENCY_MS if API_REPLAY_LATENCY_MS == "recorded" else float(API_REPLAY_LATENCY_MS)
 
 # ==================== CONFIGURACIÓN ====================
 app = Dash(
@@ -24,6 +115,62 @@ app = Dash(
 )
 server = app.server
 
+# Tiempo de cada callback por etapa (fetch, parse, transform, render,
+# serialize) y bytes por salida, expuestos en /metrics
+instrument_callbacks(app)
+instrument_server(app, output_sizes_enabled=METRICS_OUTPUT_SIZES)
+
+api = ApiClient(
+    API_BASE_URL,
+    pool_size=API_POOL_SIZE,
+    timeouts=API_TIMEOUTS,
+    retries=API_RETRIES,
+    breaker=CircuitBreaker(failure_threshold=API_BREAKER_FAILURES, reset_timeout=API_BREAKER_RESET),
+    adapter=traffic_adapter(
+        API_TRAFFIC_MODE,
+        API_TRAFFIC_DIR,
+        latency_ms=API_REPLAY_LATENCY_MS,
+        pool_connections=API_POOL_SIZE,
+        pool_maxsize=API_POOL_SIZE
+    )
+)
+
+# Latencia y errores por endpoint (mide el tráfico real y sondea lo inactivo)
+health = HealthProber(api, HEALTH_ENDPOINTS, interval=HEALTH_PROBE_INTERVAL,
+                      ring_size=HEALTH_RING_SIZE, window=HEALTH_WINDOW)
+
+# Peticiones concurrentes (plans, categories, plans/category/{id}) con plazo común
+fetcher = AsyncFetcher(max_workers=API_POOL_SIZE, deadline=API_FETCH_DEADLINE)
+
+plan_cache = SnapshotCache(
+    ttl=PLANS_CACHE_TTL,
+    max_entries=PLANS_CACHE_MAX_ENTRIES,
+    max_bytes=PLANS_CACHE_MAX_BYTES,
+    # Con el API caído (conexión, timeout, 5xx) o el circuito abierto se sirve
+    # el último snapshot bueno; un 4xx (ej. categoría borrada) sí falla
+    stale_if_error=UNAVAILABLE_ERRORS,
+    stale_retry=STALE_RETRY_INTERVAL
+)
+
+plan_sync = PlanDeltaSync(
+    api,
+    since_param=PLANS_DELTA_PARAM,
+    watermark_field=PLANS_DELTA_FIELD
+)
+
+# Índice de búsqueda sobre el snapshot de planes (se reconstruye por versión)
+search_index = PlanSearchIndex()
+fuzzy_index = PlanTrigramIndex()
+
+# KPIs del dashboard como contadores actualizados por delta
+plan_kpis = PlanKpiAggregator()
+
+# Figuras y KPIs ya renderizados por (página, versión del snapshot)
+render_cache = RenderCache()
+
+# Columnas de la vista por categoría por (id de categoría, versión del snapshot)
+category_renders = RenderCache(max_entries=CATEGORY_RENDER_CACHE_ENTRIES)
+
 # Inyectar estilos personalizados de clase empresarial
 app.index_string = '''
 <!DOCTYPE html>
@@ -523,6 +670,279 @@ app.index_string = '''
 
 
 
+# ==================== ACCESO A DATOS ====================
+
+def load_plans(previous=None):
+    return plan_sync(previous)
+
+
+def load_categories(previous=None):
+    return api.get_json("/categories", previous)
+
+
+def get_plans_snapshot(force=False):
+    """Snapshot compartido de GET /plans (ver plans_cache.SnapshotCache)."""
+    return plan_cache.get("plans", load_plans, force=force)
+
+
+def get_local_plans_snapshot():
+    """
+    Último snapshot de planes ya cargado, aunque haya vencido el TTL.
+    Para interacciones como la búsqueda, que no deben ir a la red.
+    """
+    return plan_cache.peek("plans") or get_plans_snapshot()
+
+
+def read_plans_snapshot():
+    """
+    Snapshot para callbacks disparados por intervalos: con el poller activo
+    solo lee el último publicado; sin él, respeta el TTL de la caché.
+    """
+    if poller.running:
+        return get_local_plans_snapshot()
+    return get_plans_snapshot()
+
+
+def get_categories_snapshot(force=False):
+    """Snapshot compartido de GET /categories."""
+    return plan_cache.get("categories", load_categories, force=force)
+
+
+def get_category_plans_snapshot(cat_id, force=False):
+    """Snapshot de GET /plans/category/{cat_id}."""
+    path = f"/plans/category/{cat_id}"
+    return plan_cache.get(path.lstrip("/"), lambda previous: api.get_json(path, previous), force=force)
+
+
+def get_local_category_plans_snapshot(cat_id):
+    """Último snapshot ya cargado de la categoría (sin ir a la red si existe)."""
+    return plan_cache.peek(f"plans/category/{cat_id}") or get_category_plans_snapshot(cat_id)
+
+
+def fetch_snapshots(calls, deadline=None):
+    """
+    Obtiene varios snapshots a la vez (nombre -> función sin argumentos, ej.
+    `get_categories_snapshot`). Devuelve (snapshots, errors) por nombre.
+    """
+    return fetcher.fetch(calls, deadline)
+
+
+def add_published_plan(plan):
+    """
+    Agrega un plan recién publicado al snapshot local y al índice de
+    búsqueda sin esperar a recargar todo el catálogo. Si el poller ya lo
+    trajo del API (llegó entre el POST y este aviso) no se agrega de nuevo.
+    """
+    previous = plan_cache.peek("plans")
+    if previous is not None and any(p.get("id") == plan.get("id") for p in previous.data):
+        return
+    delta = PlanDelta(added=(plan,))
+    # Se fusiona como reemplazo por id por si el poller lo trae entre el peek y el derive
+    replace = PlanDelta(updated=(plan,))
+    snapshot = plan_cache.derive(
+        "plans",
+        lambda data: apply_delta(data, replace),
+        delta=delta,
+        frame_transform=lambda frame: merge_frame(frame, replace)
+    )
+    if previous is not None and snapshot is not None:
+        plan_kpis.sync(snapshot)
+        search_index.add(plan, snapshot)
+        fuzzy_index.add(plan, snapshot)
+
+
+def publish_payload(payload):
+    """POST /plans/publish de un payload ya validado; devuelve el plan publicado."""
+    response = api.post(
+        "/plans/publish",
+        headers={"Content-Type": "application/json"},
+        data=json.dumps(payload)
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"Error {response.status_code}: {response.text[:200]}")
+    return {**payload, **response.json()}
+
+
+def refresh_after_import(job):
+    """Al terminar un lote con altas, trae los planes nuevos y actualiza índices."""
+    if job.published:
+        warm_search_indexes(get_plans_snapshot(force=True))
+
+
+importer = BulkImporter(
+    publish_payload,
+    max_workers=IMPORT_MAX_WORKERS,
+    rate=IMPORT_RATE_LIMIT,
+    on_complete=refresh_after_import
+)
+
+
+@span("transform")
+def filter_plans(snapshot, search_value=None, fuzzy=False, status_filter="all"):
+    """Frame del snapshot con la búsqueda y el filtro de estado aplicados."""
+    df = snapshot.frame
+    
+    # Filtrar por búsqueda: índice invertido (términos como prefijos) o
+    # trigramas en modo aproximado, ordenado por similitud. Mientras un
+    # índice se reconstruye responde sobre el snapshot anterior
+    if fuzzy:
+        indexed, positions = fuzzy_index.search(snapshot, search_value, budget_ms=FUZZY_SEARCH_BUDGET_MS)
+    else:
+        indexed, positions = search_index.search(snapshot, search_value)
+    if positions is not None:
+        df = indexed.frame.iloc[positions]
+    
+    # Filtrar por estado
+    if status_filter == "active":
+        df = df[df['isActive'] == True]
+    elif status_filter == "inactive":
+        df = df[df['isActive'] == False]
+    return df
+
+
+@server.route("/api/cache-stats")
+def cache_stats():
+    return jsonify(plan_cache.stats())
+
+
+@server.route("/api/render-stats")
+def render_stats():
+    return jsonify({**render_cache.stats(), "categories": category_renders.stats()})
+
+
+@server.route("/api/frame-stats")
+def frame_stats():
+    return jsonify(plan_sync.last_frame_report or {})
+
+
+@server.route("/api/client-stats")
+def client_stats():
+    return jsonify({**api.stats(), "async": fetcher.stats()})
+
+
+def warm_search_indexes(snapshot):
+    """
+    Precalienta índices y KPIs cuando el poller trae planes nuevos (así los
+    contadores avanzan versión a versión aplicando cada delta).
+    """
+    if snapshot.key == "plans":
+        plan_kpis.sync(snapshot)
+        search_index.sync(snapshot)
+        fuzzy_index.sync(snapshot)
+
+
+poller = SnapshotPoller(
+    plan_cache,
+    {"plans": load_plans, "categories": load_categories},
+    interval=SNAPSHOT_POLL_INTERVAL,
+    on_refresh=warm_search_indexes
+)
+
+
+@server.before_request
+def start_snapshot_poller():
+    # Se arranca en la primera petición para que cada worker (tras el fork
+    # del servidor WSGI) tenga su propio hilo
+    poller.ensure_started()
+
+
+@server.before_request
+def start_health_prober():
+    health.ensure_started()
+
+
+@server.route("/api/health-stats")
+def health_stats():
+    return jsonify({**health.status(), "endpoints": health.stats()})
+
+
+@server.route("/metrics")
+def metrics():
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+
+@server.route("/api/poller-stats")
+def poller_stats():
+    return jsonify(poller.stats())
+
+
+# Códigos 4xx que sí vale la pena reintentar
+RETRYABLE_CLIENT_ERRORS = {408, 425, 429}
+
+
+def send_outbox_entry(path, payload, key):
+    """POST de un envío de la bandeja con su clave de idempotencia."""
+    response = api.post(
+        path,
+        headers={"Content-Type": "application/json", "Idempotency-Key": key},
+        data=json.dumps(payload)
+    )
+    if response.status_code in (200, 201):
+        return {**payload, **response.json()}
+    error = f"Error {response.status_code}: {response.text[:200]}"
+    if 400 <= response.status_code < 500 and response.status_code not in RETRYABLE_CLIENT_ERRORS:
+        raise PermanentError(error)
+    raise RuntimeError(error)
+
+
+outbox = Outbox(OUTBOX_PATH, base_delay=OUTBOX_BASE_DELAY, max_delay=OUTBOX_MAX_DELAY)
+outbox_worker = OutboxWorker(
+    outbox,
+    send_outbox_entry,
+    on_sent=lambda entry, plan: add_published_plan(plan)
+)
+
+
+@server.before_request
+def start_outbox_worker():
+    # Lo pendiente de una ejecución anterior se envía al arrancar
+    outbox_worker.ensure_started()
+
+
+@server.route("/api/outbox-stats")
+def outbox_stats():
+    return jsonify(outbox_worker.stats())
+
+
+def export_url(fmt, search_value=None, fuzzy=False, status_filter="all"):
+    """URL de /export/plans.<fmt> con los filtros activos."""
+    params = {}
+    if search_value:
+        params["search"] = search_value
+    if fuzzy:
+        params["fuzzy"] = "1"
+    if status_filter and status_filter != "all":
+        params["status"] = status_filter
+    query = urlencode(params)
+    return f"/export/plans.{fmt}" + (f"?{query}" if query else "")
+
+
+@server.route("/export/plans.<fmt>")
+def export_plans(fmt):
+    """
+    Exporta la vista filtrada de planes por bloques (CSV, NDJSON o
+    Parquet), sin armar el archivo completo en memoria.
+    """
+    if fmt not in EXPORT_FORMATS:
+        abort(404)
+    if fmt == "parquet" and not parquet_available():
+        return Response("Exportar a Parquet requiere pyarrow", status=501, mimetype="text/plain")
+    
+    snapshot = get_local_plans_snapshot()
+    df = filter_plans(
+        snapshot,
+        request.args.get("search"),
+        request.args.get("fuzzy") == "1",
+        request.args.get("status", "all")
+    )
+    filename = f"planes-{datetime.now():%Y%m%d-%H%M}.{fmt}"
+    return Response(
+        stream_with_context(EXPORT_WRITERS[fmt](df)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 # ==================== COMPONENTES REUTILIZABLES ====================
 
 def create_kpi_card(title, value, color="primary", detail=None):
@@ -584,6 +1004,52 @@ def create_chart_card(title, icon, children, actions=None):
         children
     ], className="chart-card")
 
+API_STATUS_STYLES = {
+    "ok": ('#10b981', "API Conectada"),
+    "degraded": ('#f59e0b', "API Lenta"),
+    "down": ('#ef4444', "API Caída"),
+    "unknown": ('#94a3b8', "Verificando API...")
+}
+
+def create_api_status(health_status):
+    """Indicador de estado del API para el sidebar"""
+    color, label = API_STATUS_STYLES[health_status["status"]]
+    detail = []
+    if health_status.get("p95_ms") is not None:
+        detail.append(f"p95 {health_status['p95_ms']:,.0f} ms")
+    if health_status.get("error_rate"):
+        detail.append(f"{health_status['error_rate']:.0%} errores")
+    return html.Div([
+        html.Div([
+            html.I(className="fas fa-circle fa-xs", style={'color': color}),
+            html.Span(label, style={'fontSize': '13px', 'color': 'rgba(255,255,255,0.7)'})
+        ], style={'display': 'flex', 'alignItems': 'center', 'gap': '8px'}),
+        html.Div(" · ".join(detail), style={'fontSize': '11px', 'color': 'rgba(255,255,255,0.45)', 'marginTop': '4px', 'paddingLeft': '18px'}) if detail else None
+    ])
+
+def create_stale_badge(snapshot):
+    """Aviso de datos vencidos (None si el snapshot está al día)"""
+    if snapshot is None or not snapshot.stale:
+        return None
+    fetched = datetime.fromtimestamp(snapshot.fetched_at).strftime("%H:%M")
+    return html.Span([
+        html.I(className="fas fa-exclamation-triangle me-1"),
+        f"API no disponible · datos de las {fetched}"
+    ], style={'fontSize': '13px', 'color': '#b45309', 'fontWeight': '600', 'marginRight': '16px'})
+
+def create_plan_card(plan):
+    """Crea la tarjeta de un plan"""
+    return dbc.Card([
+        dbc.CardBody([
+            html.H5([html.I(className="fas fa-bookmark me-2"), plan.get('name', 'Sin nombre')]),
+            html.P((plan.get('description') or '')[:150] + "..."),
+            dbc.Row([
+                dbc.Col([html.Small([html.I(className="fas fa-map-marker-alt me-1"), plan.get('location', 'N/A')], className="text-muted")]),
+                dbc.Col([html.Small([html.I(className="fas fa-eye me-1"), f"{plan.get('views', 0)} vistas"], className="text-muted")])
+            ])
+        ])
+    ], className="mb-3", style={'boxShadow': 'var(--shadow-sm)', 'border': '1px solid #e2e8f0', 'borderRadius': '12px'})
+
 # ==================== SIDEBAR ====================
 sidebar = html.Div([
     html.Div([
@@ -651,10 +1117,7 @@ sidebar = html.Div([
     
     html.Div([
         html.Div([
-            html.Div([
-                html.I(className="fas fa-circle fa-xs", style={'color': '#10b981'}),
-                html.Span("API Conectada", style={'fontSize': '13px', 'color': 'rgba(255,255,255,0.7)'})
-            ], style={'display': 'flex', 'alignItems': 'center', 'gap': '8px'})
+            create_api_status({"status": "unknown"})
         ], id="api-status-sidebar", style={'padding': '16px'})
     ], style={'position': 'absolute', 'bottom': '0', 'left': '0', 'right': '0', 'borderTop': '1px solid rgba(255,255,255,0.1)'})
     
@@ -672,6 +1135,7 @@ dashboard_layout = html.Div([
             html.Span("Dashboard", className="breadcrumb-current")
         ], className="breadcrumb-pro"),
         html.Div([
+            html.Span(id="dashboard-freshness"),
             html.Span(datetime.now().strftime("%d %B, %Y"), style={'fontSize': '14px', 'color': '#64748b', 'fontWeight': '500'})
         ])
     ], className="top-bar"),
@@ -708,7 +1172,10 @@ dashboard_layout = html.Div([
     ]),
     
     # Interval para actualización automática
-    dcc.Interval(id='interval-dashboard', interval=30*1000, n_intervals=0)
+    dcc.Interval(id='interval-dashboard', interval=30*1000, n_intervals=0),
+    
+    # Versión de datos que ya muestra esta pestaña
+    dcc.Store(id="dashboard-version")
     
 ], className="main-content")
 
@@ -824,12 +1291,78 @@ create_layout = html.Div([
             ], id="submit", className="btn-pro btn-primary", style={'width': '100%', 'fontSize': '16px', 'padding': '14px'})
         ]),
         
-        html.Div(id="response", style={'marginTop': '20px'})
+        html.Div(id="response", style={'marginTop': '20px'}),
+        dcc.Store(id="publish-key"),
+        dcc.Interval(id="publish-interval", interval=1500, disabled=True),
+        
+        # Importación en lote (CSV o JSON con las mismas columnas del formulario)
+        html.Div([
+            html.Div([
+                html.I(className="fas fa-file-import"),
+                "Importación en Lote"
+            ], className="form-section-title"),
+            
+            dcc.Upload(
+                id="import-upload",
+                children=html.Div([
+                    html.I(className="fas fa-cloud-upload-alt me-2"),
+                    "Arrastre o seleccione un archivo .csv o .json"
+                ]),
+                accept=".csv,.json",
+                style={
+                    'border': '2px dashed #cbd5e1', 'borderRadius': '12px', 'padding': '24px',
+                    'textAlign': 'center', 'color': '#64748b', 'cursor': 'pointer'
+                }
+            ),
+            html.Small(
+                "Columnas: name, description, date, imageUrl, location, map, priority, category, isActive, costEstimate",
+                className="text-muted d-block mt-2"
+            ),
+            html.Div(id="import-preview", style={'marginTop': '16px'}),
+            
+            dbc.Row([
+                dbc.Col([
+                    dbc.Button([
+                        html.I(className="fas fa-layer-group"),
+                        "Publicar lote"
+                    ], id="import-start", disabled=True, className="btn-pro btn-primary", style={'width': '100%'})
+                ], md=6),
+                dbc.Col([
+                    dbc.Button([
+                        html.I(className="fas fa-file-csv"),
+                        "Descargar reporte"
+                    ], id="import-report-button", disabled=True, className="btn-pro btn-outline", style={'width': '100%'})
+                ], md=6),
+            ], style={'marginTop': '16px'}),
+            
+            dbc.Progress(id="import-progress", value=0, striped=True, animated=True, style={'marginTop': '16px', 'height': '20px'}),
+            html.Div(id="import-status", style={'marginTop': '12px'}),
+            
+            dcc.Interval(id="import-interval", interval=1000, disabled=True),
+            dcc.Store(id="import-job"),
+            dcc.Download(id="import-report")
+        ], className="form-section", style={'marginTop': '32px'})
         
     ], className="form-pro")
 ], className="main-content")
 
 # Todos los Planes (con filtros)
+PLAN_TABLE_PAGE_SIZE = 15
+SEARCH_DEBOUNCE_MS = 300
+FUZZY_SEARCH_BUDGET_MS = 5
+
+# Columna del API -> columna mostrada en la tabla
+PLAN_TABLE_COLUMNS = {
+    'id': 'ID',
+    'name': 'Nombre',
+    'location': 'Ubicación',
+    'category': 'Categoría',
+    'priority': 'Prioridad',
+    'views': 'Vistas',
+    'costEstimate': 'Costo',
+    'isActive': 'Estado'
+}
+
 all_plans_layout = html.Div([
     html.Div([
         html.Div([
@@ -844,7 +1377,8 @@ all_plans_layout = html.Div([
         html.Div([
             dbc.Row([
                 dbc.Col([
-                    dbc.Input(id="search-plans", placeholder="🔍 Buscar por nombre...", className="input-pro")
+                    dbc.Input(id="search-plans", placeholder="🔍 Buscar por nombre, descripción o lugar...", className="input-pro", debounce=SEARCH_DEBOUNCE_MS),
+                    dbc.Switch(id="fuzzy-search", label="Búsqueda aproximada", value=False, style={'fontSize': '13px', 'marginTop': '6px'})
                 ], md=4),
                 dbc.Col([
                     dcc.Dropdown(
@@ -869,15 +1403,58 @@ all_plans_layout = html.Div([
                     dbc.Button([
                         html.I(className="fas fa-download"),
                         "Exportar"
-                    ], id="export-plans", className="btn-pro btn-outline", style={'width': '100%'})
+                    ], id="export-plans", href="/export/plans.csv", external_link=True, className="btn-pro btn-outline", style={'width': '100%'})
                 ], md=3),
             ])
         ], className="filter-grid")
     ], className="filter-bar"),
     
-    # Tabla de datos
+    # Tabla de datos (paginada, ordenada y filtrada en el servidor)
     html.Div([
-        html.Div(id="all-plans")
+        html.Div(id="all-plans"),
+        dash_table.DataTable(
+            id="all-plans-table",
+            columns=[{"name": name, "id": name} for name in PLAN_TABLE_COLUMNS.values()],
+            data=[],
+            page_current=0,
+            page_size=PLAN_TABLE_PAGE_SIZE,
+            page_action="custom",
+            sort_action="custom",
+            sort_mode="single",
+            sort_by=[],
+            filter_action="custom",
+            filter_query="",
+            style_table={'overflowX': 'auto'},
+            style_cell={
+                'textAlign': 'left',
+                'padding': '16px',
+                'fontFamily': 'Outfit'
+            },
+            style_header={
+                'backgroundColor': '#0f172a',
+                'color': 'white',
+                'fontWeight': '600',
+                'textAlign': 'center'
+            },
+            style_data_conditional=[
+                {
+                    'if': {'row_index': 'odd'},
+                    'backgroundColor': '#f8fafc'
+                },
+                {
+                    'if': {'column_id': 'Estado', 'filter_query': '{Estado} = "✓ Activo"'},
+                    'backgroundColor': '#d1fae5',
+                    'color': '#065f46',
+                    'fontWeight': '600'
+                },
+                {
+                    'if': {'column_id': 'Estado', 'filter_query': '{Estado} = "✗ Inactivo"'},
+                    'backgroundColor': '#fee2e2',
+                    'color': '#991b1b',
+                    'fontWeight': '600'
+                }
+            ],
+        )
     ], className="chart-card")
     
 ], className="main-content")
@@ -887,6 +1464,9 @@ all_plans_layout = html.Div([
 
 
 # Por Categoría
+# Tarjetas por columna en cada entrega ("Cargar más" agrega otro bloque)
+CATEGORY_CARDS_PAGE_SIZE = 20
+
 by_category_layout = html.Div([
     html.Div([
         html.Div([
@@ -899,8 +1479,8 @@ by_category_layout = html.Div([
     html.Div([
         dbc.Row([
             dbc.Col([
-                html.Label("Seleccione ID de Categoría", className="input-label"),
-                dbc.Input(id="cat-id", type="number", placeholder="Ingrese ID", className="input-pro")
+                html.Label("Categorías a comparar", className="input-label"),
+                dcc.Dropdown(id="cat-id", options=[], value=[], multi=True, placeholder="Seleccione una o más categorías", className="input-pro")
             ], md=8),
             dbc.Col([
                 html.Label(html.Br()),
@@ -912,7 +1492,16 @@ by_category_layout = html.Div([
         ])
     ], className="filter-bar"),
     
-    html.Div(id="cat-plans")
+    html.Div(id="cat-plans"),
+    html.Div([
+        dbc.Button([
+            html.I(className="fas fa-chevron-down"),
+            "Cargar más"
+        ], id="cat-load-more", className="btn-pro btn-outline")
+    ], id="cat-load-more-wrapper", style={'display': 'none', 'textAlign': 'center'}),
+    
+    # Tarjetas mostradas y [categoría, total, versión] de cada columna
+    dcc.Store(id="cat-cards-shown")
     
 ], className="main-content")
 
@@ -985,7 +1574,66 @@ analytics_layout = html.Div([
                 dcc.Graph(id="priority-views", config={'displayModeBar': False})
             )
         ], md=6)
-    ])
+    ]),
+
+    # Versión de datos que ya muestra esta pestaña
+    dcc.Store(id="analytics-version")
+], className="main-content")
+
+# Exportar
+export_layout = html.Div([
+    html.Div([
+        html.Div([
+            html.I(className="fas fa-home fa-sm"),
+            html.I(className="fas fa-chevron-right fa-xs"),
+            html.Span("Exportar Datos", className="breadcrumb-current")
+        ], className="breadcrumb-pro"),
+    ], className="top-bar"),
+    
+    html.Div([
+        html.Div([
+            dbc.Row([
+                dbc.Col([
+                    dbc.Label("Búsqueda", className="label-pro"),
+                    dbc.Input(id="export-search", placeholder="🔍 Nombre, descripción o lugar...", className="input-pro", debounce=SEARCH_DEBOUNCE_MS)
+                ], md=4),
+                dbc.Col([
+                    dbc.Label("Estado", className="label-pro"),
+                    dcc.Dropdown(
+                        id="export-status",
+                        options=[
+                            {"label": "Todos los estados", "value": "all"},
+                            {"label": "Solo activos", "value": "active"},
+                            {"label": "Solo inactivos", "value": "inactive"}
+                        ],
+                        value="all",
+                        className="input-pro",
+                        style={'background': '#f8fafc'}
+                    )
+                ], md=3),
+                dbc.Col([
+                    dbc.Label("Formato", className="label-pro"),
+                    dbc.RadioItems(
+                        id="export-format",
+                        options=[
+                            {"label": "CSV", "value": "csv"},
+                            {"label": "NDJSON", "value": "ndjson"},
+                            {"label": "Parquet", "value": "parquet", "disabled": not parquet_available()}
+                        ],
+                        value="csv",
+                        inline=True
+                    )
+                ], md=3),
+                dbc.Col([
+                    dbc.Button([
+                        html.I(className="fas fa-download"),
+                        "Descargar"
+                    ], id="export-download", href="/export/plans.csv", external_link=True, className="btn-pro btn-primary", style={'width': '100%'})
+                ], md=2),
+            ])
+        ], className="filter-grid")
+    ], className="filter-bar"),
+    
 ], className="main-content")
 
 
@@ -1016,183 +1664,201 @@ def display_page(pathname):
         return categories_layout
     elif pathname == "/analytics":
         return analytics_layout
+    elif pathname == "/export":
+        return export_layout
     else:
         return dashboard_layout
 
 
-
-
-# Dashboard KPIs
 @app.callback(
-    [Output("dashboard-kpis", "children"),
-     Output("category-pie-chart", "figure"),
-     Output("status-bar-chart", "figure"),
-     Output("top-plans-chart", "figure")],
-    [Input("interval-dashboard", "n_intervals"),
-     Input("url", "pathname")]
+    Output("api-status-sidebar", "children"),
+    Input("interval-component", "n_intervals")
 )
-def update_dashboard(n, pathname):
-    if pathname != "/":
-        return [], {}, {}, {}
-    
-    try:
-        response = requests.get(f"{API_BASE_URL}/plans", timeout=10)
-        
-        if response.status_code == 200:
-            plans = response.json()
-            df = pd.DataFrame(plans)
-            
-            # Calcular KPIs
-            total_plans = len(plans)
-            active_plans = len([p for p in plans if p.get('isActive', False)])
-            total_views = sum(p.get('views', 0) for p in plans)
-            avg_cost = df['costEstimate'].mean() if 'costEstimate' in df.columns and not df.empty else 0
-            
-
-
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
-            df['isActive'] = df['isActive'].astype(bool)
-
-            today = pd.Timestamp.today().normalize()
-
-            upcoming_this_week = df[
-                (df['date'] >= today) & (df['date'] <= today + pd.Timedelta(days=7))
-            ].shape[0]
+def update_api_status(n):
+    # Solo lee las mediciones del HealthProber: no hace peticiones al API
+    return create_api_status(health.status())
 
-            upcoming_all = df[df['date'] >= today].shape[0]
 
-            expired_plans = df[df['date'] < today].shape[0]
 
-            active_plans = df['isActive'].sum() 
 
-            most_viewed = df['views'].max() if not df.empty else 0
+@span("render")
+def render_dashboard(snapshot):
+    """KPIs y gráficos del dashboard para un snapshot (ver render_cache)."""
+    # Frame tipado (plan_frame.PLAN_SCHEMA): fechas ya parseadas una vez
+    df = snapshot.frame
+    
+    # KPIs: contadores mantenidos por delta (plan_aggregates)
+    kpi = plan_kpis.kpis(snapshot)
 
-            no_assistance = df[df['assistance'] == 0].shape[0]
+    # Crear KPIs horizontales
+    kpis = html.Div(
+        [
+            create_kpi_card("Total Planes", str(kpi['total']), "", ""),
+            create_kpi_card("Planes Activos", str(kpi['active']), "", ""),
+            create_kpi_card("Próximos Esta Semana", str(kpi['upcoming_week']), "", ""),
+            create_kpi_card("Próximos (Todos)", str(kpi['upcoming_all']), "", ""),
+            create_kpi_card("Planes Vencidos", str(kpi['expired']), "", ""),
+            create_kpi_card("Más Vistos", str(kpi['max_views']), "", ""),
+            create_kpi_card("Sin Asistencia", str(kpi['no_assistance']), "", ""),
+        ],
+        style={
+            'display': 'flex',        # activa flexbox
+            'flexDirection': 'row',   # horizontal
+            'gap': '15px',            # espacio entre cards
+            'flexWrap': 'wrap'        # si no caben, pasan a la siguiente fila
+        }
+    )
 
-            total_plans = df.shape[0]
 
-            # Crear KPIs horizontales
-            kpis = html.Div(
-                [
-                    create_kpi_card("Total Planes", str(total_plans), "", ""),
-                    create_kpi_card("Planes Activos", str(active_plans), "", ""),
-                    create_kpi_card("Próximos Esta Semana", str(upcoming_this_week), "", ""),
-                    create_kpi_card("Próximos (Todos)", str(upcoming_all), "", ""),
-                    create_kpi_card("Planes Vencidos", str(expired_plans), "", ""),
-                    create_kpi_card("Más Vistos", str(most_viewed), "", ""),
-                    create_kpi_card("Sin Asistencia", str(no_assistance), "", ""),
-                ],
-                style={
-                    'display': 'flex',        # activa flexbox
-                    'flexDirection': 'row',   # horizontal
-                    'gap': '15px',            # espacio entre cards
-                    'flexWrap': 'wrap'        # si no caben, pasan a la siguiente fila
-                }
-            )
 
+    
+    # Gráfico de Barras - Planes publicados últimos 15 días
+    bar_fig_published = go.Figure()
+    if not df.empty and 'date' in df.columns:
+        # Filtrar fechas nulas
+        df_valid = df.dropna(subset=['date'])
+
+        # Rango de fechas: últimos 15 días hasta mañana
+        today = pd.Timestamp.today().normalize()
+        end_date = today + pd.Timedelta(days=30)
+        start_date = today - pd.Timedelta(days=10)
+        date_range = pd.date_range(start=start_date, end=end_date)
+
+        # Contar planes por fecha
+        daily_counts = df_valid['date'].dt.floor('D').value_counts()
+        daily_counts = daily_counts.reindex(date_range, fill_value=0)
+
+        bar_fig_published = go.Figure(data=[go.Bar(
+            x=[d.strftime('%Y-%m-%d') for d in daily_counts.index],
+            y=daily_counts.values,
+            marker_color=px.colors.sequential.Purples_r
+        )])
+
+        bar_fig_published.update_layout(
+            title="Planes Publicados",
+            height=350,
+            margin=dict(t=40, b=40, l=40, r=20),
+            font=dict(family='Outfit'),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            xaxis=dict(showgrid=False, tickangle=-45),
+            yaxis=dict(title="Cantidad de Planes", showgrid=True, gridcolor='#f1f5f9')
+        )
+    else:
+        bar_fig_published = go.Figure()
+
+
+    # Gráfico de Barras - Activos vs Inactivos
+    today = pd.Timestamp.today().normalize()
+    active_df = df[(df['isActive']) & (df['date'] >= today)]
+    category_counts = active_df['category'].value_counts()
+    # `category` es categórica: value_counts incluye las que no aparecen
+    category_counts = category_counts[category_counts > 0]
+    category_fig = go.Figure(data=[
+        go.Bar(
+            x=category_counts.index,
+            y=category_counts.values,
+            marker_color='#636efa',  # color azul agradable
+            text=category_counts.values,
+            textposition='outside'
+        )
+    ])
 
+    category_fig.update_layout(
+        title="Planes Activos por Categoría",
+        height=400,
+        margin=dict(t=40, b=40, l=40, r=20),
+        font=dict(family='Outfit'),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(title='Categoría', showgrid=False),
+        yaxis=dict(title='Cantidad de Planes', showgrid=True, gridcolor='#f1f5f9')
+    )
 
-            
-            # Gráfico de Barras - Planes publicados últimos 15 días
-            bar_fig_published = go.Figure()
-            if not df.empty and 'date' in df.columns:
-                # Convertir date a datetime y filtrar nulos
-                df['date'] = pd.to_datetime(df['date'], errors='coerce')
-                df_valid = df.dropna(subset=['date'])
-
-                # Rango de fechas: últimos 15 días hasta mañana
-                today = pd.Timestamp.today().normalize()
-                end_date = today + pd.Timedelta(days=30)
-                start_date = today - pd.Timedelta(days=10)
-                date_range = pd.date_range(start=start_date, end=end_date)
-
-                # Contar planes por fecha
-                daily_counts = df_valid['date'].dt.floor('D').value_counts()
-                daily_counts = daily_counts.reindex(date_range, fill_value=0)
-
-                bar_fig_published = go.Figure(data=[go.Bar(
-                    x=[d.strftime('%Y-%m-%d') for d in daily_counts.index],
-                    y=daily_counts.values,
-                    marker_color=px.colors.sequential.Purples_r
-                )])
-
-                bar_fig_published.update_layout(
-                    title="Planes Publicados",
-                    height=350,
-                    margin=dict(t=40, b=40, l=40, r=20),
-                    font=dict(family='Outfit'),
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    xaxis=dict(showgrid=False, tickangle=-45),
-                    yaxis=dict(title="Cantidad de Planes", showgrid=True, gridcolor='#f1f5f9')
-                )
-            else:
-                bar_fig_published = go.Figure()
-
-
-            # Gráfico de Barras - Activos vs Inactivos
-            active_count = len([p for p in plans if p.get('isActive', False)])
-
-            today = pd.Timestamp.today().normalize()
-            active_df = df[(df['isActive']) & (pd.to_datetime(df['date']) >= today)]
-            category_counts = active_df['category'].value_counts()
-            category_fig = go.Figure(data=[
-                go.Bar(
-                    x=category_counts.index,
-                    y=category_counts.values,
-                    marker_color='#636efa',  # color azul agradable
-                    text=category_counts.values,
-                    textposition='outside'
-                )
-            ])
+    
+    # Gráfico Top 10 Planes
+    if not df.empty and 'views' in df.columns and 'name' in df.columns:
+        top_10 = df.nlargest(10, 'views')[['name', 'views']]
+        top_fig = go.Figure(data=[go.Bar(
+            x=top_10['views'],
+            y=top_10['name'],
+            orientation='h',
+            marker=dict(
+                color=top_10['views'],
+                colorscale='Purples',
+                showscale=False
+            ),
+            text=top_10['views'],
+            textposition='outside'
+        )])
+        top_fig.update_layout(
+            height=400,
+            margin=dict(t=20, b=40, l=200, r=40),
+            font=dict(family='Outfit'),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            xaxis=dict(showgrid=True, gridcolor='#f1f5f9', title='Vistas'),
+            yaxis=dict(showgrid=False)
+        )
+    else:
+        top_fig = go.Figure()
+    
+    return kpis, bar_fig_published, category_fig, top_fig
 
-            category_fig.update_layout(
-                title="Planes Activos por Categoría",
-                height=400,
-                margin=dict(t=40, b=40, l=40, r=20),
-                font=dict(family='Outfit'),
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                xaxis=dict(title='Categoría', showgrid=False),
-                yaxis=dict(title='Cantidad de Planes', showgrid=True, gridcolor='#f1f5f9')
-            )
 
-            
-            # Gráfico Top 10 Planes
-            if not df.empty and 'views' in df.columns and 'name' in df.columns:
-                top_10 = df.nlargest(10, 'views')[['name', 'views']]
-                top_fig = go.Figure(data=[go.Bar(
-                    x=top_10['views'],
-                    y=top_10['name'],
-                    orientation='h',
-                    marker=dict(
-                        color=top_10['views'],
-                        colorscale='Purples',
-                        showscale=False
-                    ),
-                    text=top_10['views'],
-                    textposition='outside'
-                )])
-                top_fig.update_layout(
-                    height=400,
-                    margin=dict(t=20, b=40, l=200, r=40),
-                    font=dict(family='Outfit'),
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    xaxis=dict(showgrid=True, gridcolor='#f1f5f9', title='Vistas'),
-                    yaxis=dict(showgrid=False)
-                )
-            else:
-                top_fig = go.Figure()
-            
-            return kpis, bar_fig_published, category_fig, top_fig
-        else:
-            return html.Div("Error al cargar datos"), {}, {}, {}
+# Dashboard KPIs
+@app.callback(
+    [Output("dashboard-kpis", "children"),
+     Output("category-pie-chart", "figure"),
+     Output("status-bar-chart", "figure"),
+     Output("top-plans-chart", "figure"),
+     Output("dashboard-version", "data"),
+     Output("dashboard-freshness", "children")],
+    [Input("interval-dashboard", "n_intervals"),
+     Input("url", "pathname")],
+    State("dashboard-version", "data")
+)
+def update_dashboard(n, pathname, rendered_version):
+    if pathname != "/":
+        return [], {}, {}, {}, no_update, no_update
+    
+    try:
+        snapshot = read_plans_snapshot()
+        # La vista depende del contenido (igual en todos los workers) y del
+        # día (próximos / vencidos); ":stale" solo cambia el aviso
+        data_version = f"{snapshot.content_version}:{datetime.now().date().isoformat()}"
+        version = data_version + (":stale" if snapshot.stale else "")
+        if version == rendered_version:
+            # Nada cambió desde lo que ya muestra esta pestaña
+            return no_update, no_update, no_update, no_update, no_update, no_update
+        
+        freshness = create_stale_badge(snapshot)
+        rendered_data = rendered_version.removesuffix(":stale") if rendered_version else None
+        if rendered_data == data_version:
+            return no_update, no_update, no_update, no_update, version, freshness
+        
+        outputs = render_cache.get(("dashboard", data_version), lambda: render_dashboard(snapshot))
+        
+        # Si la pestaña ya muestra una versión anterior, enviar solo lo que
+        # cambió: Patch sobre los arreglos x/y/text de cada gráfico. La clave
+        # es el hash del contenido, así que un render de este proceso para
+        # esa clave es idéntico al que recibió la pestaña (de cualquier
+        # worker); si no existe aquí se envían las figuras completas
+        previous = render_cache.peek(("dashboard", rendered_data)) if rendered_data else None
+        if previous is not None:
+            kpis, *figures = outputs
+            with span("render"):
+                outputs = [component_update(previous[0], kpis)] + [
+                    figure_patch(old, new) for old, new in zip(previous[1:], figures)
+                ]
+        return (*outputs, version, freshness)
     except Exception as e:
-        return html.Div(f"Error: {str(e)}"), {}, {}, {}
+        return html.Div(f"Error: {str(e)}"), {}, {}, {}, None, None
 
 @app.callback(
-    Output("response", "children"),
+    [Output("response", "children"),
+     Output("publish-key", "data"),
+     Output("publish-interval", "disabled")],
     Input("submit", "n_clicks"),
     State("name", "value"),
     State("description", "value"),
@@ -1207,204 +1873,379 @@ def update_dashboard(n, pathname):
     prevent_initial_call=True
 )
 def publish_plan(n_clicks, name, description, date, imageUrl, location, map_url, priority, category, isActive, costEstimate):
-    # Validaciones
-    errors = []
-    if not name or len(name.strip()) < 3:
-        errors.append("El nombre debe tener al menos 3 caracteres")
-    if not description or len(description.strip()) < 10:
-        errors.append("La descripción debe tener al menos 10 caracteres")
-    if not date:
-        errors.append("La fecha es obligatoria")
-    if priority and (priority < 1 or priority > 10):
-        errors.append("La prioridad debe estar entre 1 y 10")
-    if not category:
-        errors.append("Debe seleccionar una categoría")
+    plan = {
+        "name": name,
+        "description": description,
+        "date": date,
+        "imageUrl": imageUrl,
+        "location": location,
+        "map": map_url,
+        "priority": priority,
+        "category": category,
+        "isActive": isActive,
+        "costEstimate": costEstimate
+    }
     
+    # Validaciones (las mismas que la importación en lote)
+    errors = validate_plan(plan)
     if errors:
         return dbc.Alert([
             html.H5([html.I(className="fas fa-exclamation-triangle me-2"), "Errores de validación"], className="mb-3"),
             html.Ul([html.Li(error) for error in errors])
-        ], color="warning", className="alert-pro")
-    
-    # Convertir datetime a formato completo con segundos
-    if date and len(date) == 16:  # "yyyy-MM-ddTHH:mm"
-        date += ":00"
+        ], color="warning", className="alert-pro"), None, True
     
-    payload = {
-        "name": name.strip(),
-        "description": description.strip(),
-        "date": date,
-        "imageUrl": imageUrl or "",
-        "location": location or "",
-        "map": map_url or "",
-        "priority": priority or 5,
-        "category": category,
-        "isActive": isActive if isActive is not None else True,
-        "costEstimate": costEstimate or 0
-    }
+    # Textos recortados, fecha con segundos y valores por defecto
+    payload = plan_payload(plan)
     
+    # Se encola en disco y se responde de inmediato; el worker de la bandeja
+    # de salida lo publica (con reintentos) aunque el backend esté caído
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/plans/publish",
-            headers={"Content-Type": "application/json"},
-            data=json.dumps(payload),
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            return dbc.Alert([
-                html.H4([html.I(className="fas fa-check-circle me-2"), "¡Plan publicado exitosamente!"], className="alert-heading"),
-                html.Hr(),
-                html.P([
-                    html.Strong("Nombre: "), data.get('name', 'N/A'), html.Br(),
-                    html.Strong("ID: "), str(data.get('id', 'N/A')), html.Br(),
-                    html.Strong("Categoría: "), str(data.get('category', 'N/A'))
-                ])
-            ], color="success", className="alert-pro")
-        else:
-            return dbc.Alert([
-                html.H5([html.I(className="fas fa-times-circle me-2"), f"Error {response.status_code}"]),
-                html.P(response.text)
-            ], color="danger", className="alert-pro")
+        key = outbox.enqueue("/plans/publish", payload)
     except Exception as e:
         return dbc.Alert([
             html.H5([html.I(className="fas fa-bug me-2"), "Error"]),
             html.P(str(e))
+        ], color="danger", className="alert-pro"), None, True
+    outbox_worker.notify()
+    return publish_status_alert(outbox.get(key)), key, False
+
+
+def publish_status_alert(entry):
+    """Alerta con el estado de una publicación encolada"""
+    if entry is None:
+        return None
+    payload = entry['payload']
+    if entry['status'] == "sent":
+        data = entry['result'] or {}
+        return dbc.Alert([
+            html.H4([html.I(className="fas fa-check-circle me-2"), "¡Plan publicado exitosamente!"], className="alert-heading"),
+            html.Hr(),
+            html.P([
+                html.Strong("Nombre: "), data.get('name', 'N/A'), html.Br(),
+                html.Strong("ID: "), str(data.get('id', 'N/A')), html.Br(),
+                html.Strong("Categoría: "), str(data.get('category', 'N/A'))
+            ])
+        ], color="success", className="alert-pro")
+    if entry['status'] == "rejected":
+        return dbc.Alert([
+            html.H5([html.I(className="fas fa-times-circle me-2"), "Publicación rechazada"]),
+            html.P(entry['last_error'])
         ], color="danger", className="alert-pro")
+    
+    detail = [html.Strong("Nombre: "), payload.get('name', 'N/A')]
+    if entry['attempts']:
+        retry_in = max(entry['next_attempt_at'] - time.time(), 0)
+        detail += [html.Br(), f"Intento {entry['attempts']} falló ({entry['last_error']}); reintento en {retry_in:.0f}s"]
+    return dbc.Alert([
+        html.H5([html.I(className="fas fa-clock me-2"), "Plan en cola de publicación"]),
+        html.P(detail)
+    ], color="info", className="alert-pro")
+
+
+@app.callback(
+    [Output("response", "children", allow_duplicate=True),
+     Output("publish-interval", "disabled", allow_duplicate=True)],
+    Input("publish-interval", "n_intervals"),
+    State("publish-key", "data"),
+    prevent_initial_call=True
+)
+def poll_publish(n_intervals, key):
+    entry = outbox.get(key) if key else None
+    if entry is None:
+        return no_update, True
+    return publish_status_alert(entry), entry['status'] in ("sent", "rejected")
+
+
+# Importación en lote
+@app.callback(
+    [Output("import-preview", "children"),
+     Output("import-start", "disabled")],
+    Input("import-upload", "contents"),
+    State("import-upload", "filename"),
+    prevent_initial_call=True
+)
+def preview_import(contents, filename):
+    if not contents:
+        return None, True
+    try:
+        df = parse_upload(contents, filename)
+    except Exception as e:
+        return dbc.Alert([html.I(className="fas fa-times-circle me-2"), f"No se pudo leer {filename}: {e}"], color="danger", className="alert-pro"), True
+    
+    invalid = sum(bool(errors) for errors in validate_plans(df))
+    return dbc.Alert([
+        html.I(className="fas fa-file-alt me-2"),
+        html.Strong(filename), f": {len(df):,} filas · {len(df) - invalid:,} válidas · {invalid:,} con errores"
+    ], color="info" if not invalid else "warning", className="alert-pro"), len(df) == invalid
 
 
 @app.callback(
-    Output("all-plans", "children"),
+    [Output("import-job", "data"),
+     Output("import-interval", "disabled"),
+     Output("import-start", "disabled", allow_duplicate=True)],
+    Input("import-start", "n_clicks"),
+    [State("import-upload", "contents"),
+     State("import-upload", "filename")],
+    prevent_initial_call=True
+)
+def start_import(n_clicks, contents, filename):
+    if not contents:
+        return no_update, True, True
+    job = importer.start(parse_upload(contents, filename), filename)
+    return job.id, False, True
+
+
+@app.callback(
+    [Output("import-progress", "value"),
+     Output("import-progress", "label"),
+     Output("import-status", "children"),
+     Output("import-interval", "disabled", allow_duplicate=True),
+     Output("import-report-button", "disabled")],
+    Input("import-interval", "n_intervals"),
+    State("import-job", "data"),
+    prevent_initial_call=True
+)
+def poll_import(n_intervals, job_id):
+    job = importer.get(job_id) if job_id else None
+    if job is None:
+        return 0, "", None, True, True
+    
+    progress = job.progress()
+    percent = round(100 * progress['done'] / progress['total']) if progress['total'] else 100
+    status = html.Div([
+        html.Span(f"{progress['done']:,} de {progress['total']:,} filas · ", style={'color': '#64748b'}),
+        html.Span(f"{progress['published']:,} publicadas", style={'color': '#065f46', 'fontWeight': '600'}),
+        html.Span(" · "),
+        html.Span(f"{progress['failed']:,} con error", style={'color': '#991b1b', 'fontWeight': '600'}),
+        html.Span(f" · {progress['elapsed']}s", style={'color': '#64748b'})
+    ], style={'fontSize': '14px'})
+    finished = progress['finished']
+    return percent, f"{percent}%", status, finished, not finished
+
+
+@app.callback(
+    Output("import-report", "data"),
+    Input("import-report-button", "n_clicks"),
+    State("import-job", "data"),
+    prevent_initial_call=True
+)
+def download_import_report(n_clicks, job_id):
+    report = importer.report(job_id) if job_id else None
+    if report is None:
+        return no_update
+    return dcc.send_data_frame(report.to_csv, f"importacion-{datetime.now():%Y%m%d-%H%M}.csv", index=False)
+
+
+@app.callback(
+    [Output("all-plans-table", "data"),
+     Output("all-plans-table", "page_count"),
+     Output("all-plans-table", "page_current"),
+     Output("all-plans", "children")],
     [Input("fetch-all", "n_clicks"),
      Input("search-plans", "value"),
-     Input("filter-status", "value")],
-    prevent_initial_call=True
+     Input("fuzzy-search", "value"),
+     Input("filter-status", "value"),
+     Input("all-plans-table", "page_current"),
+     Input("all-plans-table", "page_size"),
+     Input("all-plans-table", "sort_by"),
+     Input("all-plans-table", "filter_query")]
 )
-def fetch_all_plans(n_clicks, search_value, status_filter):
+def fetch_all_plans(n_clicks, search_value, fuzzy, status_filter, page_current, page_size, sort_by, filter_query):
+    # Un cambio de filtros vuelve a la primera página
+    if ctx.triggered_id != "all-plans-table":
+        page_current = 0
+
     try:
-        response = requests.get(f"{API_BASE_URL}/plans", timeout=10)
+        # Solo "Actualizar" va al API; búsqueda, filtros y paginación
+        # trabajan sobre el snapshot ya cargado en memoria
+        if ctx.triggered_id == "fetch-all":
+            snapshot = get_plans_snapshot(force=True)
+        else:
+            snapshot = get_local_plans_snapshot()
+        plans = snapshot.data
         
-        if response.status_code == 200:
-            plans = response.json()
-            
-            if not plans:
-                return dbc.Alert([html.I(className="fas fa-inbox me-2"), "No hay planes disponibles"], color="info")
-            
-            df = pd.DataFrame(plans)
-            
-            # Filtrar por búsqueda
-            if search_value:
-                df = df[df['name'].str.contains(search_value, case=False, na=False)]
-            
-            # Filtrar por estado
-            if status_filter == "active":
-                df = df[df['isActive'] == True]
-            elif status_filter == "inactive":
-                df = df[df['isActive'] == False]
-            
-            # Seleccionar columnas
-            columns_to_show = ['id', 'name', 'location', 'category', 'priority', 'views', 'costEstimate', 'isActive']
-            df_display = df[[col for col in columns_to_show if col in df.columns]]
-            
-            # Renombrar
-            column_names = {
-                'id': 'ID',
-                'name': 'Nombre',
-                'location': 'Ubicación',
-                'category': 'Categoría',
-                'priority': 'Prioridad',
-                'views': 'Vistas',
-                'costEstimate': 'Costo',
-                'isActive': 'Estado'
-            }
-            df_display = df_display.rename(columns=column_names)
+        if not plans:
+            return [], 1, 0, dbc.Alert([html.I(className="fas fa-inbox me-2"), "No hay planes disponibles"], color="info")
+        
+        df = filter_plans(snapshot, search_value, fuzzy, status_filter)
+        
+        with span("transform"):
+            # Seleccionar columnas y renombrar
+            df_display = df[[col for col in PLAN_TABLE_COLUMNS if col in df.columns]]
+            df_display = df_display.rename(columns=PLAN_TABLE_COLUMNS)
             
-            # Formatear estado
+            # Formatear estado (vectorizado, antes de filtrar/ordenar por texto)
             if 'Estado' in df_display.columns:
-                df_display['Estado'] = df_display['Estado'].apply(lambda x: '✓ Activo' if x else '✗ Inactivo')
-            
-            return dash_table.DataTable(
-                data=df_display.to_dict('records'),
-                columns=[{"name": i, "id": i} for i in df_display.columns],
-                page_size=15,
-                sort_action="native",
-                filter_action="native",
-                style_table={'overflowX': 'auto'},
-                style_cell={
-                    'textAlign': 'left',
-                    'padding': '16px',
-                    'fontFamily': 'Outfit'
-                },
-                style_header={
-                    'backgroundColor': '#0f172a',
-                    'color': 'white',
-                    'fontWeight': '600',
-                    'textAlign': 'center'
-                },
-                style_data_conditional=[
-                    {
-                        'if': {'row_index': 'odd'},
-                        'backgroundColor': '#f8fafc'
-                    },
-                    {
-                        'if': {'column_id': 'Estado', 'filter_query': '{Estado} = "✓ Activo"'},
-                        'backgroundColor': '#d1fae5',
-                        'color': '#065f46',
-                        'fontWeight': '600'
-                    },
-                    {
-                        'if': {'column_id': 'Estado', 'filter_query': '{Estado} = "✗ Inactivo"'},
-                        'backgroundColor': '#fee2e2',
-                        'color': '#991b1b',
-                        'fontWeight': '600'
-                    }
-                ],
-            )
-        else:
-            return dbc.Alert(f"Error {response.status_code}", color="danger")
+                df_display = df_display.assign(
+                    Estado=df_display['Estado'].map({True: '✓ Activo', False: '✗ Inactivo'}).fillna('✗ Inactivo')
+                )
+            
+            # Filtro, orden y paginación del lado del servidor
+            df_display = apply_filter_query(df_display, filter_query)
+            df_display = apply_sort(df_display, sort_by)
+            page, page_count, page_current = page_slice(df_display, page_current, page_size or PLAN_TABLE_PAGE_SIZE)
+        
+        with span("render"):
+            records = page.to_dict('records')
+        
+        summary = html.Div([
+            create_stale_badge(snapshot),
+            f"{len(df_display):,} planes · página {page_current + 1} de {page_count}"
+        ], style={'fontSize': '13px', 'color': '#64748b', 'marginBottom': '12px'})
+        return records, page_count, page_current, summary
     except Exception as e:
-        return dbc.Alert(f"Error: {str(e)}", color="danger")
+        return [], 1, 0, dbc.Alert(f"Error: {str(e)}", color="danger")
+
+
+@app.callback(
+    Output("export-plans", "href"),
+    [Input("search-plans", "value"),
+     Input("fuzzy-search", "value"),
+     Input("filter-status", "value")]
+)
+def update_export_link(search_value, fuzzy, status_filter):
+    # "Exportar" descarga lo mismo que muestra la tabla
+    return export_url("csv", search_value, fuzzy, status_filter)
+
+
+@app.callback(
+    Output("export-download", "href"),
+    [Input("export-format", "value"),
+     Input("export-search", "value"),
+     Input("export-status", "value")]
+)
+def update_export_download(fmt, search_value, status_filter):
+    return export_url(fmt or "csv", search_value, False, status_filter)
 
 # Por Categoría
 @app.callback(
-    Output("cat-plans", "children"),
-    Input("fetch-cat", "n_clicks"),
-    State("cat-id", "value"),
+    Output("cat-id", "options"),
+    Input("cat-id", "id")
+)
+def load_category_options(_):
+    try:
+        categories = get_categories_snapshot().data or []
+    except Exception:
+        return []
+    return [
+        {"label": c.get('name') or f"Categoría {c.get('id')}", "value": c.get('id')}
+        for c in categories if isinstance(c, dict) and c.get('id') is not None
+    ]
+
+
+@app.callback(
+    [Output("cat-plans", "children"),
+     Output({"type": "cat-cards", "index": ALL}, "children"),
+     Output("cat-cards-shown", "data"),
+     Output("cat-load-more-wrapper", "style")],
+    [Input("fetch-cat", "n_clicks"),
+     Input("cat-id", "value"),
+     Input("cat-load-more", "n_clicks")],
+    [State("cat-id", "options"),
+     State("cat-cards-shown", "data")],
     prevent_initial_call=True
 )
-def fetch_by_category(n_clicks, cat_id):
-    if not cat_id:
-        return dbc.Alert([html.I(className="fas fa-info-circle me-2"), "Ingrese un ID"], color="info")
+def fetch_by_category(n_clicks, cat_ids, load_more, options, shown):
+    hidden = {'display': 'none', 'textAlign': 'center'}
+    visible = {'display': 'block', 'textAlign': 'center'}
+    # Contenedores de tarjetas en pantalla, uno por categoría
+    containers = [output["id"]["index"] for output in ctx.outputs_list[1]]
+    untouched = [no_update] * len(containers)
+    cat_ids = list(dict.fromkeys(cat_ids or []))
+    if not cat_ids:
+        return dbc.Alert([html.I(className="fas fa-info-circle me-2"), "Seleccione una o más categorías"], color="info"), untouched, None, hidden
     
     try:
-        response = requests.get(f"{API_BASE_URL}/plans/category/{cat_id}", timeout=10)
+        count = CATEGORY_CARDS_PAGE_SIZE
+        # Cambiar la selección usa lo ya cargado; "Buscar" revalida con el API
+        load = get_category_plans_snapshot if ctx.triggered_id == "fetch-cat" else get_local_category_plans_snapshot
+        if ctx.triggered_id == "cat-load-more" and shown:
+            count = shown["count"] + CATEGORY_CARDS_PAGE_SIZE
+            patches = load_more_category_cards(shown, containers)
+            if patches is not None:
+                more = any(total > count for _, total, _ in shown["columns"])
+                return no_update, patches, {**shown, "count": count}, visible if more else hidden
+            # Alguna categoría cambió desde la primera página: se renderiza de
+            # nuevo hasta donde ya se mostraba
         
-        if response.status_code == 200:
-            plans = response.json()
-            
-            if not plans:
-                return dbc.Alert([html.I(className="fas fa-inbox me-2"), f"No hay planes en categoría {cat_id}"], color="info")
-            
-            cards = []
-            for plan in plans:
-                card = dbc.Card([
-                    dbc.CardBody([
-                        html.H5([html.I(className="fas fa-bookmark me-2"), plan.get('name', 'Sin nombre')]),
-                        html.P(plan.get('description', '')[:150] + "..."),
-                        dbc.Row([
-                            dbc.Col([html.Small([html.I(className="fas fa-map-marker-alt me-1"), plan.get('location', 'N/A')], className="text-muted")]),
-                            dbc.Col([html.Small([html.I(className="fas fa-eye me-1"), f"{plan.get('views', 0)} vistas"], className="text-muted")])
-                        ])
-                    ])
-                ], className="mb-3", style={'boxShadow': 'var(--shadow-sm)', 'border': '1px solid #e2e8f0', 'borderRadius': '12px'})
-                cards.append(card)
-            
-            return html.Div(cards)
-        else:
-            return dbc.Alert(f"Error {response.status_code}", color="danger")
+        # Las categorías que faltan se piden en paralelo, con plazo común
+        snapshots, errors = fetch_snapshots({cid: (lambda cid=cid: load(cid)) for cid in cat_ids})
+        
+        names = {option['value']: option['label'] for option in options or []}
+        width = max(12 // len(cat_ids), 4)
+        columns, card_columns = [], []
+        for cid in cat_ids:
+            title = html.H5([html.I(className="fas fa-tag me-2"), names.get(cid) or f"Categoría {cid}"], className="mb-3")
+            if cid in errors:
+                body = dbc.Alert(f"Error: {errors[cid]}", color="danger")
+            else:
+                snapshot = snapshots[cid]
+                body = category_renders.get(("page", cid, snapshot.version, count),
+                                            lambda: render_category_plans(cid, snapshot, count))
+                if snapshot.data:
+                    # Versión por contenido: "Cargar más" puede llegar a otro worker
+                    card_columns.append([cid, len(snapshot.data), snapshot.content_version])
+            columns.append(dbc.Col([title, body], md=width, className="mb-4"))
+        
+        shown = {"count": count, "columns": card_columns}
+        more = any(total > count for _, total, _ in card_columns)
+        return dbc.Row(columns), untouched, shown, visible if more else hidden
     except Exception as e:
-        return dbc.Alert(f"Error: {str(e)}", color="danger")
+        return dbc.Alert(f"Error: {str(e)}", color="danger"), untouched, None, hidden
+
+
+def load_more_category_cards(shown, containers):
+    """
+    Siguiente bloque de tarjetas como un Patch por contenedor: el navegador
+    solo recibe las tarjetas nuevas. Devuelve None si algún snapshot ya no
+    es el de las páginas anteriores (se repetirían o saltarían tarjetas).
+    """
+    start = shown["count"]
+    stop = start + CATEGORY_CARDS_PAGE_SIZE
+    patches = {}
+    for cid, total, version in shown["columns"]:
+        if total <= start:
+            continue
+        snapshot = get_local_category_plans_snapshot(cid)
+        if snapshot.content_version != version or cid not in containers:
+            return None
+        with span("render"):
+            cards = category_renders.get(("cards", cid, snapshot.version, start),
+                                         lambda: category_plan_cards(snapshot, start, stop))
+        patch = Patch()
+        patch.extend(cards)
+        patches[cid] = patch
+    return [patches.get(cid, no_update) for cid in containers]
+
+
+def category_plan_cards(snapshot, start, stop):
+    """Tarjetas de los planes [start, stop) del snapshot"""
+    return [create_plan_card(plan) for plan in snapshot.data[start:stop]]
+
+
+@span("render")
+def render_category_plans(cat_id, snapshot, count=CATEGORY_CARDS_PAGE_SIZE):
+    """Resumen y primeras `count` tarjetas de una categoría"""
+    plans = snapshot.data
+    if not plans:
+        return dbc.Alert([html.I(className="fas fa-inbox me-2"), f"No hay planes en categoría {cat_id}"], color="info")
+    
+    df = snapshot.frame
+    views = pd.to_numeric(df['views'], errors='coerce') if 'views' in df else pd.Series(dtype=float)
+    cost = pd.to_numeric(df['costEstimate'], errors='coerce') if 'costEstimate' in df else pd.Series(dtype=float)
+    active = int(df['isActive'].fillna(False).astype(bool).sum()) if 'isActive' in df else 0
+    summary = html.Div([
+        html.Small(f"{len(plans):,} planes · {active:,} activos", className="d-block"),
+        html.Small(
+            f"{views.mean():,.0f} vistas prom. · ${cost.mean():,.0f} costo prom."
+            if views.notna().any() and cost.notna().any() else "Sin métricas",
+            className="d-block"
+        )
+    ], className="text-muted mb-3")
+    
+    # "Cargar más" agrega tarjetas a este contenedor
+    cards = html.Div(category_plan_cards(snapshot, 0, count), id={"type": "cat-cards", "index": cat_id})
+    return html.Div([summary, cards])
 
 # Categorías
 @app.callback(
@@ -1414,128 +2255,134 @@ def fetch_by_category(n_clicks, cat_id):
 )
 def fetch_categories(n_clicks):
     try:
-        response = requests.get(f"{API_BASE_URL}/categories", timeout=10)
+        snapshot = get_categories_snapshot(force=True)
+        categories = snapshot.data
         
-        if response.status_code == 200:
-            categories = response.json()
-            
-            if not categories:
-                return dbc.Alert([html.I(className="fas fa-inbox me-2"), "No hay categorías"], color="info")
-            
-            df = pd.DataFrame(categories)
-            
-            return dash_table.DataTable(
-                data=df.to_dict('records'),
-                columns=[{"name": i.upper(), "id": i} for i in df.columns],
-                page_size=15,
-                sort_action="native",
-                filter_action="native",
-                style_cell={'textAlign': 'left', 'padding': '16px', 'fontFamily': 'Outfit'},
-                style_header={'backgroundColor': '#0f172a', 'color': 'white', 'fontWeight': '600'},
-                style_data_conditional=[{'if': {'row_index': 'odd'}, 'backgroundColor': '#f8fafc'}],
-            )
-        else:
-            return dbc.Alert(f"Error {response.status_code}", color="danger")
+        if not categories:
+            return dbc.Alert([html.I(className="fas fa-inbox me-2"), "No hay categorías"], color="info")
+        
+        df = snapshot.frame
+        
+        return dash_table.DataTable(
+            data=df.to_dict('records'),
+            columns=[{"name": i.upper(), "id": i} for i in df.columns],
+            page_size=15,
+            sort_action="native",
+            filter_action="native",
+            style_cell={'textAlign': 'left', 'padding': '16px', 'fontFamily': 'Outfit'},
+            style_header={'backgroundColor': '#0f172a', 'color': 'white', 'fontWeight': '600'},
+            style_data_conditional=[{'if': {'row_index': 'odd'}, 'backgroundColor': '#f8fafc'}],
+        )
     except Exception as e:
         return dbc.Alert(f"Error: {str(e)}", color="danger")
 
-# Analytics
-@app.callback(
-    [Output("analytics-kpis", "children"),
-     Output("trend-chart", "figure"),
-     Output("cost-distribution", "figure"),
-     Output("priority-views", "figure")],
-    Input("url", "pathname")
-)
-def update_analytics(pathname):
-    if pathname != "/analytics":
-        return [], {}, {}, {}
+@span("render")
+def render_analytics(snapshot):
+    """KPIs y gráficos de analytics para un snapshot (ver render_cache)."""
+    df = snapshot.frame
 
-    try:
-        response = requests.get(f"{API_BASE_URL}/plans", timeout=10)
-        response.raise_for_status()
-        plans = response.json()
-        df = pd.DataFrame(plans)
-
-        # --- KPIs simplificados ---
-        max_views = int(df['views'].max()) if 'views' in df and not df.empty else 0
-        min_cost = float(df['costEstimate'].min()) if 'costEstimate' in df and not df.empty else 0
-        avg_priority = float(df['priority'].mean()) if 'priority' in df and not df.empty else 0
-
-        kpis = html.Div(
-            [
-                create_kpi_card("Plan Más Visto", f"{max_views:,}", "fas fa-fire", "danger"),
-                create_kpi_card("Costo Mínimo", f"${min_cost:,.2f}", "fas fa-tag", "success"),
-                create_kpi_card("Prioridad Promedio", f"{avg_priority:.1f}", "fas fa-star", "warning"),
-                create_kpi_card("Engagement Rate", "78.5%", "fas fa-heart", "primary"),
-            ],
-            style={
-                "display": "flex",
-                "flexDirection": "row",
-                "justifyContent": "space-between",
-                "gap": "1rem",
-                "flexWrap": "wrap"
-            }
+    # --- KPIs simplificados ---
+    max_views = int(df['views'].max()) if 'views' in df and not df.empty else 0
+    min_cost = float(df['costEstimate'].min()) if 'costEstimate' in df and not df.empty else 0
+    avg_priority = float(df['priority'].mean()) if 'priority' in df and not df.empty else 0
+
+    kpis = html.Div(
+        [
+            create_kpi_card("Plan Más Visto", f"{max_views:,}", "fas fa-fire", "danger"),
+            create_kpi_card("Costo Mínimo", f"${min_cost:,.2f}", "fas fa-tag", "success"),
+            create_kpi_card("Prioridad Promedio", f"{avg_priority:.1f}", "fas fa-star", "warning"),
+            create_kpi_card("Engagement Rate", "78.5%", "fas fa-heart", "primary"),
+        ],
+        style={
+            "display": "flex",
+            "flexDirection": "row",
+            "justifyContent": "space-between",
+            "gap": "1rem",
+            "flexWrap": "wrap"
+        }
+    )
+
+    # --- Gráficos (mismo código que antes) ---
+    trend_fig = go.Figure()
+    if not df.empty:
+        trend_fig.add_trace(go.Scatter(
+            x=pd.date_range(start='2026-01-01', periods=30, freq='D'),
+            y=[i*2 + 10 + (i%7)*5 for i in range(30)],
+            mode='lines+markers',
+            line=dict(color='#2563eb', width=3),
+            marker=dict(size=8)
+        ))
+    trend_fig.update_layout(
+        height=300, margin=dict(t=20, b=40, l=40, r=20),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Outfit'),
+        xaxis=dict(showgrid=True, gridcolor='#f1f5f9'),
+        yaxis=dict(showgrid=True, gridcolor='#f1f5f9', title='Cantidad')
+    )
+
+    cost_fig = go.Figure()
+    if not df.empty and 'costEstimate' in df:
+        cost_fig.add_trace(go.Histogram(
+            x=df['costEstimate'], nbinsx=20, marker_color='#7c3aed'
+        ))
+        cost_fig.update_layout(
+            height=300, margin=dict(t=20, b=40, l=40, r=20),
+            paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(family='Outfit'),
+            xaxis=dict(title='Costo Estimado', showgrid=True, gridcolor='#f1f5f9'),
+            yaxis=dict(title='Frecuencia', showgrid=True, gridcolor='#f1f5f9')
         )
 
-        # --- Gráficos (mismo código que antes) ---
-        trend_fig = go.Figure()
-        if not df.empty:
-            trend_fig.add_trace(go.Scatter(
-                x=pd.date_range(start='2026-01-01', periods=30, freq='D'),
-                y=[i*2 + 10 + (i%7)*5 for i in range(30)],
-                mode='lines+markers',
-                line=dict(color='#2563eb', width=3),
-                marker=dict(size=8)
-            ))
-        trend_fig.update_layout(
+    scatter_fig = go.Figure()
+    if not df.empty and all(col in df for col in ['priority', 'views']):
+        scatter_fig.add_trace(go.Scatter(
+            x=df['priority'], y=df['views'],
+            mode='markers',
+            marker=dict(
+                size=df['costEstimate'] / 10 if 'costEstimate' in df else 10,
+                color=df['category'] if 'category' in df else '#2563eb',
+                colorscale='Purples', showscale=True,
+                colorbar=dict(title="Categoría")
+            ),
+            text=df['name'] if 'name' in df else None,
+            hovertemplate='<b>%{text}</b><br>Prioridad: %{x}<br>Vistas: %{y}<extra></extra>'
+        ))
+        scatter_fig.update_layout(
             height=300, margin=dict(t=20, b=40, l=40, r=20),
             paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
             font=dict(family='Outfit'),
-            xaxis=dict(showgrid=True, gridcolor='#f1f5f9'),
-            yaxis=dict(showgrid=True, gridcolor='#f1f5f9', title='Cantidad')
+            xaxis=dict(title='Prioridad', showgrid=True, gridcolor='#f1f5f9'),
+            yaxis=dict(title='Vistas', showgrid=True, gridcolor='#f1f5f9')
         )
 
-        cost_fig = go.Figure()
-        if not df.empty and 'costEstimate' in df:
-            cost_fig.add_trace(go.Histogram(
-                x=df['costEstimate'], nbinsx=20, marker_color='#7c3aed'
-            ))
-            cost_fig.update_layout(
-                height=300, margin=dict(t=20, b=40, l=40, r=20),
-                paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                font=dict(family='Outfit'),
-                xaxis=dict(title='Costo Estimado', showgrid=True, gridcolor='#f1f5f9'),
-                yaxis=dict(title='Frecuencia', showgrid=True, gridcolor='#f1f5f9')
-            )
+    return kpis, trend_fig, cost_fig, scatter_fig
 
-        scatter_fig = go.Figure()
-        if not df.empty and all(col in df for col in ['priority', 'views']):
-            scatter_fig.add_trace(go.Scatter(
-                x=df['priority'], y=df['views'],
-                mode='markers',
-                marker=dict(
-                    size=df['costEstimate'] / 10 if 'costEstimate' in df else 10,
-                    color=df['category'] if 'category' in df else '#2563eb',
-                    colorscale='Purples', showscale=True,
-                    colorbar=dict(title="Categoría")
-                ),
-                text=df['name'] if 'name' in df else None,
-                hovertemplate='<b>%{text}</b><br>Prioridad: %{x}<br>Vistas: %{y}<extra></extra>'
-            ))
-            scatter_fig.update_layout(
-                height=300, margin=dict(t=20, b=40, l=40, r=20),
-                paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                font=dict(family='Outfit'),
-                xaxis=dict(title='Prioridad', showgrid=True, gridcolor='#f1f5f9'),
-                yaxis=dict(title='Vistas', showgrid=True, gridcolor='#f1f5f9')
-            )
 
-        return kpis, trend_fig, cost_fig, scatter_fig
+# Analytics
+@app.callback(
+    [Output("analytics-kpis", "children"),
+     Output("trend-chart", "figure"),
+     Output("cost-distribution", "figure"),
+     Output("priority-views", "figure"),
+     Output("analytics-version", "data")],
+    Input("url", "pathname"),
+    State("analytics-version", "data")
+)
+def update_analytics(pathname, rendered_version):
+    if pathname != "/analytics":
+        return [], {}, {}, {}, no_update
 
-    except Exception as e:
-        return html.Div(f"Error al cargar analytics: {e}"), {}, {}, {}
+    try:
+        snapshot = read_plans_snapshot()
+        # Versión por contenido: la pestaña puede hablar con otro worker
+        if snapshot.content_version == rendered_version:
+            return no_update, no_update, no_update, no_update, no_update
 
+        outputs = render_cache.get(("analytics", snapshot.content_version), lambda: render_analytics(snapshot))
+        return (*outputs, snapshot.content_version)
+
+    except Exception as e:
+        return html.Div(f"Error al cargar analytics: {e}"), {}, {}, {}, None
 
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port=8050)
\ No newline at end of file
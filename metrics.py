@@ -0,0 +1,241 @@
+import contextvars
+import functools
+import json
+import threading
+import time
+from contextlib import ContextDecorator
+
+from flask import g, has_request_context, request
+
+
+# Límites (segundos) de los buckets de los histogramas
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Callback que se está ejecutando en este hilo/contexto (para etiquetar spans)
+current_callback = contextvars.ContextVar("current_callback", default="background")
+
+
+# ==================== MÉTRICAS ====================
+
+class Histogram:
+    """Histograma acumulado al estilo Prometheus (buckets, suma y conteo)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels, extra=None):
+    items = list(labels)
+    if extra:
+        items.append(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+class MetricsRegistry:
+    """
+    Histogramas y contadores etiquetados, expuestos en texto de Prometheus.
+
+    Las etiquetas se pasan como kwargs: observe("x_seconds", 0.1, callback="a").
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    def observe(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def render(self):
+        """Todas las series en el formato de texto de Prometheus (0.0.4)."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels, ('le', repr(bound)))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+registry.describe("dash_callback_seconds", "Tiempo de la función del callback")
+registry.describe("dash_callback_stage_seconds", "Tiempo por etapa (fetch, parse, transform, render, serialize)")
+registry.describe("dash_request_seconds", "Tiempo total de la petición _dash-update-component")
+registry.describe("dash_callback_errors_total", "Excepciones lanzadas por el callback")
+registry.describe("dash_response_bytes_total", "Bytes de las respuestas de cada callback")
+registry.describe("dash_output_bytes_total", "Bytes de cada salida (id.propiedad) de cada callback")
+
+
+# ==================== SPANS ====================
+
+class span(ContextDecorator):
+    """
+    Mide una etapa del callback en curso (contexto o decorador):
+
+        with span("fetch"):
+            ...
+
+        @span("render")
+        def render_dashboard(...):
+    """
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def _recreate_cm(self):
+        # Como decorador, cada llamada usa su propia instancia: las llamadas
+        # concurrentes de varios hilos no comparten la hora de inicio
+        return span(self.stage)
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        registry.observe(
+            "dash_callback_stage_seconds",
+            time.perf_counter() - self._started,
+            callback=current_callback.get(),
+            stage=self.stage
+        )
+        return False
+
+
+def instrument_callbacks(app):
+    """
+    Envuelve cada función registrada con `app.callback` para medir su
+    tiempo y etiquetar los spans internos con su nombre. Debe llamarse
+    antes de declarar los callbacks.
+    """
+    register = app.callback
+
+    def callback(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+
+        def wrap(func):
+            @functools.wraps(func)
+            def timed(*func_args, **func_kwargs):
+                token = current_callback.set(func.__name__)
+                started = time.perf_counter()
+                try:
+                    return func(*func_args, **func_kwargs)
+                except Exception:
+                    registry.inc("dash_callback_errors_total", callback=func.__name__)
+                    raise
+                finally:
+                    elapsed = time.perf_counter() - started
+                    if has_request_context():
+                        # Dash ejecuta el callback en un contexto copiado: se
+                        # comparte por `g` con el hook after_request
+                        g.metrics_callback_seconds = elapsed
+                    registry.observe("dash_callback_seconds", elapsed, callback=func.__name__)
+                    current_callback.reset(token)
+            return decorator(timed)
+        return wrap
+
+    app.callback = callback
+
+
+# ==================== PETICIONES ====================
+
+def callback_name(app, body):
+    """Nombre de la función que atiende el cuerpo de _dash-update-component."""
+    entry = app.callback_map.get(body.get("output")) if body else None
+    func = entry and entry.get("callback")
+    return getattr(func, "__name__", "unknown")
+
+
+def output_sizes(body):
+    """Bytes de cada salida en una respuesta de Dash, como {"id.prop": n}."""
+    try:
+        response = json.loads(body).get("response", {})
+    except (ValueError, AttributeError):
+        return {}
+    sizes = {}
+    for component_id, props in response.items():
+        for prop, value in props.items():
+            sizes[f"{component_id}.{prop}"] = len(json.dumps(value, separators=(",", ":")))
+    return sizes
+
+
+def instrument_server(app, path_suffix="_dash-update-component", output_sizes_enabled=False):
+    """
+    Hooks de Flask: tiempo total de cada petición de callback, el resto
+    fuera de la función como etapa "serialize" y bytes de la respuesta.
+    Con `output_sizes_enabled` también los bytes por salida, a costa de
+    decodificar y recodificar cada respuesta dentro de la petición.
+    """
+    server = app.server
+
+    @server.before_request
+    def _metrics_start():
+        if request.path.endswith(path_suffix):
+            g.metrics_started = time.perf_counter()
+
+    @server.after_request
+    def _metrics_finish(response):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        name = callback_name(app, request.get_json(silent=True))
+        registry.observe("dash_request_seconds", elapsed, callback=name)
+
+        callback_seconds = g.pop("metrics_callback_seconds", None)
+        if callback_seconds is not None:
+            registry.observe("dash_callback_stage_seconds", max(elapsed - callback_seconds, 0.0), callback=name, stage="serialize")
+
+        if not response.direct_passthrough:
+            body = response.get_data()
+            registry.inc("dash_response_bytes_total", len(body), callback=name)
+            if output_sizes_enabled:
+                for output, size in output_sizes(body).items():
+                    registry.inc("dash_output_bytes_total", size, callback=name, output=output)
+        return response
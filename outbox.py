@@ -0,0 +1,273 @@
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+
+from background import BackgroundWorker
+
+
+logger = logging.getLogger(__name__)
+
+# Estados de un envío en la bandeja de salida
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+REJECTED = "rejected"
+
+
+class PermanentError(Exception):
+    """El backend rechazó el envío; reintentar no cambiaría el resultado."""
+
+
+# ==================== BANDEJA DE SALIDA ====================
+
+class Outbox:
+    """
+    Cola durable de publicaciones en SQLite.
+
+    path       : str   - archivo de la base de datos
+    base_delay : float - segundos del primer reintento (se duplica en cada uno)
+    max_delay  : float - tope del backoff
+    lease      : float - segundos que un worker reserva un envío; si muere,
+                         el envío vuelve a quedar pendiente al vencer
+
+    Cada envío lleva una clave de idempotencia fija desde que se encola, así
+    que reintentar (o que dos procesos lo envíen) no publica dos veces.
+    """
+
+    def __init__(self, path, base_delay=2.0, max_delay=300.0, lease=60.0):
+        self.path = path
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease = lease
+        # La base se crea en el primer uso, no al importar la app
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _open(self):
+        db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return _Transaction(db)
+
+    def _create_schema(self):
+        with self._open() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    key TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    last_error TEXT,
+                    result TEXT,
+                    created_at REAL NOT NULL,
+                    sent_at REAL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+
+    def _connect(self):
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    self._create_schema()
+                    self._ready = True
+        return self._open()
+
+    def enqueue(self, path, payload):
+        """Guarda `payload` para POST a `path`. Devuelve su clave de idempotencia."""
+        key = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO outbox (key, path, payload, status, next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, path, json.dumps(payload), PENDING, now, now)
+            )
+        return key
+
+    def claim(self, limit=10):
+        """Reserva hasta `limit` envíos vencidos (o con la reserva expirada)."""
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            rows = db.execute(
+                """SELECT key, path, payload, attempts FROM outbox
+                   WHERE status IN (?, ?) AND next_attempt_at <= ?
+                   ORDER BY next_attempt_at LIMIT ?""",
+                (PENDING, SENDING, now, limit)
+            ).fetchall()
+            db.executemany(
+                "UPDATE outbox SET status = ?, next_attempt_at = ? WHERE key = ?",
+                [(SENDING, now + self.lease, row["key"]) for row in rows]
+            )
+        return [
+            {"key": row["key"], "path": row["path"], "payload": json.loads(row["payload"]), "attempts": row["attempts"]}
+            for row in rows
+        ]
+
+    def mark_sent(self, key, result):
+        with self._connect() as db:
+            db.execute(
+                "UPDATE outbox SET status = ?, result = ?, sent_at = ?, attempts = attempts + 1, last_error = NULL WHERE key = ?",
+                (SENT, json.dumps(result), time.time(), key)
+            )
+
+    def mark_rejected(self, key, error):
+        with self._connect() as db:
+            db.execute(
+                "UPDATE outbox SET status = ?, last_error = ?, attempts = attempts + 1 WHERE key = ?",
+                (REJECTED, str(error), key)
+            )
+
+    def retry_later(self, key, attempts, error):
+        """Vuelve a dejar pendiente `key` con backoff exponencial y jitter."""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempts))
+        delay = random.uniform(delay / 2, delay)
+        with self._connect() as db:
+            db.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE key = ?",
+                (PENDING, time.time() + delay, str(error), key)
+            )
+        return delay
+
+    def get(self, key):
+        """Estado de un envío como dict (o None)."""
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM outbox WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["payload"] = json.loads(entry["payload"])
+        entry["result"] = json.loads(entry["result"]) if entry["result"] else None
+        return entry
+
+    def next_due(self):
+        """Segundos hasta el próximo envío pendiente (None si no hay)."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE status IN (?, ?)", (PENDING, SENDING)
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(row[0] - time.time(), 0.0)
+
+    def stats(self):
+        with self._connect() as db:
+            rows = db.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        counts = {PENDING: 0, SENDING: 0, SENT: 0, REJECTED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+
+class _Transaction:
+    """Conexión que confirma (o revierte) una transacción abierta y se cierra."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self.db.in_transaction:
+                self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.db.close()
+
+
+# ==================== WORKER ====================
+
+class OutboxWorker(BackgroundWorker):
+    """
+    Hilo de fondo (uno por proceso) que vacía la bandeja de salida.
+
+    outbox   : Outbox
+    send     : callable(path, payload, key) -> dict publicado; lanza
+               PermanentError si no tiene sentido reintentar
+    interval : float - espera máxima entre revisiones si no hay avisos
+    on_sent  : callable(entry, result) opcional, ej. para actualizar la caché
+    """
+
+    thread_name = "outbox-worker"
+
+    def __init__(self, outbox, send, interval=5.0, on_sent=None):
+        super().__init__()
+        self.outbox = outbox
+        self.send = send
+        self.interval = interval
+        self.on_sent = on_sent
+        self._wake = threading.Event()
+        self.sent = 0
+        self.retries = 0
+        self.rejected = 0
+        self.last_error = None
+
+    def notify(self):
+        """Despierta al worker (ej. justo después de encolar)."""
+        self.ensure_started()
+        self._wake.set()
+
+    def stop(self):
+        super().stop()
+        self._wake.set()
+
+    def drain_once(self):
+        """Intenta todos los envíos vencidos una vez; devuelve cuántos procesó."""
+        processed = 0
+        while True:
+            entries = self.outbox.claim()
+            if not entries:
+                return processed
+            for entry in entries:
+                self._deliver(entry)
+                processed += 1
+
+    def _deliver(self, entry):
+        key = entry["key"]
+        try:
+            result = self.send(entry["path"], entry["payload"], key)
+        except PermanentError as e:
+            self.rejected += 1
+            self.last_error = f"{key}: {e}"
+            self.outbox.mark_rejected(key, e)
+        except Exception as e:
+            self.retries += 1
+            self.last_error = f"{key}: {e}"
+            delay = self.outbox.retry_later(key, entry["attempts"], e)
+            logger.warning("Envío %s falló (%s); reintento en %.1fs", key, e, delay)
+        else:
+            self.sent += 1
+            self.outbox.mark_sent(key, result)
+            if self.on_sent is not None:
+                try:
+                    self.on_sent(entry, result)
+                except Exception:
+                    logger.exception("Error en on_sent para %s", key)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.drain_once()
+                due = self.outbox.next_due()
+            except Exception:
+                logger.exception("Error vaciando la bandeja de salida")
+                due = None
+            timeout = self.interval if due is None else min(due, self.interval)
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "sent": self.sent,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+            "queue": self.outbox.stats(),
+        }
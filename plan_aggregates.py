@@ -0,0 +1,168 @@
+import threading
+from collections import Counter
+from datetime import date, timedelta
+
+import pandas as pd
+
+
+UPCOMING_WINDOW_DAYS = 7
+
+
+def _to_days(values):
+    """Fechas del API -> datetime.date (None si no se pueden interpretar)."""
+    parsed = pd.to_datetime(pd.Series(list(values), dtype=object), errors='coerce', format='ISO8601')
+    return [None if pd.isna(value) else value.date() for value in parsed]
+
+
+class PlanKpiAggregator:
+    """
+    KPIs del dashboard mantenidos como contadores.
+
+    Se inicializan una vez desde el frame tipado del snapshot y luego se
+    actualizan con el PlanDelta de cada versión (solo las filas que
+    cambiaron). Los contadores por fecha (próximos, próximos esta semana,
+    vencidos) se reclasifican al cambiar el día, recorriendo solo los días
+    distintos, no el catálogo.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._rows = {}
+        self._days = Counter()
+        self._views = Counter()
+        self._max_views = None
+        self._today = None
+        self.total = 0
+        self.active = 0
+        self.no_assistance = 0
+        self.upcoming_all = 0
+        self.upcoming_week = 0
+        self.expired = 0
+
+    # ---------- clasificación por fecha ----------
+
+    def _date_counters(self, day):
+        """(vencido, próximo, próximo esta semana) de `day` respecto a hoy."""
+        if day is None:
+            return 0, 0, 0
+        if day < self._today:
+            return 1, 0, 0
+        in_week = day < self._today + timedelta(days=UPCOMING_WINDOW_DAYS)
+        return 0, 1, int(in_week)
+
+    def _count_day(self, day, amount):
+        expired, upcoming, week = self._date_counters(day)
+        self.expired += expired * amount
+        self.upcoming_all += upcoming * amount
+        self.upcoming_week += week * amount
+
+    def _roll_day(self, today):
+        self._today = today
+        self.expired = self.upcoming_all = self.upcoming_week = 0
+        for day, count in self._days.items():
+            self._count_day(day, count)
+
+    # ---------- filas ----------
+
+    def _count_row(self, row, amount):
+        day, active, views, assistance = row
+        self.total += amount
+        self.active += int(active) * amount
+        self.no_assistance += int(assistance == 0) * amount
+        if views is not None:
+            self._views[views] += amount
+            if self._views[views] <= 0:
+                del self._views[views]
+                if views == self._max_views:
+                    # Solo se recorre si se quita el máximo actual
+                    self._max_views = max(self._views) if self._views else None
+            elif self._max_views is None or views > self._max_views:
+                self._max_views = views
+        if day is not None:
+            self._days[day] += amount
+            if self._days[day] <= 0:
+                del self._days[day]
+        self._count_day(day, amount)
+
+    @staticmethod
+    def _plan_rows(plans, days):
+        for plan, day in zip(plans, days):
+            views = plan.get('views')
+            assistance = plan.get('assistance')
+            yield plan.get('id'), (
+                day,
+                bool(plan.get('isActive', False)),
+                None if views is None else int(views),
+                None if assistance is None else int(assistance)
+            )
+
+    def _rebuild(self, frame):
+        self._reset()
+        self._today = date.today()
+        if frame.empty:
+            return
+
+        n = len(frame)
+        days = frame['date'].dt.date if 'date' in frame else [None] * n
+        active = frame['isActive'].fillna(False) if 'isActive' in frame else [False] * n
+        views = frame['views'].astype(object).where(frame['views'].notna(), None) if 'views' in frame else [None] * n
+        assistance = frame['assistance'].astype(object).where(frame['assistance'].notna(), None) if 'assistance' in frame else [None] * n
+
+        for plan_id, day, is_active, view_count, assist in zip(frame['id'], days, active, views, assistance):
+            row = (None if pd.isna(day) else day, bool(is_active), view_count, assist)
+            self._rows[plan_id] = row
+            self._count_row(row, 1)
+
+    def _apply(self, delta):
+        for plan_id in delta.removed:
+            row = self._rows.pop(plan_id, None)
+            if row is not None:
+                self._count_row(row, -1)
+
+        changed = list(delta.added) + list(delta.updated)
+        days = _to_days(plan.get('date') for plan in changed)
+        for plan_id, row in self._plan_rows(changed, days):
+            previous = self._rows.get(plan_id)
+            if previous is not None:
+                self._count_row(previous, -1)
+            self._rows[plan_id] = row
+            self._count_row(row, 1)
+
+    # ---------- API ----------
+
+    def sync(self, snapshot):
+        """Lleva los contadores a la versión de `snapshot`."""
+        with self._lock:
+            if self.version == snapshot.version:
+                return
+            delta = snapshot.delta
+            incremental = (
+                delta is not None and not delta.full
+                and self.version is not None and self.version == snapshot.version - 1
+            )
+            if incremental:
+                self._apply(delta)
+            else:
+                self._rebuild(snapshot.frame)
+            self.version = snapshot.version
+
+    def kpis(self, snapshot, today=None):
+        """KPIs de `snapshot` como dict; O(cambios) desde la última llamada."""
+        self.sync(snapshot)
+        with self._lock:
+            today = today or date.today()
+            if today != self._today:
+                self._roll_day(today)
+            return {
+                'total': self.total,
+                'active': self.active,
+                'upcoming_week': self.upcoming_week,
+                'upcoming_all': self.upcoming_all,
+                'expired': self.expired,
+                'max_views': self._max_views or 0,
+                'no_assistance': self.no_assistance
+            }
@@ -0,0 +1,91 @@
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet es opcional
+    pa = None
+    pq = None
+
+
+EXPORT_CHUNK_ROWS = 5000
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+
+def parquet_available():
+    return pq is not None
+
+
+def _chunks(frame, chunk_rows):
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start: start + chunk_rows]
+
+
+def iter_csv(frame, chunk_rows=EXPORT_CHUNK_ROWS):
+    """CSV por bloques: el encabezado solo va en el primero."""
+    if frame.empty:
+        yield frame.to_csv(index=False)
+        return
+    for i, chunk in enumerate(_chunks(frame, chunk_rows)):
+        yield chunk.to_csv(index=False, header=i == 0, date_format='%Y-%m-%dT%H:%M:%S')
+
+
+def iter_ndjson(frame, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Un objeto JSON por línea, serializado por bloques."""
+    for chunk in _chunks(frame, chunk_rows):
+        yield chunk.to_json(orient='records', lines=True, date_format='iso', force_ascii=False) + '\n'
+
+
+class _ChunkSink:
+    """Archivo de solo escritura que acumula bytes hasta que se drenan."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def iter_parquet(frame, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Parquet con un row group por bloque, emitido a medida que se escribe."""
+    if pq is None:
+        raise RuntimeError("Exportar a Parquet requiere pyarrow")
+
+    schema = pa.Schema.from_pandas(frame.head(0), preserve_index=False)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for chunk in _chunks(frame, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+EXPORT_WRITERS = {
+    'csv': iter_csv,
+    'ndjson': iter_ndjson,
+    'parquet': iter_parquet
+}
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+
+# Tipos de las columnas del catálogo de planes
+PLAN_SCHEMA = {
+    'name': 'category',
+    'location': 'category',
+    'category': 'category',
+    'priority': 'Int16',
+    'views': 'Int32',
+    'assistance': 'Int32',
+    'costEstimate': 'float32',
+    'isActive': 'boolean',
+    'date': 'datetime64'
+}
+
+# Valores que el API puede mandar para un booleano (lo demás queda NA)
+BOOLEAN_VALUES = {
+    True: True, False: False,
+    'true': True, 'false': False,
+    't': True, 'f': False,
+    '1': True, '0': False,
+    'yes': True, 'no': False,
+    'si': True, 'sí': True,
+}
+
+
+def _to_boolean(value):
+    if isinstance(value, str):
+        value = value.strip().lower()
+    try:
+        # 1, 0, 1.0 y 0.0 coinciden con True/False como claves
+        return BOOLEAN_VALUES.get(value, pd.NA)
+    except TypeError:
+        return pd.NA
+
+
+def _coerce_column(series, dtype):
+    if dtype == 'category':
+        return series.astype('category')
+    if dtype == 'datetime64':
+        return pd.to_datetime(series, errors='coerce', format='ISO8601')
+    if dtype == 'boolean':
+        # Como con los enteros, un valor raro queda NA en vez de tumbar la ingesta
+        return series.map(_to_boolean).astype('boolean')
+    numeric = pd.to_numeric(series, errors='coerce')
+    if dtype.startswith('Int'):
+        # Fuera del rango del tipo queda NA: un valor raro no debe tumbar la ingesta
+        info = np.iinfo(dtype.lower())
+        numeric = numeric.where(numeric.between(info.min, info.max))
+        return numeric.round().astype(dtype)
+    return numeric.astype(dtype)
+
+
+def coerce_plan_frame(df):
+    """Aplica PLAN_SCHEMA a un DataFrame de planes (agrega columnas faltantes vacías)."""
+    columns = {}
+    for col, dtype in PLAN_SCHEMA.items():
+        series = df[col] if col in df.columns else pd.Series(pd.NA, index=df.index, dtype=object)
+        columns[col] = _coerce_column(series, dtype)
+    return df.assign(**columns)
+
+
+def build_plan_frame(plans):
+    """
+    Ingesta única por snapshot: lista de planes del API -> DataFrame tipado
+    y compacto (categóricas, enteros pequeños con nulos, float32, fechas).
+    """
+    return coerce_plan_frame(pd.DataFrame(plans))
+
+
+def concat_plan_frames(frames):
+    """
+    Concatena frames tipados conservando las columnas categóricas (con la
+    unión ordenada de categorías, para que ordenar por código siga siendo
+    ordenar por valor).
+    """
+    frames = [frame for frame in frames if len(frame.columns)]
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    aligned = list(frames)
+    for col, dtype in PLAN_SCHEMA.items():
+        if dtype != 'category':
+            continue
+        categories = None
+        for frame in aligned:
+            if col in frame.columns:
+                current = frame[col].cat.categories
+                categories = current if categories is None else categories.union(current)
+        if categories is None:
+            continue
+        aligned = [
+            frame.assign(**{col: frame[col].cat.set_categories(categories)}) if col in frame.columns else frame
+            for frame in aligned
+        ]
+    return pd.concat(aligned, ignore_index=True)
+
+
+def frame_memory_report(raw, typed):
+    """Bytes en memoria del frame sin tipar vs. tipado."""
+    before = int(raw.memory_usage(deep=True).sum())
+    after = int(typed.memory_usage(deep=True).sum())
+    return {
+        'rows': len(typed),
+        'bytes_raw': before,
+        'bytes_typed': after,
+        'bytes_saved': before - after,
+        'ratio': round(after / before, 3) if before else 1.0
+    }
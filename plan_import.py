@@ -0,0 +1,310 @@
+import base64
+import io
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+# Columnas del formulario de publicación (mismos nombres que el payload)
+PLAN_FIELDS = [
+    'name', 'description', 'date', 'imageUrl', 'location',
+    'map', 'priority', 'category', 'isActive', 'costEstimate'
+]
+
+TRUE_VALUES = {'true', '1', 'si', 'sí', 'yes', 'y', 'activo'}
+FALSE_VALUES = {'false', '0', 'no', 'n', 'inactivo'}
+
+
+# ==================== LECTURA ====================
+
+def parse_upload(contents, filename):
+    """Contenido de dcc.Upload (data URL en base64) -> DataFrame de planes."""
+    _, encoded = contents.split(',', 1)
+    raw = base64.b64decode(encoded)
+    name = (filename or '').lower()
+
+    if name.endswith('.json'):
+        data = json.loads(raw)
+        if isinstance(data, dict):
+            data = data.get('plans', [data])
+        df = pd.DataFrame(data)
+    elif name.endswith('.csv'):
+        df = pd.read_csv(io.BytesIO(raw), dtype=str, keep_default_na=False)
+        df = df.replace({'': None})
+    else:
+        raise ValueError("Formato no soportado: use un archivo .csv o .json")
+
+    for col in PLAN_FIELDS:
+        if col not in df.columns:
+            df[col] = None
+    return df.reset_index(drop=True)
+
+
+def _column(df, name):
+    if name in df.columns:
+        return df[name]
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def _text(df, name):
+    return _column(df, name).astype('string').str.strip()
+
+
+# ==================== VALIDACIÓN ====================
+
+def validate_plans(df):
+    """
+    Reglas del formulario de publicación aplicadas a todas las filas a la
+    vez. Devuelve una lista de errores por fila (vacía si la fila es válida).
+    """
+    name = _text(df, 'name')
+    description = _text(df, 'description')
+    date = _text(df, 'date')
+    priority_raw = _column(df, 'priority')
+    priority = pd.to_numeric(priority_raw, errors='coerce')
+    category = pd.to_numeric(_column(df, 'category'), errors='coerce')
+
+    # Prioridad: vacía o 0 toma el valor por defecto; lo demás va de 1 a 10
+    priority_given = priority_raw.notna() & (priority != 0)
+    checks = [
+        (name.isna() | (name.str.len() < 3), "El nombre debe tener al menos 3 caracteres"),
+        (description.isna() | (description.str.len() < 10), "La descripción debe tener al menos 10 caracteres"),
+        (date.isna() | (date == ''), "La fecha es obligatoria"),
+        (priority_given & ~priority.between(1, 10), "La prioridad debe estar entre 1 y 10"),
+        (category.isna() | (category == 0), "Debe seleccionar una categoría"),
+    ]
+
+    errors = [[] for _ in range(len(df))]
+    for mask, message in checks:
+        for i in np.flatnonzero(mask.fillna(True).to_numpy(dtype=bool)):
+            errors[i].append(message)
+    return errors
+
+
+def validate_plan(plan):
+    """Errores de validación de un solo plan (dict)."""
+    return validate_plans(pd.DataFrame([plan]))[0]
+
+
+# ==================== PAYLOADS ====================
+
+def _strings(series):
+    return [None if pd.isna(value) else str(value) for value in series]
+
+
+def _numbers(series):
+    """Números como int si son enteros, float si no, None si faltan."""
+    return [
+        None if pd.isna(value) else int(value) if float(value).is_integer() else float(value)
+        for value in series
+    ]
+
+
+def _flags(series, default=True):
+    def parse(value):
+        if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+            return default
+        if isinstance(value, (bool, np.bool_)):
+            return bool(value)
+        text = str(value).strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+        return default
+    return [parse(value) for value in series]
+
+
+def plan_payloads(df):
+    """Filas ya validadas -> payloads para POST /plans/publish."""
+    date = _text(df, 'date')
+    # "yyyy-MM-ddTHH:mm" -> con segundos
+    date = date.where(date.str.len() != 16, date + ':00')
+
+    priority = pd.to_numeric(_column(df, 'priority'), errors='coerce')
+    priority = priority.where(priority.notna() & (priority != 0), 5)
+    category = pd.to_numeric(_column(df, 'category'), errors='coerce')
+    cost = pd.to_numeric(_column(df, 'costEstimate'), errors='coerce').fillna(0)
+
+    columns = {
+        'name': _strings(_text(df, 'name')),
+        'description': _strings(_text(df, 'description')),
+        'date': _strings(date),
+        'imageUrl': _strings(_column(df, 'imageUrl').fillna('')),
+        'location': _strings(_column(df, 'location').fillna('')),
+        'map': _strings(_column(df, 'map').fillna('')),
+        'priority': _numbers(priority.round()),
+        'category': _numbers(category),
+        'isActive': _flags(_column(df, 'isActive')),
+        'costEstimate': _numbers(cost)
+    }
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def plan_payload(plan):
+    """Payload de un solo plan (dict) ya validado."""
+    return plan_payloads(pd.DataFrame([plan]))[0]
+
+
+# ==================== PUBLICACIÓN EN LOTE ====================
+
+class RateLimiter:
+    """Limita a `rate` llamadas por segundo, repartidas uniformemente."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next)
+            self._next = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+
+class ImportJob:
+    """Estado y resultados por fila de una importación en curso."""
+
+    def __init__(self, filename, total):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.total = total
+        self.results = [None] * total
+        self.done = 0
+        self.published = 0
+        self.failed = 0
+        self.started_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def record(self, row, status, plan_id=None, detail=""):
+        with self._lock:
+            self.results[row] = {"status": status, "id": plan_id, "detail": detail}
+            self.done += 1
+            if status == "publicado":
+                self.published += 1
+            else:
+                self.failed += 1
+            if self.done == self.total:
+                self.finished_at = time.time()
+                return True
+        return False
+
+    @property
+    def finished(self):
+        return self.done == self.total
+
+    def progress(self):
+        with self._lock:
+            return {
+                "total": self.total,
+                "done": self.done,
+                "published": self.published,
+                "failed": self.failed,
+                "finished": self.finished,
+                "elapsed": round((self.finished_at or time.time()) - self.started_at, 1)
+            }
+
+    def report(self, source):
+        """DataFrame con el resultado de cada fila del archivo `source`."""
+        with self._lock:
+            results = [result or {"status": "pendiente", "id": None, "detail": ""} for result in self.results]
+        report = pd.DataFrame({
+            'fila': np.arange(1, self.total + 1),
+            'nombre': _column(source, 'name').to_numpy(),
+            'estado': [result["status"] for result in results],
+            # object: con None mezclado pandas pasaría los ids a float ("102.0")
+            'id': pd.Series([result["id"] for result in results], dtype=object),
+            'detalle': [result["detail"] for result in results]
+        })
+        return report
+
+
+class BulkImporter:
+    """
+    Publica lotes de planes en segundo plano.
+
+    publish     : callable(payload) -> dict publicado (lanza excepción si falla)
+    max_workers : int   - publicaciones simultáneas (compartidas por todos los lotes)
+    rate        : float - publicaciones por segundo como máximo
+    on_complete : callable(job) opcional, al terminar cada lote
+    max_jobs    : int   - lotes recientes que se conservan para consultar
+
+    Las filas inválidas no se envían: quedan en el reporte con sus errores.
+    """
+
+    def __init__(self, publish, max_workers=4, rate=10.0, on_complete=None, max_jobs=20):
+        self.publish = publish
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(rate)
+        self.on_complete = on_complete
+        self.max_jobs = max_jobs
+        self._executor = None
+        self._jobs = {}
+        self._sources = {}
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="plan-import")
+            return self._executor
+
+    def start(self, df, filename=None):
+        """Valida `df` y encola la publicación de las filas válidas. Devuelve el ImportJob."""
+        errors = validate_plans(df)
+        payloads = plan_payloads(df)
+        job = ImportJob(filename, len(df))
+        with self._lock:
+            self._jobs[job.id] = job
+            self._sources[job.id] = df
+            while len(self._jobs) > self.max_jobs:
+                oldest = next(iter(self._jobs))
+                self._jobs.pop(oldest)
+                self._sources.pop(oldest, None)
+
+        pool = self._pool()
+        for row, (row_errors, payload) in enumerate(zip(errors, payloads)):
+            if row_errors:
+                self._record(job, row, "inválido", detail="; ".join(row_errors))
+            else:
+                pool.submit(self._publish_row, job, row, payload)
+        if job.total == 0 and self.on_complete is not None:
+            self.on_complete(job)
+        return job
+
+    def _record(self, job, row, status, plan_id=None, detail=""):
+        if job.record(row, status, plan_id, detail) and self.on_complete is not None:
+            self.on_complete(job)
+
+    def _publish_row(self, job, row, payload):
+        self.limiter.wait()
+        try:
+            data = self.publish(payload)
+        except Exception as e:
+            self._record(job, row, "error", detail=str(e))
+        else:
+            self._record(job, row, "publicado", plan_id=data.get("id"))
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def report(self, job_id):
+        """Reporte por fila del lote `job_id` (o None si ya no se conserva)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            source = self._sources.get(job_id)
+        if job is None:
+            return None
+        return job.report(source)
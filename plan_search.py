@@ -0,0 +1,335 @@
+import logging
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+
+SEARCH_FIELDS = ("name", "description", "location")
+
+TOKEN_PATTERN = r"\w+"
+
+
+def fold_text(series):
+    """Minúsculas y sin tildes, vectorizado sobre una Serie de texto."""
+    return (
+        series.fillna("").astype(str).str.lower()
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+    )
+
+
+def tokenize(text):
+    """Tokens normalizados de un texto (mismas reglas que el índice)."""
+    folded = unicodedata.normalize("NFKD", str(text).lower())
+    return re.findall(TOKEN_PATTERN, folded.encode("ascii", "ignore").decode("ascii"))
+
+
+def _search_text(frame, fields):
+    """Texto de `fields` de cada fila del frame, unido por espacios."""
+    text = pd.Series("", index=pd.RangeIndex(len(frame)))
+    for field in fields:
+        if field in frame.columns:
+            # object antes de fillna: una categórica no admite "" como valor
+            text = text + " " + frame[field].reset_index(drop=True).astype(object).fillna("").astype(str)
+    return text
+
+
+def _intersect_sorted(a, b):
+    """Intersección de dos arreglos de posiciones ordenados y únicos."""
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    mask = np.zeros(int(max(a[-1], b[-1])) + 1, dtype=bool)
+    mask[b] = True
+    return a[mask[a]]
+
+
+class _SnapshotIndex:
+    """
+    Base de los índices sobre el snapshot de planes.
+
+    Reconstruir el índice completo tarda segundos con el catálogo grande,
+    así que se hace fuera del lock de las consultas y el resultado se
+    cambia de una vez. Mientras se reconstruye, las consultas siguen con el
+    índice anterior y su snapshot; solo la primera construcción se espera.
+    """
+
+    def __init__(self):
+        self.version = None
+        # Snapshot al que corresponden las posiciones del índice
+        self.snapshot = None
+        self.rebuilds = 0
+        self._pending = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _build(self, snapshot):
+        """Estado completo del índice para `snapshot`, sin tocar `self`."""
+        raise NotImplementedError
+
+    def _install(self, state):
+        """Reemplaza el estado del índice (con `_lock` tomado)."""
+        raise NotImplementedError
+
+    def sync(self, snapshot):
+        """Reconstruye el índice si `snapshot` es más nuevo (ej. desde el poller)."""
+        with self._build_lock:
+            if self.version is not None and self.version >= snapshot.version:
+                return
+            state = self._build(snapshot)
+            with self._lock:
+                # Un alta incremental pudo dejarlo más adelante mientras tanto
+                if self.version is None or self.version < snapshot.version:
+                    self._install(state)
+                    self.version = snapshot.version
+                    self.snapshot = snapshot
+                    self.rebuilds += 1
+
+    def refresh(self, snapshot):
+        """
+        Pone el índice al día con `snapshot` para consultarlo: la primera vez
+        lo construye ahora; después, en un hilo aparte.
+        """
+        if self.version is None:
+            self.sync(snapshot)
+            return
+        with self._lock:
+            if snapshot.version <= max(self.version, self._pending or 0):
+                return
+            self._pending = snapshot.version
+        threading.Thread(target=self._sync_in_background, args=(snapshot,), name="search-index", daemon=True).start()
+
+    def _sync_in_background(self, snapshot):
+        try:
+            self.sync(snapshot)
+        except Exception:
+            logger.exception("Error reconstruyendo el índice de búsqueda")
+            # La próxima consulta lo vuelve a intentar
+            with self._lock:
+                self._pending = None
+
+
+class PlanSearchIndex(_SnapshotIndex):
+    """
+    Índice invertido de tokens sobre nombre, descripción y ubicación.
+
+    Cada token apunta a las posiciones (filas) del snapshot de planes que lo
+    contienen. Los términos de la consulta se tratan como prefijos y se
+    combinan con AND: "rock parq" encuentra "Concierto Rock - Parque...".
+    El índice se reconstruye solo cuando cambia la versión del snapshot.
+    """
+
+    def __init__(self, fields=SEARCH_FIELDS, prefix_cache_size=256):
+        super().__init__()
+        self.fields = fields
+        self._postings = {}
+        self._tokens = []
+        self._rows = 0
+        self._prefix_cache = OrderedDict()
+        self._prefix_cache_size = prefix_cache_size
+
+    def _build(self, snapshot):
+        frame = snapshot.frame
+        text = _search_text(frame, self.fields)
+        tokens = fold_text(text).str.findall(TOKEN_PATTERN).explode().dropna()
+        positions = tokens.index.to_numpy()
+        groups = pd.Series(positions).groupby(tokens.to_numpy()).indices
+        postings = {token: np.unique(positions[idx]) for token, idx in groups.items()}
+        return postings, sorted(postings), len(frame)
+
+    def _install(self, state):
+        self._postings, self._tokens, self._rows = state
+        self._prefix_cache.clear()
+
+    def add(self, plan, snapshot):
+        """
+        Agrega un plan recién publicado (la última fila de `snapshot`) sin
+        reconstruir el índice.
+
+        Solo aplica si el índice es de la versión inmediatamente anterior y
+        `snapshot` tiene exactamente una fila más; si no, la próxima
+        consulta lo reconstruirá completo.
+        """
+        position = len(snapshot.data) - 1
+        with self._lock:
+            if self.version is None or self.version != snapshot.version - 1 or position != self._rows:
+                return False
+            text = " ".join(str(plan.get(field) or "") for field in self.fields)
+            for token in set(tokenize(text)):
+                existing = self._postings.get(token)
+                if existing is None:
+                    self._postings[token] = np.array([position])
+                    self._tokens.insert(bisect_left(self._tokens, token), token)
+                else:
+                    self._postings[token] = np.append(existing, position)
+            self._prefix_cache.clear()
+            self._rows += 1
+            self.version = snapshot.version
+            self.snapshot = snapshot
+            return True
+
+    def _prefix_positions(self, prefix):
+        cached = self._prefix_cache.get(prefix)
+        if cached is not None:
+            self._prefix_cache.move_to_end(prefix)
+            return cached
+
+        tokens = self._tokens
+        matches = []
+        i = bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            matches.append(self._postings[tokens[i]])
+            i += 1
+
+        if not matches:
+            result = np.empty(0, dtype=np.int64)
+        elif len(matches) == 1:
+            result = matches[0]
+        else:
+            result = np.unique(np.concatenate(matches))
+
+        self._prefix_cache[prefix] = result
+        if len(self._prefix_cache) > self._prefix_cache_size:
+            self._prefix_cache.popitem(last=False)
+        return result
+
+    def search(self, snapshot, query):
+        """
+        (snapshot indexado, posiciones ordenadas de sus planes que cumplen
+        todos los términos de `query`). Las posiciones son None si la
+        consulta no tiene términos. Durante una reconstrucción el snapshot
+        indexado puede ser el anterior a `snapshot`.
+        """
+        terms = tokenize(query or "")
+        if not terms:
+            return snapshot, None
+
+        self.refresh(snapshot)
+        with self._lock:
+            # Primero los términos más largos: suelen ser los más selectivos
+            result = None
+            for term in sorted(set(terms), key=len, reverse=True):
+                positions = self._prefix_positions(term)
+                result = positions if result is None else _intersect_sorted(result, positions)
+                if not len(result):
+                    break
+            return self.snapshot, result
+
+
+# ==================== BÚSQUEDA APROXIMADA ====================
+
+FUZZY_FIELDS = ("name", "location")
+
+
+def word_trigrams(token):
+    """Trigramas de una palabra con relleno: 'rock' -> '  r', ' ro', 'roc', 'ock', 'ck '."""
+    padded = f"  {token} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def text_trigrams(text):
+    return {gram for token in tokenize(text) for gram in word_trigrams(token)}
+
+
+class PlanTrigramIndex(_SnapshotIndex):
+    """
+    Índice de trigramas de caracteres sobre nombre y ubicación para
+    búsquedas tolerantes a errores de escritura ("consierto" -> "concierto").
+
+    La similitud de un plan es la fracción de trigramas de la consulta que
+    aparecen en su texto; a igualdad se prefiere el texto más corto
+    (Jaccard). Los trigramas se recorren del más raro al más común y la
+    búsqueda se corta al agotar `budget_ms`, devolviendo el ranking parcial.
+    """
+
+    def __init__(self, fields=FUZZY_FIELDS, min_similarity=0.5, max_results=500):
+        super().__init__()
+        self.fields = fields
+        self.min_similarity = min_similarity
+        self.max_results = max_results
+        self._postings = {}
+        self._row_sizes = np.empty(0, dtype=np.int32)
+
+    def _build(self, snapshot):
+        frame = snapshot.frame
+        text = _search_text(frame, self.fields)
+        tokens = fold_text(text).str.findall(TOKEN_PATTERN).explode().dropna()
+        # Los trigramas se calculan una vez por palabra del vocabulario
+        vocabulary = {token: word_trigrams(token) for token in tokens.unique()}
+        grams = tokens.map(vocabulary).explode()
+        pairs = pd.DataFrame({"position": grams.index.to_numpy(), "gram": grams.to_numpy()}).drop_duplicates()
+
+        positions = pairs["position"].to_numpy()
+        groups = pd.Series(positions).groupby(pairs["gram"].to_numpy()).indices
+        postings = {gram: positions[idx] for gram, idx in groups.items()}
+        return postings, np.bincount(positions, minlength=len(frame)).astype(np.int32)
+
+    def _install(self, state):
+        self._postings, self._row_sizes = state
+
+    def add(self, plan, snapshot):
+        """
+        Agrega un plan recién publicado (la última fila de `snapshot`) sin
+        reconstruir el índice.
+
+        Solo aplica si el índice es de la versión inmediatamente anterior y
+        `snapshot` tiene exactamente una fila más; si no, la próxima
+        consulta lo reconstruirá completo.
+        """
+        position = len(snapshot.data) - 1
+        with self._lock:
+            if self.version is None or self.version != snapshot.version - 1 or position != len(self._row_sizes):
+                return False
+            grams = text_trigrams(" ".join(str(plan.get(field) or "") for field in self.fields))
+            for gram in grams:
+                existing = self._postings.get(gram)
+                self._postings[gram] = np.array([position]) if existing is None else np.append(existing, position)
+            self._row_sizes = np.append(self._row_sizes, np.int32(len(grams)))
+            self.version = snapshot.version
+            self.snapshot = snapshot
+            return True
+
+    def search(self, snapshot, query, budget_ms=5.0):
+        """
+        (snapshot indexado, posiciones de sus planes ordenadas por similitud
+        con `query`). Las posiciones son None si la consulta no tiene
+        términos; ver PlanSearchIndex.search.
+        """
+        query_grams = text_trigrams(query or "")
+        if not query_grams:
+            return snapshot, None
+
+        self.refresh(snapshot)
+        with self._lock:
+            deadline = time.perf_counter() + budget_ms / 1000
+
+            postings = sorted(
+                (self._postings[gram] for gram in query_grams if gram in self._postings),
+                key=len
+            )
+            shared = np.zeros(len(self._row_sizes), dtype=np.int32)
+            for positions in postings:
+                shared[positions] += 1
+                if time.perf_counter() > deadline:
+                    break
+            indexed, row_sizes = self.snapshot, self._row_sizes
+
+        similarity = shared / len(query_grams)
+        candidates = np.flatnonzero(similarity >= self.min_similarity)
+        if not len(candidates):
+            return indexed, candidates
+
+        jaccard = shared[candidates] / (len(query_grams) + row_sizes[candidates] - shared[candidates])
+        order = np.lexsort((-jaccard, -similarity[candidates]))
+        return indexed, candidates[order][:self.max_results]
@@ -0,0 +1,190 @@
+import hashlib
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from api_client import JsonPayload, raise_for_status
+from metrics import span
+from plan_frame import build_plan_frame, coerce_plan_frame, concat_plan_frames, frame_memory_report
+
+
+# ==================== DELTAS ====================
+
+@dataclass(frozen=True)
+class PlanDelta:
+    """Cambios entre dos versiones del catálogo, identificados por `id`."""
+    added: tuple = ()
+    updated: tuple = ()
+    removed: tuple = ()
+    # True cuando no había versión anterior y todo el catálogo es nuevo
+    full: bool = False
+
+    @property
+    def changed_ids(self):
+        return {plan.get("id") for plan in self.updated} | set(self.removed)
+
+    @property
+    def empty(self):
+        return not (self.added or self.updated or self.removed)
+
+
+@dataclass(frozen=True)
+class PlanPayload(JsonPayload):
+    """JsonPayload de /plans con el delta aplicado y el frame ya fusionado."""
+    delta: PlanDelta = None
+    frame: object = field(default=None, repr=False, compare=False)
+
+
+def diff_plans(old_plans, new_plans, key="id"):
+    """Compara dos listas completas de planes y devuelve un PlanDelta."""
+    old_by_id = {plan.get(key): plan for plan in old_plans}
+    added, updated, seen = [], [], set()
+    for plan in new_plans:
+        plan_id = plan.get(key)
+        seen.add(plan_id)
+        old_plan = old_by_id.get(plan_id)
+        if old_plan is None:
+            added.append(plan)
+        elif old_plan != plan:
+            updated.append(plan)
+    removed = [plan_id for plan_id in old_by_id if plan_id not in seen]
+    return PlanDelta(added=tuple(added), updated=tuple(updated), removed=tuple(removed))
+
+
+def apply_delta(plans, delta, key="id"):
+    """
+    Aplica `delta` a una lista de planes. Los planes sin cambios conservan
+    su orden; los agregados y actualizados van al final (mismo orden que
+    `merge_frame`).
+    """
+    changed = delta.changed_ids
+    kept = [plan for plan in plans if plan.get(key) not in changed] if changed else list(plans)
+    return kept + list(delta.added) + list(delta.updated)
+
+
+def merge_frame(frame, delta, key="id"):
+    """Fusiona `delta` en un frame tipado construyendo solo las filas nuevas."""
+    changed = delta.changed_ids
+    kept = frame[~frame[key].isin(changed)] if changed else frame
+    rows = list(delta.added) + list(delta.updated)
+    if not rows:
+        return kept.reset_index(drop=True)
+    return concat_plan_frames([kept, build_plan_frame(rows)])
+
+
+# ==================== SINCRONIZACIÓN ====================
+
+class PlanDeltaSync:
+    """
+    Loader de /plans para SnapshotCache que sincroniza por diferencias.
+
+    api             : api_client.ApiClient
+    since_param     : parámetro del backend para pedir solo cambios
+                      (ej. "updatedSince"); None si el backend no lo soporta
+    watermark_field : campo de los planes usado como marca de agua
+                      ("updatedAt", o "id" si solo se detectan altas)
+    full_every      : sincronizaciones incrementales entre dos descargas
+                      completas (para reconciliar borrados)
+
+    Con `since_param` pide solo los planes cambiados desde la marca de agua
+    y los fusiona por `id` (los marcados `deleted`/`isDeleted` se quitan).
+    Sin él descarga el catálogo completo (condicional) y calcula el delta
+    comparando por `id`. En ambos casos el frame del snapshot anterior se
+    reutiliza y solo se construyen las filas que cambiaron. El frame es
+    siempre el tipado de plan_frame.build_plan_frame.
+    """
+
+    def __init__(self, api, path="/plans", since_param=None, watermark_field="updatedAt", full_every=20):
+        self.api = api
+        self.path = path
+        self.since_param = since_param
+        self.watermark_field = watermark_field
+        self.full_every = full_every
+        self._validators = None
+        self._incremental_syncs = 0
+        self.last_frame_report = None
+
+    def __call__(self, previous=None):
+        if previous is None or not previous.data or "id" not in previous.frame.columns:
+            return self._load_full()
+
+        if self.since_param and self._incremental_syncs < self.full_every:
+            watermark = self._watermark(previous.data)
+            if watermark is not None:
+                self._incremental_syncs += 1
+                return self._load_since(previous, watermark)
+
+        self._incremental_syncs = 0
+        return self._load_diff(previous)
+
+    def _watermark(self, plans):
+        values = [plan.get(self.watermark_field) for plan in plans]
+        values = [value for value in values if value is not None]
+        return max(values) if values else None
+
+    def _load_full(self):
+        payload = self.api.get_json(self.path)
+        self._validators = payload
+
+        with span("transform"):
+            raw = pd.DataFrame(payload.data)
+            frame = coerce_plan_frame(raw)
+            self.last_frame_report = frame_memory_report(raw, frame)
+        return PlanPayload(
+            data=payload.data,
+            size=payload.size,
+            content_hash=payload.content_hash,
+            etag=payload.etag,
+            last_modified=payload.last_modified,
+            delta=PlanDelta(added=tuple(payload.data), full=True),
+            frame=frame
+        )
+
+    def _merged(self, previous, delta, size, validators=None):
+        if delta.empty:
+            return None
+        with span("transform"):
+            data = apply_delta(previous.data, delta)
+            frame = merge_frame(previous.frame, delta)
+        return PlanPayload(
+            data=data,
+            size=size,
+            content_hash=getattr(validators, "content_hash", None),
+            etag=getattr(validators, "etag", None),
+            last_modified=getattr(validators, "last_modified", None),
+            delta=delta,
+            frame=frame
+        )
+
+    def _load_since(self, previous, watermark):
+        response = self.api.get(self.path, params={self.since_param: watermark})
+        raise_for_status(response)
+        with span("parse"):
+            changes = response.json()
+
+        known_ids = {plan.get("id") for plan in previous.data}
+        added, updated, removed = [], [], []
+        for plan in changes:
+            if plan.get("deleted") or plan.get("isDeleted"):
+                removed.append(plan.get("id"))
+            elif plan.get("id") in known_ids:
+                updated.append(plan)
+            else:
+                added.append(plan)
+        delta = PlanDelta(added=tuple(added), updated=tuple(updated), removed=tuple(removed))
+
+        # Tamaño aproximado: proporcional al número de planes
+        size = int(previous.size * (len(previous.data) + len(added) - len(removed)) / max(len(previous.data), 1))
+        # Hash encadenado (contenido anterior + cambios): los workers que
+        # parten de los mismos datos y reciben los mismos cambios coinciden
+        content_hash = hashlib.sha1(previous.content_version.encode() + response.content).hexdigest()
+        return self._merged(previous, delta, size, validators=JsonPayload(None, size, content_hash))
+
+    def _load_diff(self, previous):
+        payload = self.api.get_json(self.path, self._validators or previous)
+        if payload is None:
+            return None
+        self._validators = payload
+        with span("transform"):
+            delta = diff_plans(previous.data, payload.data)
+        return self._merged(previous, delta, payload.size, validators=payload)
@@ -0,0 +1,308 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+
+import pandas as pd
+
+
+# ==================== SNAPSHOTS ====================
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Copia inmutable de una respuesta del API (planes, categorías...)."""
+    key: str
+    version: int
+    data: list
+    size: int
+    content_hash: str = None
+    etag: str = None
+    last_modified: str = None
+    fetched_at: float = field(default_factory=time.time)
+    # Cambios respecto a la versión anterior (ej. plan_sync.PlanDelta)
+    delta: object = None
+    # DataFrame ya armado por el loader (ej. fusionado por id)
+    initial_frame: object = field(default=None, repr=False, compare=False)
+    # True si no se pudo revalidar con el API y se sirve el último bueno
+    stale: bool = False
+    # Identificador único de este snapshot cuando no hay hash del contenido
+    local_id: str = field(default_factory=lambda: uuid.uuid4().hex, repr=False, compare=False)
+
+    @property
+    def content_version(self):
+        """
+        Versión derivada del contenido (hash del cuerpo): coincide en todos
+        los procesos para los mismos datos, a diferencia de `version`, que
+        es un contador local. Sin hash es única y nunca coincide con otra.
+        """
+        return self.content_hash or self.local_id
+
+    @cached_property
+    def frame(self):
+        """DataFrame construido una sola vez por snapshot."""
+        if self.initial_frame is not None:
+            return self.initial_frame
+        return pd.DataFrame(self.data)
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def with_stale(self, stale):
+        """Misma versión (y mismo DataFrame) con otra marca de vigencia."""
+        if self.stale == stale:
+            return self
+        return replace(self, stale=stale, initial_frame=self.frame)
+
+
+# ==================== CACHÉ ====================
+
+class SnapshotCache:
+    """
+    Caché de snapshots compartida por todo el proceso.
+
+    ttl         : float - segundos que un snapshot se considera vigente
+    max_entries : int   - número máximo de claves guardadas
+    max_bytes   : int   - tamaño máximo aproximado (bytes de las respuestas)
+    stale_if_error : tuple - excepciones del loader ante las que se sirve el
+                             último snapshot marcado `stale` en vez de fallar
+    stale_retry    : float - segundos entre reintentos en segundo plano de
+                             una clave servida como vencida
+
+    Cada clave guarda un único snapshot; al refrescarla con datos nuevos se
+    incrementa su versión. Si el loader indica que nada cambió (304 o mismo
+    hash) se conserva el snapshot, su versión y su DataFrame ya construido.
+    Cuando se superan los límites se expulsan las claves usadas hace más
+    tiempo (LRU).
+    """
+
+    def __init__(self, ttl=30.0, max_entries=64, max_bytes=64 * 1024 * 1024,
+                 stale_if_error=(), stale_retry=5.0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_if_error = tuple(stale_if_error)
+        self.stale_retry = stale_retry
+        self._refreshing = set()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._versions = {}
+        self._validated_at = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self.stale_served = 0
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _fresh(self, key):
+        validated_at = self._validated_at.get(key)
+        return validated_at is not None and time.time() - validated_at < self.ttl
+
+    def _lookup(self, key):
+        snapshot = self._entries.get(key)
+        if snapshot is not None and self._fresh(key):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return snapshot
+        return None
+
+    def peek(self, key):
+        """Devuelve el último snapshot de `key` sin refrescarlo (o None)."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def get(self, key, loader, force=False):
+        """
+        Devuelve el snapshot de `key`, llamando a `loader` si no existe,
+        expiró o se pide `force`.
+
+        `loader(previous)` recibe el snapshot anterior (o None) para hacer
+        una petición condicional y devuelve un api_client.JsonPayload, o
+        None si el recurso no cambió. Solo un hilo por clave ejecuta el
+        loader a la vez. Si el loader falla con una de `stale_if_error` y hay
+        un snapshot anterior, se devuelve ese marcado `stale` y la clave se
+        sigue refrescando en segundo plano.
+        """
+        if not force:
+            with self._lock:
+                snapshot = self._lookup(key)
+                if snapshot is not None:
+                    return snapshot
+
+        with self._key_lock(key):
+            with self._lock:
+                # Otro hilo pudo haberlo refrescado mientras esperábamos
+                snapshot = None if force else self._lookup(key)
+                if snapshot is not None:
+                    return snapshot
+                self.misses += 1
+                previous = self._entries.get(key)
+
+            try:
+                payload = loader(previous)
+            except self.stale_if_error:
+                if previous is None:
+                    raise
+                return self._serve_stale(key, previous, loader)
+            if payload is None and previous is not None:
+                return self._revalidated(key, previous)
+            return self.put(key, payload)
+
+    def _revalidated(self, key, previous):
+        with self._lock:
+            self.revalidated += 1
+            self._validated_at[key] = time.time()
+            snapshot = previous.with_stale(False)
+            if self._entries.get(key) is previous:
+                self._entries[key] = snapshot
+                self._entries.move_to_end(key)
+            return snapshot
+
+    def _serve_stale(self, key, previous, loader):
+        """Publica `previous` como vencido y agenda su refresco en segundo plano."""
+        with self._lock:
+            self.stale_served += 1
+            snapshot = previous.with_stale(True)
+            if self._entries.get(key) is previous:
+                self._entries[key] = snapshot
+            # Mientras dure el TTL los lectores reciben el vencido sin
+            # esperar al API; el refresco lo hace un solo hilo
+            self._validated_at[key] = time.time()
+            start = key not in self._refreshing
+            self._refreshing.add(key)
+        if start:
+            threading.Thread(target=self._refresh_stale, args=(key, loader), name=f"stale-refresh-{key}", daemon=True).start()
+        return snapshot
+
+    def _refresh_stale(self, key, loader):
+        try:
+            while True:
+                time.sleep(self.stale_retry)
+                with self._key_lock(key):
+                    with self._lock:
+                        previous = self._entries.get(key)
+                    if previous is None or not previous.stale:
+                        return
+                    try:
+                        payload = loader(previous)
+                    except self.stale_if_error:
+                        continue
+                    if payload is None:
+                        self._revalidated(key, previous)
+                    else:
+                        self.put(key, payload)
+                    return
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def put(self, key, payload):
+        """Guarda `payload` como nuevo snapshot de `key` (siguiente versión)."""
+        with self._lock:
+            version = self._versions.get(key, 0) + 1
+            self._versions[key] = version
+            snapshot = Snapshot(
+                key=key,
+                version=version,
+                data=payload.data,
+                size=payload.size,
+                content_hash=payload.content_hash,
+                etag=payload.etag,
+                last_modified=payload.last_modified,
+                delta=getattr(payload, "delta", None),
+                initial_frame=getattr(payload, "frame", None)
+            )
+            nbytes = payload.size
+            self._validated_at[key] = time.time()
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = snapshot
+            self._bytes += nbytes
+            self._evict(keep=key)
+            return snapshot
+
+    def derive(self, key, transform, delta=None, frame_transform=None):
+        """
+        Crea localmente una nueva versión de `key` con `transform(data)`
+        (ej. agregar un plan recién publicado) sin ir al API. El snapshot
+        derivado queda vencido para que la próxima lectura lo revalide.
+        `delta` describe el cambio para quien procese solo diferencias y
+        `frame_transform(frame)` evita reconstruir el DataFrame completo.
+        No tiene hash de contenido, así que su `content_version` es única de
+        este proceso. Devuelve el nuevo snapshot, o None si `key` no está en caché.
+        """
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is None:
+                return None
+            version = self._versions[key] + 1
+            self._versions[key] = version
+            snapshot = Snapshot(
+                key=key,
+                version=version,
+                data=transform(previous.data),
+                size=previous.size,
+                delta=delta,
+                initial_frame=frame_transform(previous.frame) if frame_transform else None
+            )
+            self._entries[key] = snapshot
+            self._entries.move_to_end(key)
+            self._validated_at.pop(key, None)
+            return snapshot
+
+    def _evict(self, keep):
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            evicted = self._entries.pop(oldest)
+            self._validated_at.pop(oldest, None)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def expire(self, key):
+        """Marca `key` como vencida; la próxima lectura revalida con el API."""
+        with self._lock:
+            self._validated_at.pop(key, None)
+
+    def invalidate(self, key=None):
+        """Elimina `key` (o todas las claves) para forzar la próxima carga."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._validated_at.clear()
+                self._bytes = 0
+            else:
+                self._validated_at.pop(key, None)
+                snapshot = self._entries.pop(key, None)
+                if snapshot is not None:
+                    self._bytes -= snapshot.size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "stale_served": self.stale_served,
+                "stale": [key for key, snap in self._entries.items() if snap.stale],
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "ttl": self.ttl,
+                "versions": {key: snap.version for key, snap in self._entries.items()},
+            }
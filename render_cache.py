@@ -0,0 +1,42 @@
+import threading
+from collections import OrderedDict
+
+
+class RenderCache:
+    """
+    Memoriza salidas ya renderizadas (figuras, árboles de componentes) por
+    clave, típicamente (página, versión del snapshot). LRU acotada.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        """Devuelve lo guardado para `key` o llama a `render()` y lo guarda."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = render()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def peek(self, key):
+        """Lo guardado para `key` sin renderizar (o None)."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
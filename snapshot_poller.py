@@ -0,0 +1,71 @@
+import logging
+import time
+
+from background import BackgroundWorker
+
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotPoller(BackgroundWorker):
+    """
+    Hilo de fondo (uno por proceso) que refresca snapshots de la caché.
+
+    cache      : plans_cache.SnapshotCache donde se publican los snapshots
+    loaders    : dict - clave de caché -> loader(previous), ej. {"plans": ...}
+    interval   : float - segundos entre refrescos
+    on_refresh : callable(snapshot) opcional, ej. para precalentar índices
+
+    Los callbacks periódicos solo leen el último snapshot publicado, así que
+    la carga sobre el API no crece con el número de pestañas abiertas.
+    """
+
+    thread_name = "snapshot-poller"
+
+    def __init__(self, cache, loaders, interval=15.0, on_refresh=None):
+        super().__init__()
+        self.cache = cache
+        self.loaders = dict(loaders)
+        self.interval = interval
+        self.on_refresh = on_refresh
+        self.refreshes = 0
+        self.errors = 0
+        self.last_refresh = None
+        self.last_error = None
+
+    @property
+    def enabled(self):
+        return self.interval > 0
+
+    def refresh_now(self):
+        """Refresca todas las claves una vez (también usado por el hilo)."""
+        for key, loader in self.loaders.items():
+            try:
+                snapshot = self.cache.get(key, loader, force=True)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = f"{key}: {e}"
+                logger.warning("No se pudo refrescar %s: %s", key, e)
+                continue
+            self.refreshes += 1
+            self.last_refresh = time.time()
+            if self.on_refresh is not None:
+                try:
+                    self.on_refresh(snapshot)
+                except Exception:
+                    logger.exception("Error en on_refresh para %s", key)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_now()
+            self._stop.wait(self.interval)
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "last_refresh": self.last_refresh,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,116 @@
+import re
+
+import pandas as pd
+
+
+# Operadores de `filter_query` de dash_table (modo filter_action="custom")
+FILTER_OPERATORS = [
+    ['ge ', '>='],
+    ['le ', '<='],
+    ['lt ', '<'],
+    ['gt ', '>'],
+    ['ne ', '!='],
+    ['eq ', '='],
+    ['contains '],
+    ['datestartswith ']
+]
+
+
+# '{columna} operador valor': el operador va justo después de la columna
+# (así un valor como "viene de" o "orange juice" no se toma por `ne`/`ge`).
+# La tabla antepone "s" (sensible a mayúsculas) o "i" (insensible): "scontains", "i="
+FILTER_PATTERN = re.compile(
+    r"^\s*\{(?P<name>[^}]*)\}\s*(?P<case>[si])?"
+    r"(?P<operator>>=|<=|!=|<|>|=|(?:ge|le|lt|gt|ne|eq|contains|datestartswith)(?=\s|$))"
+    r"\s*(?P<value>.*?)\s*$"
+)
+
+# Alias de cada operador -> nombre normalizado
+OPERATOR_NAMES = {
+    alias.strip(): operator_type[0].strip()
+    for operator_type in FILTER_OPERATORS
+    for alias in operator_type
+}
+
+
+def split_filter_part(filter_part):
+    """
+    Separa una expresión como '{Vistas} s> 100' en (columna, operador,
+    valor, sensible a mayúsculas). Sin prefijo "i" la comparación es
+    sensible. Devuelve (None, None, None, True) si no se reconoce.
+    """
+    match = FILTER_PATTERN.match(filter_part)
+    if match is None:
+        return None, None, None, True
+
+    value_part = match.group('value')
+    v0 = value_part[0] if value_part else ''
+    if v0 and len(value_part) > 1 and v0 == value_part[-1] and v0 in ("'", '"', '`'):
+        value = value_part[1: -1].replace('\\' + v0, v0)
+    else:
+        try:
+            value = float(value_part)
+        except ValueError:
+            value = value_part
+
+    # Todas las variantes se normalizan al primer alias
+    case = match.group('case') != 'i'
+    return match.group('name'), OPERATOR_NAMES[match.group('operator')], value, case
+
+
+def apply_filter_query(df, filter_query):
+    """Aplica un `filter_query` de la tabla (partes unidas con ' && ')."""
+    if not filter_query:
+        return df
+
+    for filter_part in filter_query.split(' && '):
+        col_name, operator, filter_value, case = split_filter_part(filter_part)
+        if col_name not in df.columns:
+            continue
+
+        column = df[col_name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Las categóricas sin orden no admiten <, >: comparar por valor
+            column = column.astype(column.cat.categories.dtype)
+        if operator in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+            numeric_column = pd.api.types.is_numeric_dtype(column)
+            if isinstance(filter_value, float) and not numeric_column:
+                filter_value = str(filter_value).removesuffix('.0')
+            elif numeric_column and not isinstance(filter_value, float):
+                # Texto contra una columna numérica: ninguna fila coincide
+                return df.iloc[0:0]
+            if not case and not numeric_column:
+                column = column.astype('string').str.casefold()
+                filter_value = str(filter_value).casefold()
+            mask = getattr(column, operator)(filter_value)
+        elif operator == 'contains':
+            mask = column.astype(str).str.contains(str(filter_value), case=case, regex=False, na=False)
+        elif operator == 'datestartswith':
+            mask = column.astype(str).str.startswith(str(filter_value), na=False)
+        else:
+            continue
+        df = df.loc[mask.fillna(False).astype(bool)]
+
+    return df
+
+
+def apply_sort(df, sort_by):
+    """Ordena según `sort_by` de la tabla: [{'column_id': ..., 'direction': 'asc'|'desc'}]."""
+    sort_by = [col for col in (sort_by or []) if col['column_id'] in df.columns]
+    if not sort_by:
+        return df
+    return df.sort_values(
+        [col['column_id'] for col in sort_by],
+        ascending=[col['direction'] == 'asc' for col in sort_by],
+        kind='stable',
+        na_position='last'
+    )
+
+
+def page_slice(df, page_current, page_size):
+    """Devuelve (filas de la página, número de páginas, página ajustada al rango)."""
+    page_current = page_current or 0
+    page_count = max((len(df) + page_size - 1) // page_size, 1)
+    page_current = min(page_current, page_count - 1)
+    start = page_current * page_size
+    return df.iloc[start: start + page_size], page_count, page_current
@@ -0,0 +1,33 @@
+import threading
+import time
+
+import pytest
+
+from metrics import MetricsRegistry, span
+import metrics
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    fresh = MetricsRegistry()
+    monkeypatch.setattr(metrics, "registry", fresh)
+    return fresh
+
+
+def test_span_decorator_times_concurrent_calls_separately(registry):
+    @span("render")
+    def work(seconds):
+        time.sleep(seconds)
+
+    threads = [threading.Thread(target=work, args=(seconds,)) for seconds in (0.5, 0.05)]
+    for thread in threads:
+        thread.start()
+        # La llamada corta empieza mientras la larga sigue en curso
+        time.sleep(0.2)
+    for thread in threads:
+        thread.join()
+
+    histogram = registry._histograms["dash_callback_stage_seconds"][
+        (("callback", "background"), ("stage", "render"))]
+    assert histogram.count == 2
+    assert 0.55 <= histogram.sum < 0.8
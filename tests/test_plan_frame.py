@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+from plan_frame import build_plan_frame
+
+
+def test_is_active_accepts_mixed_values():
+    values = [True, False, None, "true", "False", " 1 ", "0", 1.0, 0, "sí", 2, "quizás", np.nan, [1]]
+    frame = build_plan_frame([{"id": i, "isActive": value} for i, value in enumerate(values)])
+
+    assert frame["isActive"].dtype == "boolean"
+    assert frame["isActive"].tolist() == [
+        True, False, pd.NA, True, False, True, False, True, False, True, pd.NA, pd.NA, pd.NA, pd.NA]
+
+
+def test_out_of_range_integers_are_missing():
+    frame = build_plan_frame([{"views": 10}, {"views": 2 ** 40}, {"views": "x"}])
+
+    assert frame["views"].dtype == "Int32"
+    assert frame["views"].tolist() == [10, pd.NA, pd.NA]
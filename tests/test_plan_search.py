@@ -0,0 +1,69 @@
+import threading
+
+from plan_frame import build_plan_frame
+from plan_search import PlanSearchIndex, PlanTrigramIndex
+from plans_cache import Snapshot
+
+
+def snapshot(plans, version):
+    return Snapshot(key="plans", version=version, data=plans, size=0, initial_frame=build_plan_frame(plans))
+
+
+PLANS = [
+    {"id": 1, "name": "Concierto Rock", "location": "Parque Simón Bolívar"},
+    {"id": 2, "name": "Feria del libro", "location": "Corferias"},
+]
+
+
+def test_add_appends_the_last_row():
+    base = snapshot(PLANS, 1)
+    index = PlanSearchIndex()
+    index.sync(base)
+
+    plan = {"id": 3, "name": "Rock al parque", "location": "Parque"}
+    added = snapshot(PLANS + [plan], 2)
+    assert index.add(plan, added)
+
+    indexed, positions = index.search(added, "rock")
+    assert indexed is added
+    assert positions.tolist() == [0, 2]
+
+
+def test_add_rejects_a_snapshot_that_is_not_one_row_longer():
+    base = snapshot(PLANS, 1)
+    index = PlanTrigramIndex()
+    index.sync(base)
+
+    # El plan reemplazó una fila existente: las posiciones cambiaron
+    plan = {"id": 2, "name": "Feria del libro", "location": "Corferias"}
+    assert not index.add(plan, snapshot([PLANS[0], plan], 2))
+    assert index.version == 1
+
+
+def test_stale_index_is_served_while_rebuilding():
+    old = snapshot(PLANS, 1)
+    index = PlanSearchIndex()
+    index.sync(old)
+
+    started, release = threading.Event(), threading.Event()
+    build = index._build
+
+    def slow_build(snapshot):
+        started.set()
+        release.wait(5)
+        return build(snapshot)
+
+    index._build = slow_build
+    new = snapshot(PLANS + [{"id": 3, "name": "Rock al parque"}], 2)
+    indexed, positions = index.search(new, "rock")
+    assert indexed is old
+    assert positions.tolist() == [0]
+
+    assert started.wait(5)
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == "search-index":
+            thread.join(5)
+    indexed, positions = index.search(new, "rock")
+    assert indexed is new
+    assert positions.tolist() == [0, 2]
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from table_query import apply_filter_query, split_filter_part
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'Nombre': ['Concierto Rock', 'Feria del libro', 'rock al parque', 'Teatro'],
+        'Vistas': [150, 20, 300, 100],
+        'Estado': ['✓ Activo', '✗ Inactivo', '✓ Activo', '✓ Activo'],
+    })
+
+
+@pytest.mark.parametrize("part, expected", [
+    ("{Nombre} scontains rock", ("Nombre", "contains", "rock", True)),
+    ("{Nombre} icontains rock", ("Nombre", "contains", "rock", False)),
+    ("{Vistas} s> 100", ("Vistas", "gt", 100.0, True)),
+    ("{Vistas} s>= 100", ("Vistas", "ge", 100.0, True)),
+    ('{Nombre} i= "teatro"', ("Nombre", "eq", "teatro", False)),
+    ("{Nombre} contains viene de", ("Nombre", "contains", "viene de", True)),
+    ("{Nombre} datestartswith 2024", ("Nombre", "datestartswith", 2024.0, True)),
+])
+def test_split_filter_part(part, expected):
+    assert split_filter_part(part) == expected
+
+
+def test_split_filter_part_unknown():
+    assert split_filter_part("Nombre rock") == (None, None, None, True)
+
+
+def test_scontains_is_case_sensitive(df):
+    assert apply_filter_query(df, "{Nombre} scontains rock")['Nombre'].tolist() == ['rock al parque']
+    assert apply_filter_query(df, "{Nombre} scontains Zzyzx").empty
+
+
+def test_icontains_ignores_case(df):
+    result = apply_filter_query(df, "{Nombre} icontains ROCK")
+    assert result['Nombre'].tolist() == ['Concierto Rock', 'rock al parque']
+
+
+def test_prefixed_relational_operators(df):
+    assert apply_filter_query(df, "{Vistas} s> 100")['Vistas'].tolist() == [150, 300]
+    assert apply_filter_query(df, "{Vistas} s<= 100")['Vistas'].tolist() == [20, 100]
+    assert apply_filter_query(df, '{Estado} s= "✓ Activo" && {Vistas} s< 200')['Nombre'].tolist() == [
+        'Concierto Rock', 'Teatro']
+
+
+def test_ieq_ignores_case(df):
+    assert apply_filter_query(df, '{Nombre} i= "TEATRO"')['Nombre'].tolist() == ['Teatro']
+    assert apply_filter_query(df, '{Nombre} s= "TEATRO"').empty
+
+
+def test_text_against_numeric_column_matches_nothing(df):
+    assert apply_filter_query(df, "{Vistas} s> mucho").empty